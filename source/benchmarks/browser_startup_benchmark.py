@@ -0,0 +1,74 @@
+"""
+Measures the cost of switching user-agents, comparing the former approach (stopping everything, then starting
+Playwright and a persistent browser context again) against replacing the browser context in WebsiteHandler's
+long-lived browser.
+
+Usage:
+    python -m source.benchmarks.browser_startup_benchmark [-r ROTATIONS]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from source.benchmarks.gather_articles_benchmark import BENCHMARK_USERAGENT
+from source.classes.website_handler import WebsiteHandler
+
+
+async def measure_relaunches(rotations: int) -> list[float]:
+    """
+    Returns the time each user-agent switch takes when the whole browser is relaunched, as
+    WebsiteHandler.initialize_playwright used to do.
+    """
+    latencies = []
+    for rotation in range(rotations):
+        start = time.perf_counter()
+        playwright = await async_playwright().start()
+        browser_context = await playwright.chromium.launch_persistent_context(
+            '', headless=True, user_agent=f'{BENCHMARK_USERAGENT} Rotation/{rotation}')
+        await browser_context.pages[0].evaluate('() => navigator.userAgent')
+        latencies.append(time.perf_counter() - start)
+        await browser_context.close()
+        await playwright.stop()
+    return latencies
+
+
+async def measure_context_switches(rotations: int) -> tuple[float, list[float]]:
+    """
+    Returns the time the initial browser launch takes, and the time each later user-agent switch takes.
+    """
+    wshandler = WebsiteHandler()
+    try:
+        start = time.perf_counter()
+        await wshandler.initialize_playwright(user_agent=BENCHMARK_USERAGENT)
+        await wshandler.page.evaluate('() => navigator.userAgent')
+        launch_latency = time.perf_counter() - start
+        latencies = []
+        for rotation in range(rotations):
+            start = time.perf_counter()
+            await wshandler.initialize_playwright(user_agent=f'{BENCHMARK_USERAGENT} Rotation/{rotation}')
+            await wshandler.page.evaluate('() => navigator.userAgent')
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await wshandler.destroy()
+    return launch_latency, latencies
+
+
+async def main(args: argparse.Namespace):
+    relaunch_latencies = await measure_relaunches(args.rotations)
+    launch_latency, switch_latencies = await measure_context_switches(args.rotations)
+    print(f'User-agent switches: {args.rotations}')
+    print(f'{"approach":<24} {"median (ms)":>12} {"max (ms)":>10}')
+    print(f'{"relaunch (before)":<24} {statistics.median(relaunch_latencies) * 1000:>12.1f} '
+          f'{max(relaunch_latencies) * 1000:>10.1f}')
+    print(f'{"new context":<24} {statistics.median(switch_latencies) * 1000:>12.1f} '
+          f'{max(switch_latencies) * 1000:>10.1f}')
+    print(f'Initial browser launch: {launch_latency * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Browser startup and user-agent switch benchmark.')
+    parser.add_argument('-r', '--rotations', type=int, default=10, help='Number of user-agent switches.')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Measures MatchingArticles rows stored per second, from 10k to 1M synthetic rows, comparing the former write path
+(one multi-row INSERT per CLI batch, each in its own transaction, with SQLite's default pragmas) against
+DBManager.store streaming the rows in executemany() batches within a single transaction, with tuned pragmas.
+
+Usage:
+    python -m source.benchmarks.bulk_insert_benchmark [-m MAX_ROWS] [-f MAX_FORMER_ROWS] [-b BATCH_SIZE]
+"""
+import argparse
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import sessionmaker
+
+from source.benchmarks.fixture_site import format_rate
+from source.classes.db_manager import DBManager
+from source.interfaces.db_tables import MatchingArticles
+
+
+def generate_matches(rows_count: int) -> Iterator[MatchingArticles]:
+    """
+    Lazily generates matches of 100 keywords with article URLs.
+    """
+    for index in range(rows_count):
+        yield MatchingArticles(Keyword=f'keyword {index % 100}',
+                               URL=f'https://www.pagina12.com.ar/{index // 100}-articulo-de-prueba')
+
+
+def store_formerly(db_filepath: Path, records: Iterator[MatchingArticles], batch_size: int):
+    """
+    The write path DBManager.store followed before streaming: every record is reflected into a dictionary and each
+    batch is inserted by a single multi-row statement, in its own transaction.
+    """
+    engine = create_engine(f'sqlite:///{str(db_filepath)}')
+    DBManager.Base.metadata.create_all(bind=engine)
+    session_maker = sessionmaker(engine)
+
+    def record_as_dict(record):
+        record_dict = {col.name: getattr(record, col.name) for col in record.__table__.columns}
+        for autofill_field_name in ('ID', 'CreatedOn', 'UpdatedOn'):
+            del record_dict[autofill_field_name]
+        return record_dict
+
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            with session_maker.begin() as session:
+                session.execute(insert(MatchingArticles).values(list(map(record_as_dict, batch)))
+                                .on_conflict_do_nothing())
+            batch.clear()
+    if len(batch) > 0:
+        with session_maker.begin() as session:
+            session.execute(insert(MatchingArticles).values(list(map(record_as_dict, batch))).on_conflict_do_nothing())
+    engine.dispose()
+
+
+def main(args: argparse.Namespace):
+    rows_counts = [10_000]
+    while rows_counts[-1] * 10 <= args.max_rows:
+        rows_counts.append(rows_counts[-1] * 10)
+    for rows_count in rows_counts:
+        if rows_count <= args.max_former_rows:
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                start = time.perf_counter()
+                store_formerly(Path(temporary_directory) / 'former.db', generate_matches(rows_count), args.batch_size)
+                print(format_rate(f'former, {rows_count} rows', rows_count, time.perf_counter() - start,
+                                  unit='rows'))
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            dbmanager = DBManager(filepath=Path(temporary_directory) / 'streamed.db')
+            start = time.perf_counter()
+            dbmanager.store(generate_matches(rows_count))
+            print(format_rate(f'streamed, {rows_count} rows', rows_count, time.perf_counter() - start, unit='rows'))
+            dbmanager.destroy()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk insert benchmark.')
+    parser.add_argument('-m', '--max_rows', type=int, default=1_000_000, help='Largest number of rows to store.')
+    parser.add_argument('-f', '--max_former_rows', type=int, default=100_000,
+                        help='Largest number of rows to store with the former write path, which is much slower.')
+    parser.add_argument('-b', '--batch_size', type=int, default=50,
+                        help='Records per store() call in the former write path, as in the CLI.')
+    main(parser.parse_args())
@@ -0,0 +1,191 @@
+import random
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+
+class FixtureSite:
+    """
+    Serves P12-like robots.txt, search result and article pages from a local HTTP server running in a background
+    thread, so that benchmarks do not depend on (nor burden) the real website.
+    Article latencies follow a skewed distribution: most pages answer quickly while a few of them are much slower.
+    """
+    def __init__(self, articles_count: int = 100, base_latency_sec: float = 0.05, slow_latency_sec: float = 1.0,
+                 slow_articles_ratio: float = 0.1, results_per_search_page: int = 10, seed: int = 0):
+        self.__randomizer = random.Random(seed)
+        self.__results_per_search_page = results_per_search_page
+        self.__articles = {}
+        for article_id in range(1, articles_count + 1):
+            is_slow = self.__randomizer.random() < slow_articles_ratio
+            latency_sec = slow_latency_sec if is_slow else base_latency_sec * self.__randomizer.uniform(0.5, 1.5)
+            self.__articles[f'/{article_id}-fixture-article'] = {'id': article_id, 'latency_sec': latency_sec}
+        self.__server = None
+        self.__thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        The root URL of the running server.
+        """
+        host, port = self.__server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    @property
+    def articles_urls(self) -> list[str]:
+        """
+        The absolute URLs of every served article.
+        """
+        return [self.url.rstrip('/') + path for path in self.__articles]
+
+    @property
+    def articles_specs(self) -> dict[str, dict]:
+        """
+        The settings each article is rendered with, keyed by URL path.
+        """
+        return self.__articles
+
+    def set_article_spec(self, path: str, **spec):
+        """
+        Overrides the settings of the article served at path, e.g. to drop its author or main image.
+        """
+        self.__articles[path].update(spec)
+
+    def render_article(self, path: str) -> str:
+        """
+        Renders the article at path following the markup P12Scraper expects.
+        Specs may set 'has_author', 'has_main_image' or 'has_fallback_image' to False to drop those nodes.
+        """
+        spec = self.__articles[path]
+        article_id = spec['id']
+        author_html = ''
+        if spec.get('has_author', True):
+            author_html = f'<div class="author"><a href="/autores/{article_id}">Por Autor {article_id}</a></div>'
+        image_html = ''
+        if spec.get('has_main_image', True):
+            image_html = (f'<div class="article-main-image">'
+                          f'<img src="/images/{article_id}.jpg?itok=fixture" alt=""></div>')
+        elif spec.get('has_fallback_image', True):
+            image_html = (f'<div class="no-main-image">'
+                          f'<img src="/images/{article_id}-fallback.jpg?itok=fixture" alt=""></div>')
+        paragraphs = '\n'.join(f'<p>Párrafo {index} del artículo {article_id}. Texto de prueba.</p>'
+                               for index in range(1, 6))
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="utf-8"><title>Artículo {article_id}</title></head>
+<body>
+<div class="article-header">
+  <h1>Artículo de prueba {article_id}</h1>
+  {author_html}
+</div>
+<div class="hide-on-mobile">
+  <div class="article-info"><time datetime="2025-02-13T01:14:20-03:00">13 de febrero de 2025</time></div>
+</div>
+{image_html}
+<div class="article-main-content">
+  <div class="article-text">
+{paragraphs}
+  </div>
+</div>
+</body>
+</html>"""
+
+    def render_search_page(self, keyword: str, page_index: int) -> str:
+        """
+        Renders one page of search results, listing every article in a fixed order regardless of the keyword.
+        """
+        paths = list(self.__articles)
+        start = page_index * self.__results_per_search_page
+        items = '\n'.join(f'<div class="article-item__header"><a href="{path}">{escape(path)}</a></div>'
+                          for path in paths[start:start + self.__results_per_search_page])
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="utf-8"><title>Buscar: {escape(keyword)}</title></head>
+<body>
+{items}
+</body>
+</html>"""
+
+    def start(self) -> 'FixtureSite':
+        """
+        Starts serving on an ephemeral localhost port.
+        """
+        fixture_site = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed_url = urlparse(self.path)
+                status, body, latency_sec = fixture_site.route(parsed_url.path, parse_qs(parsed_url.query))
+                time.sleep(latency_sec)
+                encoded_body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8' if parsed_url.path == '/robots.txt'
+                                 else 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(encoded_body)))
+                self.end_headers()
+                self.wfile.write(encoded_body)
+
+            def log_message(self, *args):
+                pass  # Keeps benchmark output readable
+
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), RequestHandler)
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def route(self, path: str, query: dict[str, list[str]]) -> tuple[int, str, float]:
+        """
+        Resolves a request path into its status code, body and simulated latency.
+        """
+        if path == '/robots.txt':
+            return 200, 'User-agent: *\nDisallow: /*/\nAllow: /images/\n', 0
+        if path == '/buscar':
+            keyword = query.get('q', [''])[0]
+            page_index = int(query.get('page', ['0'])[0])
+            return 200, self.render_search_page(keyword, page_index), 0
+        if path in self.__articles:
+            return 200, self.render_article(path), self.__articles[path]['latency_sec']
+        return 404, '<html><body>Not found</body></html>', 0
+
+    def stop(self):
+        """
+        Shuts the server down.
+        """
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+            self.__thread = None
+
+    def __enter__(self) -> 'FixtureSite':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def get_fixture_scraper_class(scraper_class: type, fixture_site: FixtureSite, **scraper_kwargs) -> type:
+    """
+    Returns a subclass of scraper_class whose host points to fixture_site.
+    """
+    class FixtureScraper(scraper_class):
+        def __init__(self, **kwargs):
+            super().__init__(**{**scraper_kwargs, **kwargs})
+            self._host = fixture_site.url
+
+    return FixtureScraper
+
+
+def format_rate(label: str, items_count: int, elapsed_sec: float, unit: str = 'articles',
+                extra: Optional[str] = None) -> str:
+    """
+    Formats a throughput measurement as a single report line.
+    """
+    rate = items_count / elapsed_sec if elapsed_sec > 0 else float('inf')
+    line = f'{label:<24} {items_count:>7} {unit} in {elapsed_sec:8.3f} s -> {rate:10.2f} {unit}/s'
+    if extra is not None:
+        line += f'  {extra}'
+    return line
@@ -0,0 +1,53 @@
+"""
+Compares the throughput of BaseNewsScraper._gather_articles throttling modes on a local fixture site
+with skewed page latencies.
+
+Usage:
+    python -m source.benchmarks.gather_articles_benchmark [-a ARTICLES] [-c CHUNK_SIZE]
+"""
+import argparse
+import asyncio
+import time
+
+from source.benchmarks.fixture_site import FixtureSite, get_fixture_scraper_class, format_rate
+from source.classes.p12_scraper import P12Scraper
+
+BENCHMARK_USERAGENT = 'Mozilla/5.0 (X11; Linux x86_64) NewsScraperBenchmark/1.0'
+
+
+async def measure_mode(fixture_site: FixtureSite, throttling_mode: str, chunk_size: int) -> float:
+    """
+    Scrapes every fixture article with the given throttling mode and returns the elapsed time in seconds.
+    """
+    scraper_class = get_fixture_scraper_class(P12Scraper, fixture_site)
+    scraper = scraper_class(throttling_chunk_size=chunk_size, throttling_mode=throttling_mode)
+    await scraper.initialize_website_handler(user_agent=BENCHMARK_USERAGENT)
+    try:
+        start = time.perf_counter()
+        scraped_articles = await scraper._gather_articles(fixture_site.articles_urls)
+        elapsed_sec = time.perf_counter() - start
+    finally:
+        await scraper.destroy()
+    assert all(article is not None for article in scraped_articles)
+    return elapsed_sec
+
+
+async def main(args: argparse.Namespace):
+    with FixtureSite(articles_count=args.articles, base_latency_sec=args.base_latency,
+                     slow_latency_sec=args.slow_latency, slow_articles_ratio=args.slow_ratio) as fixture_site:
+        results = []
+        for throttling_mode in ('chunked', 'pool'):
+            elapsed_sec = await measure_mode(fixture_site, throttling_mode, args.chunk_size)
+            results.append(format_rate(throttling_mode, args.articles, elapsed_sec))
+    print(f'Chunk size: {args.chunk_size}, slow articles: {args.slow_ratio:.0%} at {args.slow_latency} s')
+    print('\n'.join(results))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='_gather_articles throttling modes benchmark.')
+    parser.add_argument('-a', '--articles', type=int, default=100, help='Number of fixture articles.')
+    parser.add_argument('-c', '--chunk_size', type=int, default=5, help='Throttling chunk size.')
+    parser.add_argument('--base_latency', type=float, default=0.05, help='Typical article latency in seconds.')
+    parser.add_argument('--slow_latency', type=float, default=1.0, help='Slow article latency in seconds.')
+    parser.add_argument('--slow_ratio', type=float, default=0.1, help='Ratio of slow articles.')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,60 @@
+"""
+Measures keyword matching throughput as the number of tracked keywords grows, comparing the former per-keyword
+casefolded substring search against KeywordMatcher's single-pass automaton.
+
+Usage:
+    python -m source.benchmarks.keyword_matcher_benchmark [-a ARTICLES] [-w WORDS]
+"""
+import argparse
+import random
+import time
+
+from source.benchmarks.fixture_site import format_rate
+from source.classes.keyword_matcher import KeywordMatcher
+
+VOCABULARY = ('gobierno', 'educación', 'pública', 'salarios', 'inflación', 'jubilaciones', 'paritarias', 'dólar',
+              'provincia', 'congreso', 'elecciones', 'universidad', 'colibrí', 'caracoles', 'año', 'señal', 'de',
+              'la', 'el', 'y', 'en', 'que', 'los', 'las', 'por', 'con', 'una')
+
+
+def generate_articles(articles_count: int, words_per_article: int, randomizer: random.Random) -> list[str]:
+    """
+    Generates article-sized texts from a small Spanish vocabulary.
+    """
+    return [' '.join(randomizer.choices(VOCABULARY, k=words_per_article)) for _ in range(articles_count)]
+
+
+def match_naively(keywords: list[str], text: str) -> list[str]:
+    """
+    The matching P12Scraper.search performed before KeywordMatcher, repeated for each keyword.
+    """
+    return [keyword for keyword in keywords if keyword.casefold() in text.casefold()]
+
+
+def main(args: argparse.Namespace):
+    randomizer = random.Random(0)
+    articles = generate_articles(args.articles, args.words, randomizer)
+    characters_count = sum(len(article) for article in articles)
+    print(f'Articles: {args.articles}, characters: {characters_count}')
+    for keywords_count in (1, 10, 100, 1000):
+        keywords = [f'{randomizer.choice(VOCABULARY)} {randomizer.choice(VOCABULARY)}{index}'
+                    for index in range(keywords_count - 1)] + ['educación pública']
+        start = time.perf_counter()
+        for article in articles:
+            match_naively(keywords, article)
+        naive_elapsed_sec = time.perf_counter() - start
+        matcher = KeywordMatcher(keywords)
+        start = time.perf_counter()
+        for article in articles:
+            matcher.match(article)
+        matcher_elapsed_sec = time.perf_counter() - start
+        print(format_rate(f'naive, {keywords_count} keywords', characters_count, naive_elapsed_sec, unit='chars'))
+        print(format_rate(f'matcher, {keywords_count} keywords', characters_count, matcher_elapsed_sec,
+                          unit='chars'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Keyword matching benchmark.')
+    parser.add_argument('-a', '--articles', type=int, default=200, help='Number of generated articles.')
+    parser.add_argument('-w', '--words', type=int, default=800, help='Words per article.')
+    main(parser.parse_args())
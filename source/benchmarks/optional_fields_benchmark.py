@@ -0,0 +1,81 @@
+"""
+Measures the per-article extraction latency of P12Scraper on fixture articles with missing fields, comparing
+timeout-driven absence detection (no optional fields) against the immediate presence check of optional fields.
+
+Usage:
+    python -m source.benchmarks.optional_fields_benchmark [-t TIMEOUT] [-s SAMPLES]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from source.benchmarks.fixture_site import FixtureSite, get_fixture_scraper_class
+from source.benchmarks.gather_articles_benchmark import BENCHMARK_USERAGENT
+from source.classes.p12_scraper import P12Scraper
+
+ARTICLE_KINDS = {
+    'complete': {},
+    'no author': {'has_author': False},
+    'fallback image': {'has_main_image': False},
+    'no image': {'has_main_image': False, 'has_fallback_image': False},
+    'no author nor image': {'has_author': False, 'has_main_image': False, 'has_fallback_image': False},
+}
+
+
+async def measure_latencies(fixture_site: FixtureSite, urls_by_kind: dict[str, list[str]],
+                            optional_fields: tuple[str, ...], timeout_sec: int) -> dict[str, dict[str, float]]:
+    """
+    Returns the median extraction latency per article kind, for both the per-field getters and get_article().
+    Navigation is excluded from the measurement.
+    """
+    scraper_class = get_fixture_scraper_class(P12Scraper, fixture_site, optional_fields=optional_fields)
+    scraper = scraper_class()
+    await scraper.initialize_website_handler(user_agent=BENCHMARK_USERAGENT, default_timeout_sec=timeout_sec)
+    latencies = {}
+    try:
+        for kind, urls in urls_by_kind.items():
+            getters_latencies = []
+            combined_latencies = []
+            for url in urls:
+                page = scraper._wshandler.page
+                await scraper._wshandler.safe_goto(url)
+                start = time.perf_counter()
+                await asyncio.gather(scraper.get_title(page=page), scraper.get_date(page=page),
+                                     scraper.get_author(page=page), scraper.get_image_url(page=page),
+                                     scraper.get_body(page=page))
+                getters_latencies.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                await scraper.get_article(page=page)
+                combined_latencies.append(time.perf_counter() - start)
+            latencies[kind] = {'getters': statistics.median(getters_latencies),
+                               'get_article': statistics.median(combined_latencies)}
+    finally:
+        await scraper.destroy()
+    return latencies
+
+
+async def main(args: argparse.Namespace):
+    articles_count = len(ARTICLE_KINDS) * args.samples
+    with FixtureSite(articles_count=articles_count, base_latency_sec=0, slow_articles_ratio=0) as fixture_site:
+        urls_by_kind = {kind: [] for kind in ARTICLE_KINDS}
+        for index, path in enumerate(list(fixture_site.articles_specs)):
+            kind = list(ARTICLE_KINDS)[index % len(ARTICLE_KINDS)]
+            fixture_site.set_article_spec(path, **ARTICLE_KINDS[kind])
+            urls_by_kind[kind].append(fixture_site.url.rstrip('/') + path)
+        before = await measure_latencies(fixture_site, urls_by_kind, (), args.timeout)
+        after = await measure_latencies(fixture_site, urls_by_kind, ('author', 'image_url'), args.timeout)
+
+    print(f'Median per-article extraction latency in seconds (timeout: {args.timeout} s)')
+    print(f'{"article kind":<22} {"getters before":>15} {"getters after":>15} '
+          f'{"get_article before":>19} {"get_article after":>18}')
+    for kind in ARTICLE_KINDS:
+        print(f'{kind:<22} {before[kind]["getters"]:>15.3f} {after[kind]["getters"]:>15.3f} '
+              f'{before[kind]["get_article"]:>19.3f} {after[kind]["get_article"]:>18.3f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Optional article fields benchmark.')
+    parser.add_argument('-t', '--timeout', type=int, default=5, help='Default timeout in seconds.')
+    parser.add_argument('-s', '--samples', type=int, default=2, help='Articles per kind.')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,53 @@
+import asyncio
+import os
+from pathlib import Path
+
+
+def get_process_tree_rss_bytes(root_pid: int | None = None) -> int:
+    """
+    Returns the resident set size of a process and all its descendants, e.g. Playwright's driver and browsers.
+    Relies on Linux's /proc filesystem.
+    """
+    root_pid = root_pid or os.getpid()
+    children_by_parent = {}
+    rss_by_pid = {}
+    for status_path in Path('/proc').glob('[0-9]*/status'):
+        try:
+            status_lines = status_path.read_text().splitlines()
+        except OSError:
+            continue  # The process exited meanwhile
+        status = dict(line.split(':', 1) for line in status_lines if ':' in line)
+        pid = int(status['Pid'])
+        children_by_parent.setdefault(int(status['PPid']), []).append(pid)
+        rss_by_pid[pid] = int(status.get('VmRSS', '0 kB').split()[0]) * 1024
+    total_rss = 0
+    pending_pids = [root_pid]
+    while len(pending_pids) > 0:
+        pid = pending_pids.pop()
+        total_rss += rss_by_pid.get(pid, 0)
+        pending_pids += children_by_parent.get(pid, [])
+    return total_rss
+
+
+class PeakRSSSampler:
+    """
+    Samples the process tree's RSS in the background and keeps its peak, while used as an async context manager.
+    """
+    def __init__(self, interval_sec: float = 0.1):
+        self.__interval_sec = interval_sec
+        self.__task = None
+        self.peak_rss_bytes = 0
+
+    async def __sample(self):
+        while True:
+            self.peak_rss_bytes = max(self.peak_rss_bytes, get_process_tree_rss_bytes())
+            await asyncio.sleep(self.__interval_sec)
+
+    async def __aenter__(self) -> 'PeakRSSSampler':
+        self.__task = asyncio.create_task(self.__sample())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.__task.cancel()
+        await asyncio.gather(self.__task, return_exceptions=True)
+        self.peak_rss_bytes = max(self.peak_rss_bytes, get_process_tree_rss_bytes())
@@ -0,0 +1,95 @@
+"""
+Measures robots.txt compliance checks per second for rule sets with hundreds of entries, comparing the former
+fnmatch-based evaluation (rules re-sorted on every call) against the compiled RobotsMatcher, with and without
+its verdicts cache.
+
+Usage:
+    python -m source.benchmarks.robots_matcher_benchmark [-r RULES] [-p PATHS] [-c CHECKS]
+"""
+import argparse
+import fnmatch
+import random
+import time
+from pathlib import Path
+
+from source.benchmarks.fixture_site import format_rate
+from source.classes.robots_matcher import RobotsMatcher
+
+
+def is_compliant_fnmatch(url_path: str, allowed_paths: list[str], disallowed_paths: list[str]) -> bool:
+    """
+    The evaluation WebsiteHandler.is_compliant_url performed before RobotsMatcher.
+    """
+    all_paths = allowed_paths + disallowed_paths
+    all_paths_sorted = sorted(all_paths, key=lambda path: len(Path(path).resolve().parents))
+    is_compliant = True
+    for path in all_paths_sorted:
+        path_pattern = path
+        if path[-1] != '*':
+            path_pattern += '*'
+        if fnmatch.fnmatch(url_path, path_pattern):
+            is_compliant = path in allowed_paths
+    return is_compliant
+
+
+def generate_rules(rules_count: int, randomizer: random.Random) -> tuple[list[str], list[str]]:
+    """
+    Generates a mix of literal and wildcard rules, resembling those of large news sites.
+    """
+    sections = [f'seccion-{index}' for index in range(rules_count // 4 + 1)]
+    allowed_paths = []
+    disallowed_paths = []
+    for index in range(rules_count):
+        section = randomizer.choice(sections)
+        rule = randomizer.choice([f'/{section}/', f'/{section}/*/amp', f'/*/{section}-{index}',
+                                  f'/{section}?page=*', f'/*.{section}$'])
+        (allowed_paths if index % 3 == 0 else disallowed_paths).append(rule)
+    return allowed_paths, disallowed_paths
+
+
+def generate_paths(paths_count: int, randomizer: random.Random) -> list[str]:
+    """
+    Generates article-like URL paths, some of which fall under section rules.
+    """
+    return [randomizer.choice([f'/{index}-articulo-de-prueba', f'/seccion-{index % 50}/{index}-nota',
+                               f'/seccion-{index % 50}/{index}/amp'])
+            for index in range(paths_count)]
+
+
+def measure(check, paths: list[str], checks_count: int) -> float:
+    """
+    Runs checks_count compliance checks cycling over paths and returns the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    for index in range(checks_count):
+        check(paths[index % len(paths)])
+    return time.perf_counter() - start
+
+
+def main(args: argparse.Namespace):
+    randomizer = random.Random(0)
+    allowed_paths, disallowed_paths = generate_rules(args.rules, randomizer)
+    paths = generate_paths(args.paths, randomizer)
+
+    fnmatch_checks = max(1, args.checks // 100)  # The former evaluation is orders of magnitude slower
+    fnmatch_elapsed_sec = measure(lambda path: is_compliant_fnmatch(path, allowed_paths, disallowed_paths),
+                                  paths, fnmatch_checks)
+    start = time.perf_counter()
+    uncached_matcher = RobotsMatcher(allowed_paths, disallowed_paths, verdicts_cache_size=0)
+    compile_elapsed_sec = time.perf_counter() - start
+    uncached_elapsed_sec = measure(uncached_matcher.is_allowed, paths, args.checks)
+    cached_matcher = RobotsMatcher(allowed_paths, disallowed_paths)
+    cached_elapsed_sec = measure(cached_matcher.is_allowed, paths, args.checks)
+
+    print(f'Rules: {args.rules}, distinct paths: {args.paths}, compilation: {compile_elapsed_sec * 1000:.2f} ms')
+    print(format_rate('fnmatch (before)', fnmatch_checks, fnmatch_elapsed_sec, unit='checks'))
+    print(format_rate('compiled', args.checks, uncached_elapsed_sec, unit='checks'))
+    print(format_rate('compiled + cache', args.checks, cached_elapsed_sec, unit='checks'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='robots.txt compliance checks benchmark.')
+    parser.add_argument('-r', '--rules', type=int, default=500, help='Number of robots.txt rules.')
+    parser.add_argument('-p', '--paths', type=int, default=1000, help='Number of distinct URL paths.')
+    parser.add_argument('-c', '--checks', type=int, default=200000, help='Number of compliance checks.')
+    main(parser.parse_args())
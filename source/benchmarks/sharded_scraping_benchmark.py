@@ -0,0 +1,60 @@
+"""
+Compares the throughput of BaseNewsScraper._stream_articles scraping in the main process and sharded across worker
+processes (see ScrapingWorkerPool) on a local fixture site.
+
+Usage:
+    python -m source.benchmarks.sharded_scraping_benchmark [-a ARTICLES] [-c CHUNK_SIZE] [-w WORKERS ...]
+"""
+import argparse
+import asyncio
+import time
+
+from source.benchmarks.fixture_site import FixtureSite, get_fixture_scraper_class, format_rate
+from source.classes.p12_scraper import P12Scraper
+
+BENCHMARK_USERAGENT = 'Mozilla/5.0 (X11; Linux x86_64) NewsScraperBenchmark/1.0'
+
+
+async def measure_workers(fixture_site: FixtureSite, workers_count: int, chunk_size: int) -> float:
+    """
+    Scrapes every fixture article with workers_count worker processes (none if 1) and returns the elapsed time in
+    seconds, excluding the workers' startup.
+    """
+    scraper_class = get_fixture_scraper_class(P12Scraper, fixture_site)
+    scraper = scraper_class(throttling_chunk_size=chunk_size)
+    await scraper.initialize_website_handler(user_agent=BENCHMARK_USERAGENT)
+    try:
+        if workers_count > 1:
+            # FixtureScraper is local to get_fixture_scraper_class, so workers build P12Scrapers pointed at the site
+            await scraper.initialize_worker_pool(workers_count, worker_class=P12Scraper)
+        start = time.perf_counter()
+        scraped_articles = [article async for article in scraper._stream_articles(fixture_site.articles_urls)]
+        elapsed_sec = time.perf_counter() - start
+    finally:
+        await scraper.destroy()
+    assert len(scraped_articles) == len(fixture_site.articles_urls)
+    assert all(article is not None for article in scraped_articles)
+    return elapsed_sec
+
+
+async def main(args: argparse.Namespace):
+    with FixtureSite(articles_count=args.articles, base_latency_sec=args.base_latency,
+                     slow_latency_sec=args.slow_latency, slow_articles_ratio=args.slow_ratio) as fixture_site:
+        results = []
+        for workers_count in args.workers:
+            elapsed_sec = await measure_workers(fixture_site, workers_count, args.chunk_size)
+            results.append(format_rate(f'{workers_count} worker(s)', args.articles, elapsed_sec))
+    print(f'Chunk size per worker: {args.chunk_size}, slow articles: {args.slow_ratio:.0%} at {args.slow_latency} s')
+    print('\n'.join(results))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sharded scraping benchmark.')
+    parser.add_argument('-a', '--articles', type=int, default=400, help='Number of fixture articles.')
+    parser.add_argument('-c', '--chunk_size', type=int, default=5, help='Throttling chunk size of every worker.')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Worker counts to compare; 1 scrapes in the main process.')
+    parser.add_argument('--base_latency', type=float, default=0.05, help='Typical article latency in seconds.')
+    parser.add_argument('--slow_latency', type=float, default=1.0, help='Slow article latency in seconds.')
+    parser.add_argument('--slow_ratio', type=float, default=0.1, help='Ratio of slow articles.')
+    asyncio.run(main(parser.parse_args()))
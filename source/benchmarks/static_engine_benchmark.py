@@ -0,0 +1,52 @@
+"""
+Compares articles/sec and peak RSS (Python, Playwright driver and browser processes) of the 'browser' and
+'static' scraping engines on a local fixture site.
+
+Usage:
+    python -m source.benchmarks.static_engine_benchmark [-a ARTICLES] [-c CHUNK_SIZE]
+"""
+import argparse
+import asyncio
+import time
+
+from source.benchmarks.fixture_site import FixtureSite, get_fixture_scraper_class, format_rate
+from source.benchmarks.gather_articles_benchmark import BENCHMARK_USERAGENT
+from source.benchmarks.process_metrics import PeakRSSSampler
+from source.classes.p12_scraper import P12Scraper
+
+
+async def measure_engine(fixture_site: FixtureSite, engine: str, chunk_size: int) -> tuple[float, int]:
+    """
+    Scrapes every fixture article with the given engine and returns the elapsed time and the peak RSS.
+    """
+    scraper_class = get_fixture_scraper_class(P12Scraper, fixture_site, engine=engine)
+    scraper = scraper_class(throttling_chunk_size=chunk_size)
+    async with PeakRSSSampler() as rss_sampler:
+        await scraper.initialize_website_handler(user_agent=BENCHMARK_USERAGENT)
+        try:
+            start = time.perf_counter()
+            scraped_articles = await scraper._gather_articles(fixture_site.articles_urls)
+            elapsed_sec = time.perf_counter() - start
+        finally:
+            await scraper.destroy()
+    assert all(article is not None for article in scraped_articles)
+    return elapsed_sec, rss_sampler.peak_rss_bytes
+
+
+async def main(args: argparse.Namespace):
+    with FixtureSite(articles_count=args.articles, base_latency_sec=args.latency,
+                     slow_articles_ratio=0) as fixture_site:
+        results = []
+        for engine in P12Scraper.engines:
+            elapsed_sec, peak_rss_bytes = await measure_engine(fixture_site, engine, args.chunk_size)
+            results.append(format_rate(engine, args.articles, elapsed_sec,
+                                       extra=f'peak RSS: {peak_rss_bytes / 2 ** 20:8.1f} MiB'))
+    print('\n'.join(results))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scraping engines benchmark.')
+    parser.add_argument('-a', '--articles', type=int, default=100, help='Number of fixture articles.')
+    parser.add_argument('-c', '--chunk_size', type=int, default=5, help='Throttling chunk size.')
+    parser.add_argument('--latency', type=float, default=0.02, help='Article latency in seconds.')
+    asyncio.run(main(parser.parse_args()))
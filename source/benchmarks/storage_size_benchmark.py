@@ -0,0 +1,85 @@
+"""
+Measures the database size reduction of normalized article storage: a synthetic database with the former schema,
+which stored article contents once per matching keyword, is migrated to the Articles and MatchingArticles tables.
+
+Usage:
+    python -m source.benchmarks.storage_size_benchmark [-a ARTICLES] [-k KEYWORDS] [-w WORDS]
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from source.classes.db_manager import DBManager
+from source.interfaces.db_migrations import MIGRATIONS
+from source.interfaces.db_tables import Articles
+
+LEGACY_SCHEMA = """
+CREATE TABLE "MatchingArticles" (
+    "ID" INTEGER NOT NULL,
+    "Keyword" TEXT NOT NULL,
+    "URL" TEXT NOT NULL,
+    "Title" TEXT,
+    "Date" DATETIME,
+    "Author" TEXT,
+    "ImageURL" TEXT,
+    "Body" TEXT,
+    "CreatedOn" DATETIME,
+    "UpdatedOn" DATETIME,
+    PRIMARY KEY ("ID")
+);
+CREATE INDEX "IX_MatchingArticles_Keyword_URL" ON "MatchingArticles" ("Keyword", "URL");
+"""
+VOCABULARY = ('gobierno', 'educación', 'pública', 'salarios', 'inflación', 'jubilaciones', 'paritarias', 'dólar',
+              'provincia', 'congreso', 'elecciones', 'universidad', 'colibrí', 'caracoles', 'año', 'señal', 'de',
+              'la', 'el', 'y', 'en', 'que', 'los', 'las', 'por', 'con', 'una')
+
+
+def create_legacy_database(db_filepath: Path, articles_count: int, keywords_per_article: int,
+                           words_per_article: int):
+    """
+    Creates a database with the former schema, storing every article once per matching keyword.
+    """
+    randomizer = random.Random(0)
+    with sqlite3.connect(db_filepath) as connection:
+        connection.executescript(LEGACY_SCHEMA)
+        for index in range(articles_count):
+            body = ' '.join(randomizer.choices(VOCABULARY, k=words_per_article))
+            connection.executemany(
+                'INSERT INTO MatchingArticles (Keyword, URL, Title, Date, Author, ImageURL, Body, CreatedOn, '
+                'UpdatedOn) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(f'keyword {keyword_index}', f'https://www.pagina12.com.ar/{index}-articulo-de-prueba',
+                  f'Artículo de prueba {index}', '2025-02-13 01:14:20', 'María Pia López',
+                  f'https://images.pagina12.com.ar/styles/focal_3_2_470x313/public/{index}.jpg', body,
+                  '2025-02-13 01:14:20', '2025-02-13 01:14:20')
+                 for keyword_index in randomizer.sample(range(100), keywords_per_article)])
+    connection.close()
+
+
+def main(args: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        db_filepath = Path(temporary_directory) / 'legacy.db'
+        create_legacy_database(db_filepath, args.articles, args.keywords, args.words)
+        legacy_size = db_filepath.stat().st_size
+        start = time.perf_counter()
+        dbmanager = DBManager(filepath=db_filepath, migrations=MIGRATIONS)
+        elapsed_sec = time.perf_counter() - start
+        stored_articles_count = len(dbmanager.retrieve(columns=[Articles.ID]))
+        dbmanager.destroy()
+        normalized_size = db_filepath.stat().st_size
+    print(f'Articles: {args.articles}, keywords per article: {args.keywords}, words per article: {args.words}')
+    print(f'{"schema":<24} {"size (KiB)":>12}')
+    print(f'{"per keyword (before)":<24} {legacy_size / 1024:>12.1f}')
+    print(f'{"normalized":<24} {normalized_size / 1024:>12.1f}')
+    print(f'Size reduction: {1 - normalized_size / legacy_size:.1%} ({stored_articles_count} articles migrated in '
+          f'{elapsed_sec:.2f} s)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Normalized storage size benchmark.')
+    parser.add_argument('-a', '--articles', type=int, default=2000, help='Number of unique articles.')
+    parser.add_argument('-k', '--keywords', type=int, default=5, help='Matching keywords per article.')
+    parser.add_argument('-w', '--words', type=int, default=800, help='Words per article body.')
+    main(parser.parse_args())
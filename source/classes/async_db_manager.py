@@ -0,0 +1,178 @@
+import asyncio
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+from pandas import DataFrame
+from sqlalchemy import Connection
+
+from source.classes.base_storage_manager import BaseStorageManager
+from source.classes.db_manager import DBManager
+from source.classes.postgres_manager import PostgresManager
+
+
+class UninitializedConnection(Exception):
+    pass
+
+
+class AsyncDBManager(BaseStorageManager):
+    """
+    Runs a DBManager in a dedicated writer thread, so that SQLite I/O never blocks the event loop.
+    Writes are queued and return right away. The writer thread groups every write queued meanwhile into a single
+    transaction, in the order they were queued. Once max_pending_writes are queued, further writes wait for the writer
+    to catch up, which slows the caller down to the pace of the disk. Reads run in the writer thread as well, once the
+    writes queued before them are committed, so that they never return stale rows.
+    Records go to the SQLite database at filepath or, if database_url is given, to a PostgreSQL database through a
+    PostgresManager.
+    """
+    def __init__(self, filepath: Path, migrations: Sequence[Callable[[Connection], None]] = (),
+                 max_pending_writes: int = 16, database_url: Optional[str] = None):
+        self.__filepath = filepath
+        self.__migrations = migrations
+        self.__database_url = database_url
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='AsyncDBManager')
+        self.__pending_writes = asyncio.Queue(maxsize=max_pending_writes)
+        self.__dbmanager = None
+        self.__writer_task = None
+        self.__write_error = None
+        self.__lost_writes_count = 0
+
+    async def initialize_connection(self):
+        """
+        Opens (and upgrades, if needed) the database in the writer thread, and starts writing queued records.
+        """
+        async def write_pending():
+            """
+            Waits for queued writes and performs all of them in a single transaction, then releases the reads queued
+            meanwhile. If the transaction fails, every write it grouped is rolled back and counted as lost, and the
+            first failure is kept, to be raised by the next write or flush.
+            """
+            while True:
+                queued_items = [await self.__pending_writes.get()]
+                while not self.__pending_writes.empty():
+                    queued_items.append(self.__pending_writes.get_nowait())
+                writes = [item for item in queued_items if not isinstance(item, asyncio.Future)]
+                try:
+                    if len(writes) > 0:
+                        await asyncio.get_running_loop().run_in_executor(self.__executor, self.__write, writes)
+                except Exception as error:
+                    self.__lost_writes_count += len(writes)
+                    if self.__write_error is None:
+                        self.__write_error = error
+                finally:
+                    for item in queued_items:
+                        if isinstance(item, asyncio.Future) and not item.done():
+                            item.set_result(None)
+                        self.__pending_writes.task_done()
+
+        if self.__database_url is None:
+            open_database = partial(DBManager, filepath=self.__filepath, migrations=self.__migrations)
+        else:
+            open_database = partial(PostgresManager, url=self.__database_url)
+        self.__dbmanager = await asyncio.get_running_loop().run_in_executor(self.__executor, open_database)
+        self.__writer_task = asyncio.create_task(write_pending())
+
+    def __check_connection(self):
+        """
+        Ensures that the connection has been initialized.
+        """
+        if self.__dbmanager is None:
+            raise UninitializedConnection(
+                'The connection is not initialized. Call the "initialize_connection" method first.')
+
+    def __raise_write_error(self):
+        """
+        Raises the error of the first failed write, if any, noting how many writes were rolled back since the previous
+        one was raised. Each failure is raised once, and later writes proceed normally.
+        """
+        if self.__write_error is not None:
+            write_error, self.__write_error = self.__write_error, None
+            lost_writes_count, self.__lost_writes_count = self.__lost_writes_count, 0
+            write_error.add_note(f'{lost_writes_count} queued write(s) were rolled back, including those grouped with '
+                                 f'the failed one.')
+            raise write_error
+
+    def __write(self, writes: list[Callable[[], object]]):
+        """
+        Performs the given writes in a single transaction. Runs in the writer thread.
+        """
+        with self.__dbmanager.transaction():
+            for write in writes:
+                write()
+
+    async def __enqueue(self, write: Callable[[], object]):
+        """
+        Queues a write, waiting for room if max_pending_writes are already queued.
+        """
+        self.__raise_write_error()
+        await self.__pending_writes.put(write)
+
+    async def store(self, records: Iterable, replace_duplicates: bool = False):
+        """
+        Queues the records to be stored as DBManager.store does. They are read in the writer thread, so they must not
+        be modified afterward. Raises the error of a failed earlier write, if any (see flush).
+        """
+        self.__check_connection()
+        await self.__enqueue(partial(self.__dbmanager.store, records, replace_duplicates=replace_duplicates))
+
+    async def upsert(self, records: Iterable, conflict_columns: Sequence[str], hash_column: str):
+        """
+        Queues the records to be upserted as DBManager.upsert does. They are read in the writer thread, so they must
+        not be modified afterward. Raises the error of a failed earlier write, if any (see flush).
+        """
+        self.__check_connection()
+        await self.__enqueue(partial(self.__dbmanager.upsert, records, conflict_columns=conflict_columns,
+                                     hash_column=hash_column))
+
+    async def flush(self):
+        """
+        Waits until every queued write is committed, and raises the error of a failed one, if any. A failed
+        transaction rolls back every write grouped with it, which the raised error notes. Each failure is raised once:
+        callers that handle it may keep writing.
+        """
+        self.__check_connection()
+        await self.__pending_writes.join()
+        self.__raise_write_error()
+
+    async def run(self, function: Callable[[DBManager | PostgresManager], object]) -> object:
+        """
+        Calls function with the underlying DBManager (or PostgresManager) in the writer thread, once the writes queued
+        before are committed, and returns its result. Serves operations that the other methods do not cover, e.g.
+        those of a CrawlJobQueue built on the given manager.
+        """
+        self.__check_connection()
+        # The writer releases the barrier once the writes queued before it are committed
+        barrier = asyncio.get_running_loop().create_future()
+        await self.__pending_writes.put(barrier)
+        await barrier
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, function, self.__dbmanager)
+
+    async def retrieve(self, *args, **kwargs) -> DataFrame:
+        """
+        Runs DBManager.retrieve in the writer thread, once the writes queued before are committed.
+        """
+        return await self.run(lambda dbmanager: dbmanager.retrieve(*args, **kwargs))
+
+    async def retrieve_existing_values(self, *args, **kwargs) -> set:
+        """
+        Runs DBManager.retrieve_existing_values in the writer thread, once the writes queued before are committed.
+        """
+        return await self.run(lambda dbmanager: dbmanager.retrieve_existing_values(*args, **kwargs))
+
+    async def destroy(self):
+        """
+        Writes the queued records and releases allocated resources. Raises the error of a failed write, if any.
+        """
+        writer_task = self.__writer_task
+        try:
+            if writer_task is not None:
+                await self.flush()
+        finally:
+            if writer_task is not None:
+                writer_task.cancel()
+                self.__writer_task = None
+            if self.__dbmanager is not None:
+                await asyncio.get_running_loop().run_in_executor(self.__executor, self.__dbmanager.destroy)
+            self.__executor.shutdown()
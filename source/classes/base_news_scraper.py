@@ -1,11 +1,15 @@
 import abc
 import asyncio
 import re
-from collections.abc import Callable, Iterable
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Sequence
+from contextlib import aclosing
+from datetime import timedelta
 from typing import Optional
 
-from playwright.async_api import Page
+from playwright.async_api import Locator, Page
 
+from source.classes.scraping_worker_pool import ScrapingWorkerPool, merge_blocking_stats
+from source.classes.useragent_provider import UserAgentProvider
 from source.classes.website_handler import WebsiteHandler
 
 
@@ -13,29 +17,148 @@ class UninitializedWebsiteHandler(Exception):
     pass
 
 
+class InvalidThrottlingMode(Exception):
+    pass
+
+
+class UnknownArticleField(Exception):
+    pass
+
+
+class UnknownScrapingEngine(Exception):
+    pass
+
+
+class UnsupportedWorkerHook(Exception):
+    pass
+
+
 class BaseNewsScraper(metaclass=abc.ABCMeta):
     """
     Implements generic functionality and specifies abstract methods that subclasses must implement.
     """
-    def __init__(self, throttling_chunk_size: int = 5, non_breaking_space_char: str = u"\u00A0"):
+    throttling_modes = ('pool', 'chunked')
+    engines = ('browser', 'static')
+    article_fields = ('title', 'date', 'author', 'image_url', 'body')
+
+    def __init__(self, throttling_chunk_size: int = 5, throttling_mode: str = 'pool',
+                 optional_fields: Iterable[str] = ('author', 'image_url'), engine: str = 'browser',
+                 non_breaking_space_char: str = u"\u00A0"):
+        if throttling_mode not in self.throttling_modes:
+            raise InvalidThrottlingMode(f'Unknown throttling mode "{throttling_mode}". '
+                                        f'Expected one of: {", ".join(self.throttling_modes)}.')
+        if engine not in self.engines:
+            raise UnknownScrapingEngine(f'Unknown scraping engine "{engine}". '
+                                        f'Expected one of: {", ".join(self.engines)}.')
+        optional_fields = frozenset(optional_fields)
+        unknown_fields = optional_fields.difference(self.article_fields)
+        if len(unknown_fields) > 0:
+            raise UnknownArticleField(f'Unknown article fields: {", ".join(sorted(unknown_fields))}. '
+                                      f'Expected any of: {", ".join(self.article_fields)}.')
         self._host = None
         self._wshandler = None
         self.__non_breaking_space_char = non_breaking_space_char
         self.__throttling_chunk_size = throttling_chunk_size
+        self.__throttling_mode = throttling_mode
+        self.__optional_fields = optional_fields
+        self.__engine = engine
+        self.__useragent_provider = None
+        # Rebuild equivalent scrapers in worker processes
+        self.__scraper_kwargs = {'throttling_chunk_size': throttling_chunk_size, 'throttling_mode': throttling_mode,
+                                 'optional_fields': tuple(optional_fields), 'engine': engine}
+        self.__website_handler_kwargs = None
+        self.__worker_pool = None
 
     async def initialize_website_handler(self, headless: bool = True, default_timeout_sec: int = 5,
-                                         default_navigation_timeout_sec: int = 25):
+                                         default_navigation_timeout_sec: int = 25, user_agent: Optional[str] = None,
+                                         blocked_resource_types: Sequence[str] = (),
+                                         blocked_url_patterns: Sequence[str] = (),
+                                         useragent_provider: Optional[UserAgentProvider] = None):
         """
         Initializes WebsiteHandler and sets up host's robots.txt.
         Must be called externally as __init__() cannot invoke asynchronous methods.
         Destroys any existing instance when invoked.
+        A random, commonly used user-agent is retrieved unless user_agent is provided. If useragent_provider is
+        provided, it is taken from its cache instead, which gets filled on first use and refreshed in the background
+        once stale.
+        Requests matching blocked_resource_types or blocked_url_patterns (regular expressions) are aborted.
         """
         await self.destroy()
+        self.__website_handler_kwargs = {'headless': headless, 'default_timeout_sec': default_timeout_sec,
+                                         'default_navigation_timeout_sec': default_navigation_timeout_sec,
+                                         'blocked_resource_types': tuple(blocked_resource_types),
+                                         'blocked_url_patterns': tuple(blocked_url_patterns)}
         self._wshandler = WebsiteHandler(headless=headless, default_timeout_sec=default_timeout_sec,
-                                         default_navigation_timeout_sec=default_navigation_timeout_sec)
-        await self._wshandler.initialize_random_useragent_context()
+                                         default_navigation_timeout_sec=default_navigation_timeout_sec,
+                                         page_pool_max_size=self.__throttling_chunk_size,
+                                         blocked_resource_types=blocked_resource_types,
+                                         blocked_url_patterns=blocked_url_patterns)
+        self.__useragent_provider = useragent_provider
+        if user_agent is None and useragent_provider is not None:
+            user_agent = await useragent_provider.get_useragent()
+            if user_agent is None:
+                # Empty cache: fills it using the default browser context
+                await self._wshandler.initialize_playwright()
+                await useragent_provider.refresh(self._wshandler)
+                user_agent = await useragent_provider.get_useragent()
+        if user_agent is None:
+            await self._wshandler.initialize_random_useragent_context()
+        else:
+            await self._wshandler.initialize_playwright(user_agent=user_agent)
         await self._wshandler.setup_robots_compliance(self._host)
         print(f'P12 robots.txt has been loaded')
+        if useragent_provider is not None:
+            await useragent_provider.start_background_refresh(self._wshandler)
+
+    async def initialize_worker_pool(self, workers_count: int, worker_class: Optional[type] = None):
+        """
+        Starts workers_count worker processes (see ScrapingWorkerPool), which scrape the articles of
+        _stream_articles() from then on, instead of this instance's browser tabs. Each one keeps throttling_chunk_size
+        articles in flight, with a scraper and a WebsiteHandler set up like this instance's, and the same user-agent.
+        This instance still walks search result pages, and the articles are sent back to it.
+        Workers build instances of worker_class, which defaults to this instance's class and must be importable by
+        them. Must be called after initialize_website_handler().
+        """
+        self._check_website_handler_instance()
+        await self.destroy_worker_pool()
+        website_handler_kwargs = {**self.__website_handler_kwargs,
+                                  'user_agent': await self._wshandler.get_current_useragent()}
+        self.__worker_pool = ScrapingWorkerPool(workers_count=workers_count, scraper_class=worker_class or type(self),
+                                                scraper_kwargs=self.__scraper_kwargs, host=self._host,
+                                                website_handler_kwargs=website_handler_kwargs)
+        try:
+            await self.__worker_pool.start()
+        except BaseException:
+            await self.destroy_worker_pool()
+            raise
+        print(f'Scraping workers have been started: {workers_count}')
+
+    async def destroy_worker_pool(self):
+        """
+        Stops the worker processes, if any, so that articles are scraped in this instance's browser tabs again.
+        """
+        if self.__worker_pool is not None:
+            await self.__worker_pool.destroy()
+            self.__worker_pool = None
+
+    async def refresh_robots_compliance(self, ttl: timedelta) -> bool:
+        """
+        Reloads host's robots.txt once the loaded rules are older than ttl, so that long-running scrapers follow rule
+        changes. Returns whether the rules were reloaded. See WebsiteHandler.refresh_robots_compliance.
+        """
+        self._check_website_handler_instance()
+        return await self._wshandler.refresh_robots_compliance(ttl.total_seconds())
+
+    @property
+    def resource_blocking_stats(self) -> dict:
+        """
+        Requests saved by WebsiteHandler's resource blocking profile, and by those of the worker processes (if any).
+        See WebsiteHandler.blocking_stats.
+        """
+        self._check_website_handler_instance()
+        if self.__worker_pool is None:
+            return self._wshandler.blocking_stats
+        return merge_blocking_stats(self._wshandler.blocking_stats, self.__worker_pool.blocking_stats)
 
     def _check_website_handler_instance(self):
         """
@@ -53,6 +176,20 @@ class BaseNewsScraper(metaclass=abc.ABCMeta):
         if url is not None and url != self._wshandler.page.url:
             await self._wshandler.safe_goto(url=url, page=page)
 
+    @property
+    def optional_fields(self) -> frozenset[str]:
+        """
+        Article fields that resolve to an empty string as soon as their element is found missing.
+        """
+        return self.__optional_fields
+
+    async def _is_absent_optional_field(self, field_name: str, locator: Locator) -> bool:
+        """
+        Checks, without waiting, whether the element of an optional field is missing from the loaded DOM.
+        Always False for non-optional fields, which keep waiting for their element until the timeout expires.
+        """
+        return field_name in self.__optional_fields and await locator.count() == 0
+
     def _sanitize_text(self, raw_text_block: str) -> str:
         """
         Removes empty lines, non-breaking spaces and trims surrounding whitespace.
@@ -65,46 +202,149 @@ class BaseNewsScraper(metaclass=abc.ABCMeta):
         trimmed_text_block = sanitized_text_block.strip()
         return trimmed_text_block
 
-    async def _gather_articles(self, articles_urls: list[str], check_environment_hook: Optional[Callable] = None,
-                               do_throttle: bool = True) -> list[dict[str, str] | None]:
+    async def _scrap_static_article(self, article_url: str) -> list[str] | None:
+        """
+        Fetches the article's HTML without a browser tab and extracts its fields with _parse_article_html().
+        Returns None when the response is not successful or the page cannot be parsed.
+        """
+        response = await self._wshandler.safe_get_request(article_url)
+        if not response.ok:
+            return None
+        return self._parse_article_html(await response.text())
+
+    def _parse_article_html(self, html: str) -> list[str] | None:
+        """
+        Extracts the same fields as get_article() from server-rendered HTML, or returns None when the page
+        cannot be parsed statically. Subclasses supporting the 'static' engine must override it;
+        by default every article falls back to the browser.
+        """
+        return None
+
+    async def _gather_articles(self, articles_urls: Iterable[str] | AsyncIterable[str],
+                               check_environment_hook: Optional[Callable] = None, do_throttle: bool = True,
+                               return_exceptions: bool = False) -> list[dict[str, str] | Exception | None]:
+        """
+        Scrapes every article (see _stream_articles) and returns the results in the order of articles_urls.
+        Articles are scraped in this instance's browser tabs, even if a worker pool was started.
+        If return_exceptions, an article that fails to be scraped is returned as its exception, as asyncio.gather
+        does, instead of cancelling the others.
+        """
+        scraped_articles = []
+        async for index, scraped_article in self.__scrap_articles(articles_urls=articles_urls,
+                                                                  check_environment_hook=check_environment_hook,
+                                                                  do_throttle=do_throttle,
+                                                                  return_exceptions=return_exceptions):
+            scraped_articles.extend([None] * (index + 1 - len(scraped_articles)))
+            scraped_articles[index] = scraped_article
+        return scraped_articles
+
+    async def _stream_articles(self, articles_urls: Iterable[str] | AsyncIterable[str],
+                               check_environment_hook: Optional[Callable] = None,
+                               do_throttle: bool = True) -> AsyncIterator[dict[str, str] | None]:
         """
-        Launches a new tab for each article URL to scrape them concurrently.
-        Closes all launched tabs once scraping is complete.
-        If throttling is enabled, divides URLs into batches and processes them sequentially.
+        Scrapes articles concurrently, each one in its own browser tab, yielding them as soon as they are scraped.
+        Tabs are taken from WebsiteHandler's pool and handed back once their article is scraped, so that warm tabs
+        get reused. Articles are yielded in completion order, and a throttling slot is only freed once its article
+        has been consumed, so that a slow consumer holds back scraping instead of piling up results.
+        articles_urls may be an asynchronous iterable (e.g. a discovery generator): it is drained in the background
+        and every URL is scraped as soon as it arrives, so that discovery and scraping overlap.
+        With the 'static' engine, articles are fetched over HTTP and parsed without a tab first; only those that
+        cannot be parsed that way are scraped in the browser.
+        If throttling is enabled, at most throttling_chunk_size articles are scraped at the same time:
+            'pool' mode keeps that many articles in flight, starting the next URL as soon as a slot frees up.
+            'chunked' mode divides URLs into batches and processes them sequentially.
+        If a worker pool was started, articles are scraped by the worker processes instead, each one throttled as
+        described. check_environment_hook must then be a method of this instance, which workers call on their own.
         """
-        def split_in_chunks() -> list[list[str]]:
+        if self.__worker_pool is not None:
+            check_environment_hook_name = None
+            if check_environment_hook is not None:
+                if getattr(check_environment_hook, '__self__', None) is not self:
+                    raise UnsupportedWorkerHook('Worker processes only support check_environment_hook methods of the '
+                                                'scraper.')
+                check_environment_hook_name = check_environment_hook.__name__
+            # Closing this stream closes the pool's, so that the workers are ready for the next one right away
+            async with aclosing(self.__worker_pool.stream_articles(
+                    articles_urls=articles_urls, check_environment_hook_name=check_environment_hook_name,
+                    do_throttle=do_throttle)) as worker_articles:
+                async for scraped_article in worker_articles:
+                    yield scraped_article
+            return
+
+        async for _, scraped_article in self.__scrap_articles(articles_urls=articles_urls,
+                                                              check_environment_hook=check_environment_hook,
+                                                              do_throttle=do_throttle):
+            yield scraped_article
+
+    async def __scrap_articles(self, articles_urls: Iterable[str] | AsyncIterable[str],
+                               check_environment_hook: Optional[Callable] = None, do_throttle: bool = True,
+                               return_exceptions: bool = False
+                               ) -> AsyncIterator[tuple[int, dict[str, str] | Exception | None]]:
+        """
+        Yields each scraped article along with the position of its URL in articles_urls. If return_exceptions, the
+        exception of an article that fails to be scraped is yielded in its place.
+        """
+        async def iterate_urls() -> AsyncIterator[str]:
             """
-            Splits the article URLs list into a list of equally sized chunks, with the last chunk possibly smaller.
+            Iterates over articles_urls. Asynchronous sources are drained by a background task into a queue,
+            so that they are not slowed down by the pace at which URLs are scraped.
             """
-            chunk_size = self.__throttling_chunk_size
-            chunks_container = []
-            for index in range(0, len(articles_urls), chunk_size):
-                chunks_container.append(articles_urls[index:index + chunk_size])
-            return chunks_container
+            if not isinstance(articles_urls, AsyncIterable):
+                for url in articles_urls:
+                    yield url
+                return
+
+            discovered_urls = asyncio.Queue()
+            end_of_urls = object()
+
+            async def drain_source():
+                try:
+                    async for url in articles_urls:
+                        discovered_urls.put_nowait(url)
+                finally:
+                    discovered_urls.put_nowait(end_of_urls)
+
+            drain_task = asyncio.create_task(drain_source())
+            try:
+                while (url := await discovered_urls.get()) is not end_of_urls:
+                    yield url
+                await drain_task  # Surfaces discovery errors
+            finally:
+                if not drain_task.done():
+                    drain_task.cancel()
+                    await asyncio.gather(drain_task, return_exceptions=True)
 
         async def scrap_article(article_url) -> dict[str, str] | None:
             """
-            Opens a new browser tab, navigates to article_url, invokes check_environment_hook (if provided)
-            to approve the scraping, and scrapes the article.
+            Acquires a browser tab, navigates to article_url, invokes check_environment_hook (if provided)
+            to approve the scraping, and scrapes the article. Releases the tab afterwards.
             """
             async def article_scraper(page: Page) -> Iterable[str]:
                 """
-                Executes all article component scrapers concurrently and returns their findings.
+                Extracts all article components and returns their findings.
                 """
-                return await asyncio.gather(self.get_title(page=page),
-                                            self.get_date(page=page),
-                                            self.get_author(page=page),
-                                            self.get_image_url(page=page),
-                                            self.get_body(page=page))
+                return await self.get_article(page=page)
+
+            scraping_results = None
+            if self.__engine == 'static':
+                print(f'Scraping: {article_url}')
+                scraping_results = await self._scrap_static_article(article_url)
+                if scraping_results is None:
+                    print(f'Falling back to browser: {article_url}')
 
-            new_page = await self._wshandler.get_new_page(article_url)
-            pages.append(new_page)
+            if scraping_results is None:
+                page = await self._wshandler.acquire_page()
+                try:
+                    await self._wshandler.safe_goto(url=article_url, page=page)
 
-            print(f'Scraping: {article_url}')
-            if check_environment_hook is None:
-                scraping_results = await article_scraper(new_page)
-            else:
-                scraping_results = await check_environment_hook(new_page, article_scraper)
+                    if self.__engine == 'browser':
+                        print(f'Scraping: {article_url}')
+                    if check_environment_hook is None:
+                        scraping_results = await article_scraper(page)
+                    else:
+                        scraping_results = await check_environment_hook(page, article_scraper)
+                finally:
+                    await self._wshandler.release_page(page)
 
             scraped_article = None
             if scraping_results is not None:
@@ -117,20 +357,80 @@ class BaseNewsScraper(metaclass=abc.ABCMeta):
 
             return scraped_article
 
-        urls_chunks_container = []
-        if do_throttle:
-            urls_chunks_container = split_in_chunks()
-        else:
-            urls_chunks_container.append(articles_urls)
+        async def scrap_indexed_article(index: int, article_url: str) -> tuple[int, dict[str, str] | Exception | None]:
+            try:
+                return index, await scrap_article(article_url)
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                print(f'Scraping failed: {article_url} ({error})')
+                return index, error
 
-        scraped_articles = []
-        for chunk in urls_chunks_container:
-            pages = []
-            scraped_articles += await asyncio.gather(*[scrap_article(url) for url in chunk])
-            for page in pages:
-                await page.close()
+        async def scrap_in_chunks() -> AsyncIterator[tuple[int, dict[str, str] | None]]:
+            """
+            Scrapes one chunk at a time, waiting for its slowest article before starting the next one.
+            The last chunk may be smaller.
+            """
+            chunk = []
+            urls_count = 0
+            async for url in iterate_urls():
+                chunk.append(scrap_indexed_article(urls_count, url))
+                urls_count += 1
+                if len(chunk) == self.__throttling_chunk_size:
+                    for indexed_article in await asyncio.gather(*chunk):
+                        yield indexed_article
+                    chunk = []
+            for indexed_article in await asyncio.gather(*chunk):
+                yield indexed_article
 
-        return scraped_articles
+        async def scrap_in_pool(max_in_flight: Optional[int]) -> AsyncIterator[tuple[int, dict[str, str] | None]]:
+            """
+            Starts scraping each URL as soon as it is available and one of max_in_flight slots is free,
+            so that a new article is started as soon as any previous one is done. If max_in_flight is None,
+            every URL is started right away. Cancels every pending article if one of them fails.
+            """
+            slots = None if max_in_flight is None else asyncio.Semaphore(max_in_flight)
+            finished_tasks = asyncio.Queue()
+            # Only unconsumed tasks are referenced, so that memory stays bounded by the articles in flight
+            pending_tasks = set()
+            spawned_count = 0
+
+            async def spawn_tasks():
+                nonlocal spawned_count
+                async for url in iterate_urls():
+                    if slots is not None:
+                        await slots.acquire()
+                    task = asyncio.create_task(scrap_indexed_article(spawned_count, url))
+                    task.add_done_callback(finished_tasks.put_nowait)
+                    pending_tasks.add(task)
+                    spawned_count += 1
+
+            spawner = asyncio.create_task(spawn_tasks())
+            spawner.add_done_callback(finished_tasks.put_nowait)
+            try:
+                while not spawner.done() or len(pending_tasks) > 0:
+                    task = await finished_tasks.get()
+                    if task is spawner:
+                        task.result()  # Surfaces discovery errors
+                        continue
+                    pending_tasks.discard(task)
+                    if slots is not None:
+                        slots.release()
+                    yield task.result()
+                spawner.result()
+            finally:
+                for task in [spawner, *pending_tasks]:
+                    task.cancel()
+                await asyncio.gather(spawner, *pending_tasks, return_exceptions=True)
+
+        if not do_throttle:
+            scraper = scrap_in_pool(None)
+        elif self.__throttling_mode == 'chunked':
+            scraper = scrap_in_chunks()
+        else:
+            scraper = scrap_in_pool(self.__throttling_chunk_size)
+        async for indexed_article in scraper:
+            yield indexed_article
 
     @abc.abstractmethod
     async def get_title(self, url: Optional[str] = None, page: Optional[Page] = None) -> str:
@@ -152,15 +452,44 @@ class BaseNewsScraper(metaclass=abc.ABCMeta):
     async def get_body(self, url: Optional[str] = None, page: Optional[Page] = None) -> str:
         pass
 
+    async def get_article(self, url: Optional[str] = None, page: Optional[Page] = None) -> list[str]:
+        """
+        Returns the title, date, author, image URL and body of an article, in that order.
+        Executes all article component scrapers concurrently. Subclasses may override it with a cheaper,
+        combined extraction as long as the output matches the per-field getters.
+        """
+        self._check_website_handler_instance()
+        page = page or self._wshandler.page
+        await self._navigate_if_necessary(url=url, page=page)
+        return list(await asyncio.gather(self.get_title(page=page),
+                                         self.get_date(page=page),
+                                         self.get_author(page=page),
+                                         self.get_image_url(page=page),
+                                         self.get_body(page=page)))
+
     @abc.abstractmethod
-    async def search(self, keyword: str, case_sensitive: bool = False,
+    async def search(self, keyword: str | Sequence[str], case_sensitive: bool = False,
                      do_throttle: bool = True) -> list[dict[str, str]]:
         pass
 
+    async def search_stream(self, keyword: str | Sequence[str], case_sensitive: bool = False,
+                            do_throttle: bool = True) -> AsyncIterator[dict[str, str]]:
+        """
+        Yields matching articles as they are confirmed. Subclasses that can scrape incrementally should override it;
+        by default, matches are yielded once search() returns.
+        """
+        for matching_article in await self.search(keyword=keyword, case_sensitive=case_sensitive,
+                                                  do_throttle=do_throttle):
+            yield matching_article
+
     async def destroy(self):
         """
         Releases allocated resources.
         """
+        await self.destroy_worker_pool()
+        if self.__useragent_provider is not None:
+            await self.__useragent_provider.wait_background_refresh()
+            self.__useragent_provider = None
         if self._wshandler is not None:
             await self._wshandler.destroy()
             self._wshandler = None
@@ -0,0 +1,138 @@
+import itertools
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, bindparam, case, func, or_, select, update
+
+from source.classes.db_manager import DBManager
+from source.classes.postgres_manager import PostgresManager
+from source.interfaces.db_tables import CrawlJobs
+
+
+class CrawlJobQueue:
+    """
+    A list of article URLs to be scraped, shared by crawl workers through the CrawlJobs table, so that several
+    workers (on one or several machines) split a backfill instead of each one running a full search.
+    Workers claim batches of jobs under a lease that expires after lease_duration, and acknowledge each job once its
+    results are stored. Jobs whose lease expired, e.g. because their worker crashed, are claimed again by any worker,
+    unless they were already claimed max_attempts times.
+    A claim is a single UPDATE ... RETURNING statement, so that concurrent workers never claim the same job. Workers
+    renew the leases of the jobs they are still scraping, and only the current owner of a lease can acknowledge its
+    job, which keeps results from being stored twice.
+    Several machines should share a PostgreSQL database, where claims skip the rows other workers are claiming
+    instead of waiting for them. SQLite suits workers running on the same machine.
+    """
+    # Separates the keywords of a job, which are read from single lines
+    keywords_separator = '\n'
+    # URLs looked up per statement when queueing, below any database's bound parameters limit
+    lookup_batch_size = 500
+
+    def __init__(self, dbmanager: DBManager | PostgresManager, lease_duration: timedelta = timedelta(minutes=10),
+                 max_attempts: int = 3):
+        self.__dbmanager = dbmanager
+        self.__lease_duration = lease_duration
+        self.__max_attempts = max_attempts
+
+    def enqueue(self, urls: Iterable[str], keywords: Sequence[str], max_age: Optional[timedelta] = None):
+        """
+        Queues the URLs to be scraped and checked against keywords. URLs that were already queued get the keywords
+        they lacked, if any, and are then pending again: their lease and attempts are reset, so that the job is
+        scraped for every keyword even if it was completed, and a worker that still holds it cannot acknowledge it.
+        Completed jobs are pending again as well once their completion is older than max_age (if given), e.g. to
+        re-crawl them; max_age=timedelta(0) re-queues every completed job.
+        """
+        urls = list(dict.fromkeys(urls))
+        encoded_keywords = self.keywords_separator.join(keywords)
+        stale_before = None if max_age is None else datetime.now() - max_age
+        reset_jobs = []
+        with self.__dbmanager.transaction():
+            # Inserting first takes SQLite's write lock before reading, so that concurrent claims cannot interleave
+            self.__dbmanager.store(CrawlJobs(URL=url, Keywords=encoded_keywords, Attempts=0) for url in urls)
+            for batch in itertools.batched(urls, self.lookup_batch_size):
+                queued_jobs = self.__dbmanager.execute(select(CrawlJobs.ID, CrawlJobs.Keywords, CrawlJobs.CompletedOn)
+                                                       .where(CrawlJobs.URL.in_(batch))
+                                                       .with_for_update())
+                for job_id, queued_keywords, completed_on in queued_jobs:
+                    queued_keywords = queued_keywords.split(self.keywords_separator)
+                    merged_keywords = list(dict.fromkeys([*queued_keywords, *keywords]))
+                    is_stale = completed_on is not None and stale_before is not None and completed_on <= stale_before
+                    if len(merged_keywords) > len(queued_keywords) or is_stale:
+                        reset_jobs.append({'job_id': job_id,
+                                           'job_keywords': self.keywords_separator.join(merged_keywords)})
+            if len(reset_jobs) > 0:
+                self.__dbmanager.execute(update(CrawlJobs)
+                                         .where(CrawlJobs.ID == bindparam('job_id'))
+                                         .values(Keywords=bindparam('job_keywords'), LeaseOwner=None,
+                                                 LeaseExpiresOn=None, Attempts=0, CompletedOn=None),
+                                         reset_jobs)
+
+    def claim(self, worker_id: str, batch_size: int) -> dict[str, list[str]]:
+        """
+        Leases up to batch_size pending jobs to worker_id, oldest first, and returns the keywords of each claimed URL.
+        Pending jobs are those neither acknowledged nor leased, or whose lease expired.
+        """
+        now = datetime.now()
+        claimable_ids = (select(CrawlJobs.ID)
+                         .where(CrawlJobs.CompletedOn.is_(None),
+                                or_(CrawlJobs.LeaseExpiresOn.is_(None), CrawlJobs.LeaseExpiresOn < now),
+                                CrawlJobs.Attempts < self.__max_attempts)
+                         .order_by(CrawlJobs.ID)
+                         .limit(batch_size)
+                         .with_for_update(skip_locked=True))  # PostgreSQL only, SQLite serializes writers
+        statement = (update(CrawlJobs)
+                     .where(CrawlJobs.ID.in_(claimable_ids.scalar_subquery()))
+                     .values(LeaseOwner=worker_id, LeaseExpiresOn=now + self.__lease_duration,
+                             Attempts=CrawlJobs.Attempts + 1)
+                     .returning(CrawlJobs.ID, CrawlJobs.URL, CrawlJobs.Keywords))
+        claimed_jobs = sorted(self.__dbmanager.execute(statement))
+        return {url: keywords.split(self.keywords_separator) for _, url, keywords in claimed_jobs}
+
+    def __update_leased(self, worker_id: str, urls: Iterable[str], **values) -> set[str]:
+        """
+        Updates the jobs of urls that are still leased by worker_id and not acknowledged, and returns their URLs.
+        """
+        statement = (update(CrawlJobs)
+                     .where(CrawlJobs.URL.in_(list(urls)), CrawlJobs.LeaseOwner == worker_id,
+                            CrawlJobs.CompletedOn.is_(None))
+                     .values(**values)
+                     .returning(CrawlJobs.URL))
+        return {url for url, in self.__dbmanager.execute(statement)}
+
+    def renew(self, worker_id: str, urls: Iterable[str]) -> set[str]:
+        """
+        Extends by lease_duration the leases worker_id still holds on the jobs of urls, and returns their URLs.
+        Workers call it periodically while scraping, so that slow batches are not claimed by others meanwhile.
+        """
+        return self.__update_leased(worker_id, urls, LeaseExpiresOn=datetime.now() + self.__lease_duration)
+
+    def acknowledge(self, worker_id: str, urls: Iterable[str]) -> set[str]:
+        """
+        Marks as completed the jobs of urls whose lease worker_id still holds, and returns their URLs. Call it within
+        the transaction that stores their results (see DBManager.transaction), and only store the results of the
+        returned URLs: the others were claimed by another worker once their lease expired.
+        """
+        return self.__update_leased(worker_id, urls, CompletedOn=datetime.now())
+
+    def release(self, worker_id: str, urls: Iterable[str]) -> set[str]:
+        """
+        Gives up the leases worker_id holds on the jobs of urls, e.g. after failing to scrape them, so that any worker
+        can claim them again right away. Returns their URLs.
+        """
+        return self.__update_leased(worker_id, urls, LeaseOwner=None, LeaseExpiresOn=None)
+
+    def count_jobs(self) -> dict[str, int]:
+        """
+        Returns how many jobs are pending, leased, completed and abandoned (claimed max_attempts times without being
+        acknowledged).
+        """
+        now = datetime.now()
+        is_unleased = and_(CrawlJobs.CompletedOn.is_(None),
+                           or_(CrawlJobs.LeaseExpiresOn.is_(None), CrawlJobs.LeaseExpiresOn < now))
+        conditions = {'pending': and_(is_unleased, CrawlJobs.Attempts < self.__max_attempts),
+                      'leased': and_(CrawlJobs.CompletedOn.is_(None), CrawlJobs.LeaseExpiresOn >= now),
+                      'completed': CrawlJobs.CompletedOn.is_not(None),
+                      'abandoned': and_(is_unleased, CrawlJobs.Attempts >= self.__max_attempts)}
+        counts = self.__dbmanager.execute(select(*(func.count(case((condition, 1)))
+                                                   for condition in conditions.values())))[0]
+        return dict(zip(conditions, counts))
@@ -1,93 +1,253 @@
-from collections.abc import Sequence
+import hashlib
+import itertools
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
-import pandas
 from pandas import DataFrame
-from sqlalchemy import create_engine
+from sqlalchemy import (ColumnElement, Connection, Executable, column, create_engine, event, func, inspect,
+                        literal_column, select, text)
+from sqlalchemy import table as table_clause
 from sqlalchemy.dialects.sqlite import insert
-from sqlalchemy.orm import declarative_base, sessionmaker, InstrumentedAttribute
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker, InstrumentedAttribute
 
-from source.classes.base_storage_manager import BaseStorageManager
+from source.classes.sql_storage_manager import SQLStorageManager
 
 
 class RecordsMismatchException(Exception):
     pass
 
 
-class DBManager(BaseStorageManager):
+class FullTextSearchException(Exception):
+    pass
+
+
+class DBManager(SQLStorageManager):
     """
     Handles basic SQLite database interactions.
     """
-    Base = declarative_base()
+    Base = SQLStorageManager.Base
+    # Conservative bound on bound parameters per statement (SQLite's default before 3.32)
+    max_bound_parameters = 999
+    # Folds letter case and diacritics (e.g. 'educacion' matches 'educación') of indexed texts and queries alike
+    full_text_tokenizer = 'unicode61 remove_diacritics 2'
+    # Records converted and sent to the driver per executemany() call, which bounds the memory store() uses
+    store_batch_size = 5000
+    # Set on every connection. WAL lets readers run alongside the writer and, with synchronous=NORMAL, commits no
+    # longer wait for the disk (a power loss may only undo the latest ones). A negative cache_size is in KiB.
+    connection_pragmas = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -65536, 'temp_store': 'MEMORY'}
 
     def __init__(self, filepath: Path,
-                 record_autofill_field_names: Sequence[str] = ('ID', 'CreatedOn', 'UpdatedOn')):
-        self.__engine = None
-        self.__session = None
-        self.__record_autofill_field_names = record_autofill_field_names
-        self.__initialize_connection(filepath)
+                 record_autofill_field_names: Sequence[str] = ('ID', 'CreatedOn', 'UpdatedOn'),
+                 migrations: Sequence[Callable[[Connection], None]] = ()):
+        super().__init__(record_autofill_field_names)
+        self.__initialize_connection(filepath, migrations)
 
-    def __initialize_connection(self, filepath: Path):
+    def __initialize_connection(self, filepath: Path, migrations: Sequence[Callable[[Connection], None]]):
         """
         Initializes database connection.
         """
-        self.__engine = create_engine(f'sqlite:///{str(filepath)}')
-        self.__session = sessionmaker(self.__engine)
-        DBManager.Base.metadata.create_all(bind=self.__engine)
+        self._engine = create_engine(f'sqlite:///{str(filepath)}')
+        event.listen(self._engine, 'connect', self.__configure_connection)
+        self._session = sessionmaker(self._engine)
+        is_new_database = len(inspect(self._engine).get_table_names()) == 0
+        self.Base.metadata.create_all(bind=self._engine)
+        self.__apply_migrations(migrations, is_new_database)
+        # create_all() skips existing tables along with their indexes, so that indexes added later are created here
+        for db_table in self.Base.metadata.tables.values():
+            for index in db_table.indexes:
+                index.create(bind=self._engine, checkfirst=True)
+            if 'full_text_columns' in db_table.info:
+                self.__create_full_text_index(db_table)
+
+    def __apply_migrations(self, migrations: Sequence[Callable[[Connection], None]], is_new_database: bool):
+        """
+        Applies the migrations a database has not gone through yet, in order, and reclaims the space they free.
+        The database's user_version tracks how many were applied. New databases already have the latest schema,
+        so they are only marked as up to date.
+        Each migration receives a connection within a transaction, where the tables of the latest schema that were
+        missing have already been created.
+        """
+        with self._engine.begin() as connection:
+            applied_migrations_count = len(migrations) if is_new_database else \
+                connection.exec_driver_sql('PRAGMA user_version').scalar()
+            for migration in migrations[applied_migrations_count:]:
+                migration(connection)
+            if is_new_database or applied_migrations_count < len(migrations):
+                connection.exec_driver_sql(f'PRAGMA user_version = {len(migrations)}')
+        if applied_migrations_count < len(migrations):
+            with self._engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                connection.exec_driver_sql('VACUUM')
 
-    def store(self, records: Sequence[Base]):
+    def __configure_connection(self, dbapi_connection, _connection_record):
+        """
+        Applies the connection pragmas, and enables delete triggers for rows removed by INSERT OR REPLACE, which keep
+        full-text indexes in sync.
+        """
+        cursor = dbapi_connection.cursor()
+        for pragma_name, pragma_value in self.connection_pragmas.items():
+            cursor.execute(f'PRAGMA {pragma_name} = {pragma_value}')
+        cursor.execute('PRAGMA recursive_triggers = ON')
+        cursor.close()
+
+    @staticmethod
+    def get_full_text_table_name(db_table) -> str:
+        return f'{db_table.name}FullText'
+
+    def __create_full_text_index(self, db_table):
+        """
+        Creates an FTS5 index over the columns listed in the table's 'full_text_columns' info, unless it exists.
+        The index stores no copy of the texts: it reads them from the table, and triggers keep it in sync.
+        Rows stored before the index existed are indexed right away.
+        """
+        full_text_table_name = self.get_full_text_table_name(db_table)
+        columns = db_table.info['full_text_columns']
+        key = db_table.primary_key.columns.values()[0].name  # Must be an INTEGER PRIMARY KEY, i.e. the rowid
+        with self._engine.begin() as connection:
+            is_existing = connection.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                             {'name': full_text_table_name}).first() is not None
+            if is_existing:
+                return
+            column_names = ', '.join(columns)
+            new_values = ', '.join(f'new.{column_name}' for column_name in columns)
+            old_values = ', '.join(f'old.{column_name}' for column_name in columns)
+            delete_statement = (f"INSERT INTO {full_text_table_name}({full_text_table_name}, rowid, {column_names}) "
+                                f"VALUES ('delete', old.{key}, {old_values});")
+            insert_statement = (f'INSERT INTO {full_text_table_name}(rowid, {column_names}) '
+                                f'VALUES (new.{key}, {new_values});')
+            connection.exec_driver_sql(
+                f'CREATE VIRTUAL TABLE {full_text_table_name} USING fts5({column_names}, '
+                f"content='{db_table.name}', content_rowid='{key}', tokenize='{self.full_text_tokenizer}')")
+            connection.exec_driver_sql(f'CREATE TRIGGER {full_text_table_name}_AI AFTER INSERT ON {db_table.name} '
+                                       f'BEGIN {insert_statement} END')
+            connection.exec_driver_sql(f'CREATE TRIGGER {full_text_table_name}_AD AFTER DELETE ON {db_table.name} '
+                                       f'BEGIN {delete_statement} END')
+            connection.exec_driver_sql(f'CREATE TRIGGER {full_text_table_name}_AU AFTER UPDATE ON {db_table.name} '
+                                       f'BEGIN {delete_statement} {insert_statement} END')
+            connection.exec_driver_sql(f"INSERT INTO {full_text_table_name}({full_text_table_name}) VALUES ('rebuild')")
+
+    def store(self, records: Iterable[Base], replace_duplicates: bool = False):
         """
         Ensures all records belong to the same table before inserting them.
+        Records that violate a uniqueness constraint are ignored, or replace the stored ones if replace_duplicates.
+        Records may be streamed from any iterable: they are converted and sent in executemany() batches of
+        store_batch_size, which bind a single row's parameters per statement, all within one transaction. Either every
+        record is stored or, if any fails, none is.
+        """
+        def build_statement(table: type) -> Executable:
+            insert_stmt = insert(table.__table__)
+            if replace_duplicates:
+                return insert_stmt.prefix_with('OR REPLACE')
+            return insert_stmt.on_conflict_do_nothing()
+
+        self.__execute_in_batches(records, build_statement)
+
+    def upsert(self, records: Iterable[Base], conflict_columns: Sequence[str], hash_column: str) -> int:
+        """
+        Inserts records, or updates the stored rows sharing their conflict_columns values (which a unique index must
+        cover) if their content changed. The content of every record, i.e. its stored columns other than
+        conflict_columns, is fingerprinted into hash_column, so that an unchanged row only costs comparing hashes
+        and is never written. Columns with an onupdate default, e.g. UpdatedOn, are refreshed on updates.
+        Records are streamed as in store(). Returns how many rows were inserted or updated.
+        """
+        def build_statement(table: type) -> Executable:
+            insert_stmt = insert(table.__table__)
+            updated_values = {column_name: insert_stmt.excluded[column_name]
+                              for column_name in self.get_stored_column_names(table)
+                              if column_name not in conflict_columns}
+            for db_column in table.__table__.columns:
+                if db_column.onupdate is not None and db_column.name not in updated_values:
+                    updated_values[db_column.name] = (db_column.onupdate.arg(None) if db_column.onupdate.is_callable
+                                                      else db_column.onupdate.arg)
+            return insert_stmt.on_conflict_do_update(
+                index_elements=conflict_columns, set_=updated_values,
+                where=table.__table__.c[hash_column].is_distinct_from(insert_stmt.excluded[hash_column]))
+
+        def add_content_hash(row: dict) -> dict:
+            content = (repr(value) for column_name, value in row.items()
+                       if column_name not in conflict_columns and column_name != hash_column)
+            row[hash_column] = self.get_content_hash(content)
+            return row
+
+        return self.__execute_in_batches(records, build_statement, add_content_hash)
+
+    @staticmethod
+    def get_content_hash(content: Iterable[str]) -> str:
+        return hashlib.blake2b('\x1f'.join(content).encode(), digest_size=16).hexdigest()
+
+    def __execute_in_batches(self, records: Iterable[Base], build_statement: Callable[[type[Base]], Executable],
+                             prepare_row: Optional[Callable[[dict], dict]] = None) -> int:
+        """
+        Executes the statement built for the records' table with the records' stored columns, in executemany()
+        batches of store_batch_size within a single transaction. Returns how many rows were modified.
+        """
+        record_iterator = iter(records)
+        first_record = next(record_iterator, None)
+        if first_record is None:
+            return 0
+
+        table = first_record.__class__
+        column_names = self.get_stored_column_names(table)
+        statement = build_statement(table)
+        modified_rows_count = 0
+        with self._begin() as connection:
+            for batch in itertools.batched(itertools.chain((first_record,), record_iterator), self.store_batch_size):
+                if not all(isinstance(record, table) for record in batch):
+                    raise RecordsMismatchException('All records must belong to the same table.')
+                rows = [{column_name: getattr(record, column_name) for column_name in column_names}
+                        for record in batch]
+                if prepare_row is not None:
+                    rows = list(map(prepare_row, rows))
+                modified_rows_count += connection.execute(statement, rows).rowcount
+        return modified_rows_count
+
+    def retrieve_existing_values(self, column: InstrumentedAttribute, values: Iterable,
+                                 filters: Sequence[ColumnElement[bool]] = (),
+                                 timestamp_column: Optional[InstrumentedAttribute] = None,
+                                 max_age: Optional[timedelta] = None) -> set:
+        """
+        Returns which of the given values are stored in column, in bulk lookups that can be served by its index.
+        Rows must also satisfy filters and, if max_age is provided, have a timestamp_column newer than max_age.
+        """
+        pending_values = list(dict.fromkeys(values))
+        conditions = list(filters)
+        if max_age is not None:
+            conditions.append(timestamp_column >= datetime.now() - max_age)
+        batch_size = self.max_bound_parameters - len(conditions) - 1
+        existing_values = set()
+        with self._session.begin() as session:
+            for start in range(0, len(pending_values), batch_size):
+                batch = pending_values[start:start + batch_size]
+                query = select(column).distinct().where(column.in_(batch), *conditions)
+                existing_values.update(session.scalars(query))
+        return existing_values
+
+    def full_text_search(self, table: Base, query: str, limit: Optional[int] = 20,
+                         snippet_tokens: int = 16) -> DataFrame:
+        """
+        Returns the rows of table whose full-text indexed columns match query, best first.
+        The query follows SQLite's FTS5 syntax: words, "quoted phrases", prefixes (e.g. genea*), AND, OR, NOT and
+        parentheses. Each row also carries its bm25 Rank (lower is better) and a Snippet of its best matching column,
+        where matches are enclosed in square brackets.
         """
-        def type_check_contents(values: Sequence, expected_type: type) -> bool:
-            """
-            Verifies that every item in values is of the expected_type.
-            """
-            if len(values) > 0 and all(map(lambda value: (isinstance(value, expected_type)), values)):
-                return True
-            else:
-                return False
-
-        def record_as_dict(record):
-            """
-            Converts a record into a dictionary, excluding autofill fields.
-            """
-            record_dict = {col.name: getattr(record, col.name)
-                           for col in record.__table__.columns}
-            for autofill_field_name in self.__record_autofill_field_names:
-                if autofill_field_name in record_dict:
-                    del record_dict[autofill_field_name]
-            return record_dict
-
-        if len(records) == 0:
-            return
-
-        table = records[0].__class__
-        if not type_check_contents(values=records, expected_type=table):
-            raise RecordsMismatchException('All records must belong to the same table.')
-
-        with self.__session.begin() as session:
-            record_dicts = list(map(record_as_dict, records))
-            insert_stmt = insert(table).values(record_dicts)
-            ignore_duplicates_stmt = insert_stmt.on_conflict_do_nothing()
-            session.execute(ignore_duplicates_stmt)
-            session.commit()
-
-    def retrieve(self, columns: Optional[Sequence[InstrumentedAttribute]] = None,
-                 table: Optional[Base] = None) -> DataFrame:
-        """
-        Retrieves the specified columns or the whole table. Columns take priority if both parameters
-        are provided, as they are mutually exclusive.
-        """
-        query_object = columns or [table]
-        with self.__session.begin() as session:
-            query_result = session.query(*query_object)
-            pandas_result = pandas.read_sql(sql=query_result.statement, con=self.__engine)
-            return pandas_result
-
-    def destroy(self):
-        """
-        Releases allocated resources.
-        """
-        self.__engine.dispose()
+        db_table = table.__table__
+        if 'full_text_columns' not in db_table.info:
+            raise FullTextSearchException(f'{db_table.name} has no full-text index.')
+        full_text_table_name = self.get_full_text_table_name(db_table)
+        full_text_table = table_clause(full_text_table_name, column('rowid'), column('rank'))
+        key = db_table.primary_key.columns.values()[0]
+        statement = (select(db_table, full_text_table.c.rank.label('Rank'),
+                            func.snippet(literal_column(full_text_table_name), -1, '[', ']', '…',
+                                         snippet_tokens).label('Snippet'))
+                     .join_from(full_text_table, db_table, key == full_text_table.c.rowid)
+                     .where(literal_column(full_text_table_name).match(query))
+                     .order_by(full_text_table.c.rank)
+                     .limit(limit))
+        with self._session.begin() as session:
+            try:
+                result = session.execute(statement)
+            except OperationalError as error:
+                raise FullTextSearchException(f'Invalid full-text query "{query}": {error.orig}.') from error
+            return DataFrame(result.all(), columns=list(result.keys()))
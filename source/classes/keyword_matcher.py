@@ -0,0 +1,222 @@
+import re
+import unicodedata
+from collections.abc import Sequence
+
+
+class InvalidKeywordQuery(Exception):
+    pass
+
+
+class KeywordMatcher:
+    """
+    Matches texts against many keyword queries at once. Queries are compiled once: every phrase they contain goes
+    into a single Aho-Corasick automaton, so each text is scanned in a single pass whose cost grows with the text
+    size but not with the number of phrases.
+    Query syntax:
+        - Consecutive words form a phrase, e.g. 'educación pública'. Double quotes also delimit phrases, which lets
+          them include operator words, e.g. '"Y AND Z"'.
+        - NOT, AND and OR (uppercase) combine phrases, in that order of precedence. Parentheses group them, and
+          adjacent quoted phrases or groups are implicitly joined by AND.
+    Phrases match as substrings unless whole_word is set, in which case they must start and end at word boundaries.
+    With accent_insensitive, diacritics are ignored (e.g. 'educacion' matches 'educación'), except for the 'ñ',
+    which is a letter of its own in Spanish.
+    """
+    operators = ('AND', 'OR', 'NOT')
+    __query_token_regex = re.compile(r'\(|\)|"[^"]*"|"|[^\s()"]+')
+    __whitespace_regex = re.compile(r'[^\S\n]+')  # Line breaks are kept, so that phrases do not span paragraphs
+
+    def __init__(self, queries: Sequence[str], case_sensitive: bool = False, accent_insensitive: bool = False,
+                 whole_word: bool = False):
+        self.__queries = tuple(dict.fromkeys(queries))
+        self.__case_sensitive = case_sensitive
+        self.__accent_insensitive = accent_insensitive
+        self.__whole_word = whole_word
+        self.__accents_table = self.__build_accents_table() if accent_insensitive else None
+        self.__phrase_ids = {}
+        self.__search_terms = {}
+        self.__expressions = {}
+        for query in self.__queries:
+            search_terms = []
+            self.__expressions[query] = self.__parse_query(query, search_terms)
+            self.__search_terms[query] = list(dict.fromkeys(search_terms))
+        self.__build_automaton(list(self.__phrase_ids))
+
+    @property
+    def queries(self) -> tuple[str, ...]:
+        return self.__queries
+
+    @staticmethod
+    def __build_accents_table() -> dict[int, str]:
+        """
+        Maps accented Latin letters to their base letter, sparing 'ñ' and 'Ñ'. Mapping one character to one
+        character keeps folding a single str.translate() call.
+        """
+        accents_table = {}
+        for code_point in range(0xC0, 0x250):
+            character = chr(code_point)
+            if character in 'ñÑ':
+                continue
+            decomposed = unicodedata.normalize('NFD', character)
+            if len(decomposed) > 1 and all(unicodedata.combining(mark) for mark in decomposed[1:]):
+                accents_table[code_point] = decomposed[0]
+        return accents_table
+
+    def normalize(self, text: str) -> str:
+        """
+        Applies the letter case, accent and whitespace folding configured for this matcher.
+        """
+        text = unicodedata.normalize('NFC', text)
+        if self.__accents_table is not None:
+            text = text.translate(self.__accents_table)
+        if not self.__case_sensitive:
+            text = text.casefold()
+        return self.__whitespace_regex.sub(' ', text)
+
+    def __parse_query(self, query: str, search_terms: list[str]) -> tuple:
+        """
+        Parses a query into an expression tree made of ('phrase', id), ('not', operand), ('and', operands)
+        and ('or', operands) nodes. Non-negated phrases are appended to search_terms.
+        """
+        tokens = self.__query_token_regex.findall(query)
+        position = 0
+
+        def peek() -> str | None:
+            return tokens[position] if position < len(tokens) else None
+
+        def consume() -> str:
+            nonlocal position
+            position += 1
+            return tokens[position - 1]
+
+        def fail(reason: str):
+            raise InvalidKeywordQuery(f'Invalid keyword query "{query}": {reason}.')
+
+        def parse_or(is_negated: bool) -> tuple:
+            operands = [parse_and(is_negated)]
+            while peek() == 'OR':
+                consume()
+                operands.append(parse_and(is_negated))
+            return operands[0] if len(operands) == 1 else ('or', operands)
+
+        def parse_and(is_negated: bool) -> tuple:
+            operands = [parse_not(is_negated)]
+            while peek() is not None and peek() not in ('OR', ')'):
+                if peek() == 'AND':
+                    consume()
+                operands.append(parse_not(is_negated))
+            return operands[0] if len(operands) == 1 else ('and', operands)
+
+        def parse_not(is_negated: bool) -> tuple:
+            if peek() == 'NOT':
+                consume()
+                return 'not', parse_not(not is_negated)
+            return parse_operand(is_negated)
+
+        def parse_operand(is_negated: bool) -> tuple:
+            token = peek()
+            if token is None or token in ('AND', 'OR', ')'):
+                fail('a phrase was expected' + ('' if token is None else f' before "{token}"'))
+            if token == '(':
+                consume()
+                expression = parse_or(is_negated)
+                if peek() != ')':
+                    fail('unbalanced parentheses')
+                consume()
+                return expression
+            if token == '"':
+                fail('unbalanced quotes')
+            if token.startswith('"'):
+                phrase = consume()[1:-1]
+            else:
+                words = []
+                while peek() is not None and peek() not in self.operators and peek() not in ('(', ')', '"') \
+                        and not peek().startswith('"'):
+                    words.append(consume())
+                phrase = ' '.join(words)
+            normalized_phrase = self.normalize(' '.join(phrase.split()))
+            if normalized_phrase == '':
+                fail('phrases cannot be empty')
+            if not is_negated:
+                search_terms.append(' '.join(phrase.split()))
+            return 'phrase', self.__phrase_ids.setdefault(normalized_phrase, len(self.__phrase_ids))
+
+        expression = parse_or(False)
+        if peek() is not None:
+            fail(f'unexpected "{peek()}"')
+        return expression
+
+    def __build_automaton(self, phrases: list[str]):
+        """
+        Builds the Aho-Corasick automaton: a trie of every phrase, with failure links pointing to the longest
+        proper suffix that is also a trie path, and outputs merged along those links.
+        """
+        self.__transitions = [{}]
+        self.__outputs = [()]
+        for phrase_id, phrase in enumerate(phrases):
+            state = 0
+            for character in phrase:
+                if character not in self.__transitions[state]:
+                    self.__transitions.append({})
+                    self.__outputs.append(())
+                    self.__transitions[state][character] = len(self.__transitions) - 1
+                state = self.__transitions[state][character]
+            self.__outputs[state] += ((phrase_id, len(phrase)),)
+        self.__failures = [0] * len(self.__transitions)
+        pending_states = list(self.__transitions[0].values())  # Breadth-first, so that failures are set first
+        while len(pending_states) > 0:
+            next_states = []
+            for state in pending_states:
+                for character, child in self.__transitions[state].items():
+                    failure = self.__failures[state]
+                    while failure != 0 and character not in self.__transitions[failure]:
+                        failure = self.__failures[failure]
+                    self.__failures[child] = self.__transitions[failure].get(character, 0)
+                    self.__outputs[child] += self.__outputs[self.__failures[child]]
+                    next_states.append(child)
+            pending_states = next_states
+
+    def __find_phrases(self, text: str) -> set[int]:
+        """
+        Scans the normalized text once, returning the ids of the phrases found in it.
+        """
+        transitions = self.__transitions
+        failures = self.__failures
+        outputs = self.__outputs
+        found_phrases = set()
+        state = 0
+        for index, character in enumerate(text):
+            while state != 0 and character not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(character, 0)
+            for phrase_id, phrase_length in outputs[state]:
+                if self.__whole_word:
+                    start = index - phrase_length + 1
+                    if ((start > 0 and text[start - 1].isalnum())
+                            or (index + 1 < len(text) and text[index + 1].isalnum())):
+                        continue
+                found_phrases.add(phrase_id)
+        return found_phrases
+
+    @staticmethod
+    def __evaluate(expression: tuple, found_phrases: set[int]) -> bool:
+        node_type, operand = expression
+        if node_type == 'phrase':
+            return operand in found_phrases
+        if node_type == 'not':
+            return not KeywordMatcher.__evaluate(operand, found_phrases)
+        if node_type == 'and':
+            return all(KeywordMatcher.__evaluate(child, found_phrases) for child in operand)
+        return any(KeywordMatcher.__evaluate(child, found_phrases) for child in operand)
+
+    def match(self, text: str) -> list[str]:
+        """
+        Returns the queries satisfied by the text, in the order they were given.
+        """
+        found_phrases = self.__find_phrases(self.normalize(text))
+        return [query for query in self.__queries if self.__evaluate(self.__expressions[query], found_phrases)]
+
+    def get_search_terms(self, query: str) -> list[str]:
+        """
+        Returns the phrases of the query that are not negated, as written, e.g. to feed a site's search engine.
+        """
+        return self.__search_terms[query]
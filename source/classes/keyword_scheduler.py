@@ -0,0 +1,76 @@
+import re
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class InvalidSchedule(Exception):
+    pass
+
+
+class KeywordScheduler:
+    """
+    Decides when each keyword of a schedule is due to be searched for again, every keyword having its own interval.
+    First runs are spread over each keyword's interval, so that keywords sharing an interval do not all come due at
+    once, and later runs keep that phase. Runs that were missed (e.g. because an earlier run took longer than an
+    interval) are skipped rather than caught up on, so that a slow run never snowballs into a burst of them.
+    At most max_keywords_per_run keywords are handed out at once, most overdue first; the rest stay due.
+    """
+    __interval_regex = re.compile(r'^(\d+(?:\.\d+)?)([smhd])$')
+    __interval_units = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+    def __init__(self, schedule: Sequence[tuple[str, timedelta]], max_keywords_per_run: Optional[int] = None,
+                 start: Optional[datetime] = None):
+        start = start or datetime.now()
+        self.__intervals = {}
+        for keyword, interval in schedule:
+            if interval <= timedelta(0):
+                raise InvalidSchedule(f'The interval of "{keyword}" must be positive.')
+            self.__intervals[keyword] = interval
+        self.__max_keywords_per_run = max_keywords_per_run
+        keywords_count = len(self.__intervals)
+        self.__due_times = {keyword: start + interval * position / keywords_count
+                            for position, (keyword, interval) in enumerate(self.__intervals.items())}
+
+    @classmethod
+    def parse_interval(cls, text: str) -> timedelta:
+        """
+        Parses an interval such as '90s', '30m', '1.5h' or '2d'.
+        """
+        interval_match = cls.__interval_regex.match(text.strip().lower())
+        if interval_match is None:
+            raise InvalidSchedule(f'Invalid interval "{text}": expected a number followed by s, m, h or d.')
+        value, unit = interval_match.groups()
+        return timedelta(**{cls.__interval_units[unit]: float(value)})
+
+    @property
+    def keywords(self) -> tuple[str, ...]:
+        return tuple(self.__intervals)
+
+    def get_due_keywords(self, now: Optional[datetime] = None) -> list[str]:
+        """
+        Returns the keywords whose run is due, most overdue first, up to max_keywords_per_run.
+        """
+        now = now or datetime.now()
+        due_keywords = sorted((keyword for keyword, due_time in self.__due_times.items() if due_time <= now),
+                              key=self.__due_times.__getitem__)
+        return due_keywords[:self.__max_keywords_per_run]
+
+    def get_next_due_time(self) -> Optional[datetime]:
+        """
+        Returns when the next keyword comes due, or None if the schedule is empty.
+        """
+        return min(self.__due_times.values(), default=None)
+
+    def mark_run(self, keywords: Sequence[str], now: Optional[datetime] = None):
+        """
+        Schedules the next run of keywords that were just searched for: the first time in their phase that is later
+        than now.
+        """
+        now = now or datetime.now()
+        for keyword in keywords:
+            interval = self.__intervals[keyword]
+            due_time = self.__due_times[keyword] + interval
+            if due_time <= now:
+                due_time += interval * ((now - due_time) // interval + 1)
+            self.__due_times[keyword] = due_time
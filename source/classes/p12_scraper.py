@@ -1,19 +1,55 @@
+import inspect
 import re
-from collections.abc import Callable, Iterable
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
 from typing import Optional
 from urllib.parse import urlparse, urlunparse, quote
 
 from playwright.async_api import Page, TimeoutError as PWTimeoutError, expect
 
 from source.classes.base_news_scraper import BaseNewsScraper
+from source.classes.keyword_matcher import KeywordMatcher
+from source.classes.static_html_document import StaticHTMLDocument
 
 
 class P12Scraper(BaseNewsScraper):
     """
     Implements all abstract methods from BaseNewsScraper with logic specific to pagina12.com.ar.
     """
-    def __init__(self, throttling_chunk_size: int = 5):
-        super().__init__(throttling_chunk_size=throttling_chunk_size)
+    # Mirrors the locators used by the per-field getters. Polls until the awaited fields are attached,
+    # as locators would, and resolves to null the fields that could not be found before timeoutMs
+    __article_extraction_script = """
+        async ({timeoutMs, awaitedFields}) => {
+            const first = (selector) => document.querySelector(selector);
+            const extract = () => {
+                const title = first('div.article-header h1');
+                const date = first('div.hide-on-mobile div.article-info time');
+                const author = first('div.article-header div.author a');
+                const image = first('div.article-main-image img') || first('div.no-main-image img');
+                const body = first('div.article-main-content div.article-text');
+                return {
+                    title: title && title.innerText,
+                    date: date && date.getAttribute('datetime'),
+                    author: author && author.innerText,
+                    image_url: image && image.getAttribute('src'),
+                    body: body && body.innerText,
+                };
+            };
+            const deadline = Date.now() + timeoutMs;
+            let fields = extract();
+            while (awaitedFields.some((name) => fields[name] === null) && Date.now() < deadline) {
+                await new Promise((resolve) => setTimeout(resolve, 100));
+                fields = extract();
+            }
+            return fields;
+        }
+    """
+    # Fields whose absence is an error unless they are optional; author and image may always be missing
+    __required_article_fields = ('title', 'date', 'body')
+
+    def __init__(self, throttling_chunk_size: int = 5, throttling_mode: str = 'pool',
+                 optional_fields: Iterable[str] = ('author', 'image_url'), engine: str = 'browser'):
+        super().__init__(throttling_chunk_size=throttling_chunk_size, throttling_mode=throttling_mode,
+                         optional_fields=optional_fields, engine=engine)
         self._host = 'https://www.pagina12.com.ar/'
 
     async def get_title(self, url: Optional[str] = None, page: Optional[Page] = None) -> str:
@@ -22,6 +58,8 @@ class P12Scraper(BaseNewsScraper):
         await self._navigate_if_necessary(url=url, page=page)
         header_div = page.locator('div.article-header')
         title_h1 = header_div.locator('h1')
+        if await self._is_absent_optional_field('title', title_h1):
+            return ''
         title_text = await title_h1.inner_text()
         return self._sanitize_text(title_text)
 
@@ -32,6 +70,8 @@ class P12Scraper(BaseNewsScraper):
         desktop_only_div = page.locator('div.hide-on-mobile')
         article_info_div = desktop_only_div.locator('div.article-info')
         date_time = article_info_div.locator('time')
+        if await self._is_absent_optional_field('date', date_time):
+            return ''
         date_text = await date_time.get_attribute('datetime')
         return self._sanitize_text(date_text)
 
@@ -44,9 +84,8 @@ class P12Scraper(BaseNewsScraper):
             header_div = page.locator('div.article-header')
             author_div = header_div.locator('div.author')
             author_a = author_div.locator('a')
-            author_text = await author_a.inner_text()
-            author_text = re.sub(f'^\\s*Por\\s+', '', author_text)
-            author_text = self._sanitize_text(author_text)
+            if not await self._is_absent_optional_field('author', author_a):
+                author_text = self.__clean_author(await author_a.inner_text())
         except PWTimeoutError:
             pass  # Author absence is acceptable
         return author_text
@@ -56,47 +95,156 @@ class P12Scraper(BaseNewsScraper):
         page = page or self._wshandler.page
         await self._navigate_if_necessary(url=url, page=page)
         image_url = ''
+        main_image_div = page.locator('div.article-main-image')
+        image_img = main_image_div.locator('img')
+        fallback_image_div = page.locator('div.no-main-image')
+        fallback_image_img = fallback_image_div.locator('img').first
         try:
-            main_image_div = None
-            image_img = None
             image_src = None
             try:
-                main_image_div = page.locator('div.article-main-image')
-                image_img = main_image_div.locator('img')
-                image_src = await image_img.get_attribute('src')
+                if not await self._is_absent_optional_field('image_url', image_img):
+                    image_src = await image_img.get_attribute('src')
             except PWTimeoutError:
+                pass
+            if image_src is None:
                 # Some articles lack a main image
-                main_image_div = page.locator('div.no-main-image')
-                image_img = main_image_div.locator('img').first
-                image_src = await image_img.get_attribute('src')
-            url_scheme, url_hostname, url_path, _, _, _ = list(urlparse(image_src))
-            image_url = str(urlunparse([url_scheme, url_hostname, url_path, '', '', '']))
+                if await self._is_absent_optional_field('image_url', fallback_image_img):
+                    return image_url
+                image_src = await fallback_image_img.get_attribute('src')
+            image_url = self.__strip_url_query(image_src)
         except PWTimeoutError:
             pass  # Others have no images at all; therefore, their absence is acceptable
         return image_url
 
+    def __clean_author(self, raw_author: str) -> str:
+        """
+        Removes the 'Por' (by) prefix and sanitizes the author's name.
+        """
+        author_text = re.sub(f'^\\s*Por\\s+', '', raw_author)
+        return self._sanitize_text(author_text)
+
+    @staticmethod
+    def __strip_url_query(url: str) -> str:
+        """
+        Removes query, parameters and fragment from the URL.
+        """
+        url_scheme, url_hostname, url_path, _, _, _ = list(urlparse(url))
+        return str(urlunparse([url_scheme, url_hostname, url_path, '', '', '']))
+
     async def get_body(self, url: Optional[str] = None, page: Optional[Page] = None) -> str:
         self._check_website_handler_instance()
         page = page or self._wshandler.page
         await self._navigate_if_necessary(url=url, page=page)
         main_content_div = page.locator('div.article-main-content')
         article_text_div = main_content_div.locator('div.article-text')
+        if await self._is_absent_optional_field('body', article_text_div):
+            return ''
         article_text = await article_text_div.inner_text()
         return self._sanitize_text(article_text)
 
-    async def search(self, keyword: str, case_sensitive: bool = False,
-                     do_throttle: bool = True) -> list[dict[str, str]]:
+    async def get_article(self, url: Optional[str] = None, page: Optional[Page] = None) -> list[str]:
         """
-        Uses the site's internal search engine to find candidate articles, gathers their paths, scrapes them
-        and performs another, case-sensible search in each candidate's title and body. Returns matching articles.
+        Extracts all article fields in a single in-page evaluation instead of several locator round trips per field.
+        Output is identical to the per-field getters.
+        """
+        self._check_website_handler_instance()
+        page = page or self._wshandler.page
+        await self._navigate_if_necessary(url=url, page=page)
+        timeout_ms = self._wshandler.default_timeout_sec * 1000
+        awaited_fields = [name for name in self.article_fields if name not in self.optional_fields]
+        fields = await page.evaluate(self.__article_extraction_script,
+                                     {'timeoutMs': timeout_ms, 'awaitedFields': awaited_fields})
+        missing_fields = self.__get_missing_required_fields(fields)
+        if len(missing_fields) > 0:
+            raise PWTimeoutError(f'Timeout {timeout_ms}ms exceeded waiting for: {", ".join(missing_fields)}')
+        return self.__finalize_article_fields(fields)
+
+    def _parse_article_html(self, html: str) -> list[str] | None:
+        """
+        Extracts the article fields from server-rendered HTML with the same selectors and post-processing
+        as get_article(). Returns None for live articles and for pages missing a required field.
+        """
+        document = StaticHTMLDocument(html)
+        if document.select_first('article.live-blog-post') is not None:
+            return None
+
+        def get_text(selector: str) -> str | None:
+            element = document.select_first(selector)
+            return None if element is None else document.inner_text(element)
+
+        date_time = document.select_first('div.hide-on-mobile div.article-info time')
+        image_img = (document.select_first('div.article-main-image img')
+                     or document.select_first('div.no-main-image img'))
+        fields = {
+            'title': get_text('div.article-header h1'),
+            'date': None if date_time is None else date_time.get_attribute('datetime'),
+            'author': get_text('div.article-header div.author a'),
+            'image_url': None if image_img is None else image_img.get_attribute('src'),
+            'body': get_text('div.article-main-content div.article-text'),
+        }
+        if len(self.__get_missing_required_fields(fields)) > 0:
+            return None
+        return self.__finalize_article_fields(fields)
+
+    def __get_missing_required_fields(self, fields: dict[str, str | None]) -> list[str]:
+        """
+        Lists the required, non-optional fields that could not be found.
+        """
+        return [name for name in self.__required_article_fields
+                if fields[name] is None and name not in self.optional_fields]
+
+    def __finalize_article_fields(self, fields: dict[str, str | None]) -> list[str]:
+        """
+        Sanitizes raw field values the same way the per-field getters do, and returns them in get_article() order.
+        """
+        author_text = ''
+        if fields['author'] is not None:
+            author_text = self.__clean_author(fields['author'])
+        image_url = ''
+        if fields['image_url'] is not None:
+            image_url = self.__strip_url_query(fields['image_url'])
+        return [self._sanitize_text(fields['title'] or ''),
+                self._sanitize_text(fields['date'] or ''),
+                author_text,
+                image_url,
+                self._sanitize_text(fields['body'] or '')]
+
+    async def _check_article_environment(self, page: Page, article_scraper: Callable) -> Iterable[str] | None:
         """
-        def build_search_url():
+        A hook that determines if the page environment is suitable for scraping. Live articles are skipped.
+        It is a method, rather than a function nested in search_stream(), so that worker processes can call it.
+        """
+        try:
+            await expect(page.locator('article.live-blog-post').first).to_be_attached(attached=False)
+        except AssertionError:
+            # Live article: ignore it
+            return None
+        else:
+            # Non-live article: scrape it
+            return await article_scraper(page)
+
+    async def discover_stream(self, keyword: str | Sequence[str], max_search_pages: int = 1,
+                              max_candidates: Optional[int] = None,
+                              candidates_filter_hook: Optional[Callable[[list[str], str],
+                                                                        list[str] | Awaitable[list[str]]]] = None
+                              ) -> AsyncIterator[str]:
+        """
+        Walks the search result pages of every keyword, yielding each new candidate article URL as soon as its
+        page is read, without scraping it. search_stream() scrapes them as they come, while crawl workers get them
+        through a CrawlJobQueue. Keywords, max_search_pages, max_candidates and candidates_filter_hook work as in
+        search_stream(); candidates rejected by candidates_filter_hook are skipped and not counted against
+        max_candidates.
+        """
+        def build_search_url(search_keyword: str, page_index: int):
             """
             Sanitizes the given keyword before building a search URL that includes it.
+            Result pages are 0-based; the first one takes no page parameter.
             """
-            sanitized_keyword = quote(keyword)
+            sanitized_keyword = quote(search_keyword)
             url_path = '/buscar'
             url_query = f'q={sanitized_keyword}'
+            if page_index > 0:
+                url_query += f'&page={page_index}'
             full_url = str(urlunparse([url_scheme, url_hostname, url_path, '', url_query, '']))
             return full_url
 
@@ -112,52 +260,150 @@ class P12Scraper(BaseNewsScraper):
                 articles_paths.append(url_href)
             return articles_paths
 
-        async def check_environment_hook(page: Page, article_scraper: Callable) -> Iterable[str] | None:
-            """
-            A hook that determines if the page environment is suitable for scraping.
-            """
-            try:
-                await expect(page.locator('article.live-blog-post').first).to_be_attached(attached=False)
-            except AssertionError:
-                # Live article: ignore it
-                return None
-            else:
-                # Non-live article: scrape it
-                return await article_scraper(page)
-
-        def search_for_keyword() -> list[dict[str, str]]:
-            """
-            Searches for the given search_token in the scraped_candidates' title and body,
-            considering letter case sensitivity.
-            """
-            search_token = keyword
-            matches = []
-            for candidate in scraped_candidates:
-                if candidate is None:
-                    continue
-                search_space = candidate['title'] + candidate['body']
-                if not case_sensitive:
-                    search_token = search_token.casefold()
-                    search_space = search_space.casefold()
-                if search_token in search_space:
-                    print(f'Matched: {candidate['article_url']}')
-                    matches.append(candidate)
-            return matches
-
         self._check_website_handler_instance()
         url_scheme, url_hostname, _, _, _, _ = list(urlparse(self._host))
+        keyword_matcher = KeywordMatcher([keyword] if isinstance(keyword, str) else keyword)
 
-        search_url = build_search_url()
-        await self._navigate_if_necessary(search_url)
+        # Only yielded URLs are skipped for the following keywords, as another keyword's filter may accept a URL
+        # rejected for this one
+        yielded_urls = set()
+        candidates_count = 0
+        skipped_count = 0
+        for search_keyword in keyword_matcher.queries:
+            keyword_urls = set()
+            keyword_candidates_count = 0
+            for search_term in keyword_matcher.get_search_terms(search_keyword):
+                for page_index in range(max_search_pages):
+                    if max_candidates is not None and keyword_candidates_count >= max_candidates:
+                        break
+                    await self._navigate_if_necessary(build_search_url(search_term, page_index))
+                    page_urls = [str(urlunparse([url_scheme, url_hostname, path, '', '', '']))
+                                 for path in await get_paths()]
+                    if len(page_urls) == 0:
+                        break
+                    new_urls = [url for url in dict.fromkeys(page_urls)
+                                if url not in keyword_urls and url not in yielded_urls]
+                    keyword_urls.update(new_urls)
+                    if candidates_filter_hook is not None and len(new_urls) > 0:
+                        accepted_urls = candidates_filter_hook(new_urls, search_keyword)
+                        if inspect.isawaitable(accepted_urls):
+                            accepted_urls = await accepted_urls
+                        skipped_count += len(new_urls) - len(accepted_urls)
+                        new_urls = accepted_urls
+                    for url in new_urls:
+                        if max_candidates is not None and keyword_candidates_count >= max_candidates:
+                            break
+                        keyword_candidates_count += 1
+                        yielded_urls.add(url)
+                        yield url
+            candidates_count += keyword_candidates_count
+        print(f'Candidate articles found: {candidates_count}')
+        if candidates_filter_hook is not None:
+            print(f'Candidate articles skipped: {skipped_count}')
 
-        articles_urls = list(map(lambda path: str(urlunparse([url_scheme, url_hostname, path, '', '', ''])),
-                                 await get_paths()))
+    async def scrape_candidates(self, articles_urls: Sequence[str], do_throttle: bool = True,
+                                return_exceptions: bool = False) -> list[dict[str, str] | Exception | None]:
+        """
+        Scrapes the given candidate articles, e.g. those a crawl worker claimed, and returns them in the order of
+        articles_urls. Live articles are skipped, i.e. None. Articles are scraped in this instance's browser tabs.
+        If return_exceptions, an article that fails to be scraped (e.g. on a navigation timeout, or because robots.txt
+        disallows it) is returned as its exception, while the others are still scraped.
+        """
+        return await self._gather_articles(articles_urls=articles_urls,
+                                           check_environment_hook=self._check_article_environment,
+                                           do_throttle=do_throttle, return_exceptions=return_exceptions)
 
-        print(f'Candidate articles found: {len(articles_urls)}')
-        scraped_candidates = await self._gather_articles(articles_urls=articles_urls, do_throttle=do_throttle,
-                                                         check_environment_hook=check_environment_hook)
+    @staticmethod
+    def get_matching_keywords(article: dict[str, str], keyword_matcher: KeywordMatcher) -> list[str]:
+        """
+        Returns the keywords of keyword_matcher satisfied by the article's title or body.
+        """
+        return keyword_matcher.match(article['title'] + '\n' + article['body'])
+
+    async def search(self, keyword: str | Sequence[str], case_sensitive: bool = False, do_throttle: bool = True,
+                     max_search_pages: int = 1, max_candidates: Optional[int] = None,
+                     accent_insensitive: bool = False, whole_word: bool = False,
+                     candidates_filter_hook: Optional[Callable[[list[str], str],
+                                                               list[str] | Awaitable[list[str]]]] = None,
+                     scraped_candidate_hook: Optional[Callable[[str], Optional[Awaitable]]] = None
+                     ) -> list[dict[str, str]]:
+        """
+        Collects every match yielded by search_stream() into a list.
+        """
+        return [matching_article async for matching_article in
+                self.search_stream(keyword=keyword, case_sensitive=case_sensitive, do_throttle=do_throttle,
+                                   max_search_pages=max_search_pages, max_candidates=max_candidates,
+                                   accent_insensitive=accent_insensitive, whole_word=whole_word,
+                                   candidates_filter_hook=candidates_filter_hook,
+                                   scraped_candidate_hook=scraped_candidate_hook)]
+
+    async def search_stream(self, keyword: str | Sequence[str], case_sensitive: bool = False,
+                            do_throttle: bool = True, max_search_pages: int = 1, max_candidates: Optional[int] = None,
+                            accent_insensitive: bool = False, whole_word: bool = False,
+                            candidates_filter_hook: Optional[Callable[[list[str], str],
+                                                                      list[str] | Awaitable[list[str]]]] = None,
+                            scraped_candidate_hook: Optional[Callable[[str], Optional[Awaitable]]] = None
+                            ) -> AsyncIterator[dict[str, str]]:
+        """
+        Uses the site's internal search engine to find candidate articles, gathers their paths, scrapes them
+        and performs another, stricter search in each candidate's title and body. Yields matching articles
+        as soon as they are confirmed, so that callers need not hold the whole crawl in memory.
+        Keywords are KeywordMatcher queries: plain phrases, or boolean queries whose non-negated phrases are
+        searched for separately on the site. Matching may also ignore letter case (unless case_sensitive), accents
+        (if accent_insensitive) and partial words (if whole_word).
+        Walks up to max_search_pages result pages, stopping early once max_candidates articles were found
+        (if given) or once a page lists no articles. Candidates are scraped as soon as they are found,
+        while the following result pages are still being fetched.
+        If a sequence of keywords is given, their candidates are deduplicated so that each article is scraped once
+        and checked against every keyword in a single pass; max_candidates then applies to each keyword.
+        Matches get a 'keywords' entry listing every keyword they satisfy.
+        For incremental crawls, candidates_filter_hook receives the new candidate URLs of each result page along with
+        the keyword they were found for, and returns those worth scraping. scraped_candidate_hook is called with
+        the URL of every scraped candidate, once its match (if any) has been yielded, and with those of the skipped
+        live articles once every candidate was scraped. Both hooks may be coroutine functions, e.g. to look crawls up
+        without blocking the event loop.
+        """
+        self._check_website_handler_instance()
+        keyword_matcher = KeywordMatcher([keyword] if isinstance(keyword, str) else keyword,
+                                         case_sensitive=case_sensitive, accent_insensitive=accent_insensitive,
+                                         whole_word=whole_word)
+
+        matches_count = 0
+        # Live articles are scraped as None, which carries no URL: the candidates left once all of them were scraped
+        # are the live ones
+        live_urls = {}
+
+        async def discover_urls() -> AsyncIterator[str]:
+            """
+            Yields the candidates of discover_stream(), keeping track of those not scraped yet.
+            """
+            async for url in self.discover_stream(keyword=keyword_matcher.queries, max_search_pages=max_search_pages,
+                                                  max_candidates=max_candidates,
+                                                  candidates_filter_hook=candidates_filter_hook):
+                live_urls[url] = None
+                yield url
 
-        matching_articles = search_for_keyword()
-        print(f'Matching articles found: {len(matching_articles)}')
+        async for candidate in self._stream_articles(articles_urls=discover_urls(),
+                                                     do_throttle=do_throttle,
+                                                     check_environment_hook=self._check_article_environment):
+            if candidate is None:
+                continue
+            live_urls.pop(candidate['article_url'], None)
+            matching_keywords = self.get_matching_keywords(candidate, keyword_matcher)
+            if len(matching_keywords) > 0:
+                print(f'Matched: {candidate['article_url']}')
+                matches_count += 1
+                if not isinstance(keyword, str):
+                    candidate['keywords'] = matching_keywords
+                yield candidate
+            if scraped_candidate_hook is not None:
+                hook_result = scraped_candidate_hook(candidate['article_url'])
+                if inspect.isawaitable(hook_result):
+                    await hook_result
 
-        return matching_articles
+        if scraped_candidate_hook is not None:
+            for url in live_urls:
+                hook_result = scraped_candidate_hook(url)
+                if inspect.isawaitable(hook_result):
+                    await hook_result
+        print(f'Matching articles found: {matches_count}')
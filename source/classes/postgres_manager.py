@@ -0,0 +1,188 @@
+import csv
+import io
+import itertools
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import (BigInteger, Column, ColumnElement, Executable, Identity, MetaData, Table, UniqueConstraint,
+                        any_, bindparam, create_engine, func, select)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, distinct_on, insert
+from sqlalchemy.orm import sessionmaker, InstrumentedAttribute
+
+from source.classes.db_manager import DBManager, RecordsMismatchException
+from source.classes.sql_storage_manager import SQLStorageManager
+
+
+class PostgresManager(SQLStorageManager):
+    """
+    Handles basic PostgreSQL database interactions, so that several scraper nodes can write to a single store.
+    Records are bulk loaded with COPY into a temporary staging table, private to each connection, and merged into
+    their table by a single INSERT ... ON CONFLICT statement. Writers only lock the rows they insert or update, so
+    concurrent writers never wait for each other unless they write the same rows.
+    Tables are those of DBManager.Base, except for full-text indexes, which are SQLite-specific.
+    """
+    Base = DBManager.Base
+    # Records serialized and copied to the server per COPY statement, which bounds the memory store() uses
+    store_batch_size = 5000
+    # Key ('P12Scrap' in ASCII) of the advisory lock that keeps nodes started at once from creating the tables at once
+    schema_lock_key = 0x5031325363726170
+
+    def __init__(self, url: str,
+                 record_autofill_field_names: Sequence[str] = ('ID', 'CreatedOn', 'UpdatedOn')):
+        super().__init__(record_autofill_field_names)
+        self.__initialize_connection(url)
+
+    def __initialize_connection(self, url: str):
+        """
+        Initializes database connection, and creates the tables and indexes that are missing.
+        """
+        self._engine = create_engine(url)
+        self._session = sessionmaker(self._engine)
+        with self._engine.begin() as connection:
+            connection.execute(select(func.pg_advisory_xact_lock(self.schema_lock_key)))
+            self.Base.metadata.create_all(bind=connection)
+            # create_all() skips existing tables along with their indexes, so that indexes added later are created here
+            for db_table in self.Base.metadata.tables.values():
+                for index in db_table.indexes:
+                    index.create(bind=connection, checkfirst=True)
+
+    @staticmethod
+    def get_unique_column_names(table: type[Base]) -> tuple[str, ...]:
+        """
+        Returns the names of the columns covered by the table's unique index or constraint, or by its primary key if
+        it has none.
+        """
+        db_table = table.__table__
+        for index in db_table.indexes:
+            if index.unique:
+                return tuple(db_column.name for db_column in index.columns)
+        for constraint in db_table.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                return tuple(db_column.name for db_column in constraint.columns)
+        return tuple(db_column.name for db_column in db_table.primary_key.columns)
+
+    def store(self, records: Iterable[Base], replace_duplicates: bool = False):
+        """
+        Ensures all records belong to the same table before inserting them.
+        Records that violate the table's uniqueness constraint are ignored, or replace the stored ones if
+        replace_duplicates. Among records sharing a unique key, the first one is stored, or the last one if
+        replace_duplicates.
+        Records may be streamed from any iterable: they are copied to a staging table in batches of store_batch_size
+        and merged at once, all within one transaction. Either every record is stored or, if any fails, none is.
+        """
+        def build_statement(table: type, insert_stmt: Insert) -> Executable:
+            if not replace_duplicates:
+                return insert_stmt.on_conflict_do_nothing()
+            unique_column_names = self.get_unique_column_names(table)
+            return insert_stmt.on_conflict_do_update(
+                index_elements=unique_column_names,
+                set_={db_column.name: insert_stmt.excluded[db_column.name] for db_column in table.__table__.columns
+                      if not db_column.primary_key and db_column.name not in unique_column_names})
+
+        self.__copy_and_merge(records, build_statement, keep_last=replace_duplicates)
+
+    def upsert(self, records: Iterable[Base], conflict_columns: Sequence[str], hash_column: str) -> int:
+        """
+        Inserts records, or updates the stored rows sharing their conflict_columns values (which a unique index must
+        cover) if their content changed, as DBManager.upsert does. Hashes match those DBManager computes.
+        Among records sharing conflict_columns values, the last one is kept. Records are streamed as in store().
+        Returns how many rows were inserted or updated.
+        """
+        def build_statement(table: type, insert_stmt: Insert) -> Executable:
+            updated_values = {column_name: insert_stmt.excluded[column_name]
+                              for column_name in self.get_stored_column_names(table)
+                              if column_name not in conflict_columns}
+            for db_column in table.__table__.columns:
+                if db_column.onupdate is not None and db_column.name not in updated_values:
+                    updated_values[db_column.name] = (db_column.onupdate.arg(None) if db_column.onupdate.is_callable
+                                                      else db_column.onupdate.arg)
+            return insert_stmt.on_conflict_do_update(
+                index_elements=conflict_columns, set_=updated_values,
+                where=table.__table__.c[hash_column].is_distinct_from(insert_stmt.excluded[hash_column]))
+
+        def add_content_hash(row: dict) -> dict:
+            content = (repr(value) for column_name, value in row.items()
+                       if column_name not in conflict_columns and column_name != hash_column)
+            row[hash_column] = DBManager.get_content_hash(content)
+            return row
+
+        return self.__copy_and_merge(records, build_statement, keep_last=True, conflict_columns=conflict_columns,
+                                     prepare_row=add_content_hash)
+
+    def __copy_and_merge(self, records: Iterable[Base], build_statement: Callable[[type[Base], Insert], Executable],
+                         keep_last: bool, conflict_columns: Optional[Sequence[str]] = None,
+                         prepare_row: Optional[Callable[[dict], dict]] = None) -> int:
+        """
+        Copies the records' stored columns into a temporary staging table, in CSV batches of store_batch_size, and
+        merges a single row per conflict_columns values (the table's unique columns by default) into the records'
+        table, by means of the statement built for it. Everything runs within a single transaction.
+        Returns how many rows were modified.
+        """
+        record_iterator = iter(records)
+        first_record = next(record_iterator, None)
+        if first_record is None:
+            return 0
+
+        table = first_record.__class__
+        db_table = table.__table__
+        column_names = self.get_stored_column_names(table)
+        staging_table = Table(f'{db_table.name}Staging', MetaData(),
+                              *(Column(column_name, db_table.c[column_name].type) for column_name in column_names),
+                              Column('StagingOrder', BigInteger, Identity()),
+                              prefixes=['TEMPORARY'])
+        conflict_columns = [staging_table.c[column_name]
+                            for column_name in conflict_columns or self.get_unique_column_names(table)]
+        # ON CONFLICT DO UPDATE cannot affect a row twice, hence a single row per key. Keys are merged in order, so that
+        # concurrent writers lock the rows they share in the same order and never deadlock.
+        staged_rows = (select(*(staging_table.c[column_name] for column_name in column_names))
+                       .ext(distinct_on(*conflict_columns))
+                       .order_by(*conflict_columns, staging_table.c.StagingOrder.desc() if keep_last
+                                 else staging_table.c.StagingOrder))
+        statement = build_statement(table, insert(db_table).from_select(column_names, staged_rows))
+
+        with self._begin() as connection:
+            staging_table.create(bind=connection)
+            quote = connection.dialect.identifier_preparer.quote
+            copy_statement = (f'COPY {quote(staging_table.name)} '
+                              f'({", ".join(map(quote, column_names))}) FROM STDIN WITH (FORMAT csv)')
+            cursor = connection.connection.cursor()
+            try:
+                for batch in itertools.batched(itertools.chain((first_record,), record_iterator),
+                                               self.store_batch_size):
+                    if not all(isinstance(record, table) for record in batch):
+                        raise RecordsMismatchException('All records must belong to the same table.')
+                    rows = [{column_name: getattr(record, column_name) for column_name in column_names}
+                            for record in batch]
+                    if prepare_row is not None:
+                        rows = list(map(prepare_row, rows))
+                    # Unquoted empty fields are NULLs, while empty strings are quoted
+                    buffer = io.StringIO()
+                    csv.writer(buffer, quoting=csv.QUOTE_NOTNULL).writerows(
+                        [row[column_name] for column_name in column_names] for row in rows)
+                    buffer.seek(0)
+                    cursor.copy_expert(copy_statement, buffer)
+            finally:
+                cursor.close()
+            modified_rows_count = connection.execute(statement).rowcount
+            staging_table.drop(bind=connection)
+        return modified_rows_count
+
+    def retrieve_existing_values(self, column: InstrumentedAttribute, values: Iterable,
+                                 filters: Sequence[ColumnElement[bool]] = (),
+                                 timestamp_column: Optional[InstrumentedAttribute] = None,
+                                 max_age: Optional[timedelta] = None) -> set:
+        """
+        Returns which of the given values are stored in column, as DBManager.retrieve_existing_values does. Values are
+        sent as a single array, so that one lookup serves any number of them.
+        """
+        pending_values = list(dict.fromkeys(values))
+        if len(pending_values) == 0:
+            return set()
+        conditions = list(filters)
+        if max_age is not None:
+            conditions.append(timestamp_column >= datetime.now() - max_age)
+        query = select(column).distinct().where(
+            column == any_(bindparam('values', pending_values, type_=ARRAY(column.type))), *conditions)
+        with self._session.begin() as session:
+            return set(session.scalars(query))
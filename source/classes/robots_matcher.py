@@ -0,0 +1,82 @@
+import functools
+import re
+from collections.abc import Iterable
+
+
+class RobotsMatcher:
+    """
+    An immutable matcher compiled from robots.txt allow and disallow rules.
+    Rules are ranked once by specificity: deeper paths (more segments) first, then longer patterns, and disallow
+    rules before allow rules of equal rank. They are then compiled into a single regular expression whose
+    alternatives follow that ranking, so that the first alternative to match is the most specific rule.
+    Wildcards follow robots.txt conventions: '*' matches any sequence of characters and a trailing '$' anchors
+    the rule to the end of the path. Every other character, including '?', is literal.
+    Verdicts are memoized per URL path.
+    """
+    __slots__ = ('__allowed_by_group', '__regex', '__cached_is_allowed')
+
+    def __init__(self, allowed_paths: Iterable[str], disallowed_paths: Iterable[str],
+                 verdicts_cache_size: int = 4096):
+        # Empty rules (e.g. 'Disallow:') do not restrict anything
+        rules = ([(path, True) for path in allowed_paths if path != '']
+                 + [(path, False) for path in disallowed_paths if path != ''])
+        rules.sort(key=lambda rule: (self.get_rule_depth(rule[0]), len(rule[0]), not rule[1]), reverse=True)
+        self.__allowed_by_group = tuple(is_allowed for _, is_allowed in rules)
+        self.__regex = None
+        if len(rules) > 0:
+            self.__regex = re.compile('|'.join(f'({self.translate_rule(path)})' for path, _ in rules))
+        self.__cached_is_allowed = functools.lru_cache(maxsize=verdicts_cache_size)(self.__is_allowed)
+
+    @staticmethod
+    def get_rule_depth(path: str) -> int:
+        """
+        Counts the segments of a rule path, resolving '.' and '..' segments without touching the filesystem.
+        """
+        segments = []
+        for segment in path.split('/'):
+            if segment == '..':
+                if len(segments) > 0:
+                    segments.pop()
+            elif segment not in ('', '.'):
+                segments.append(segment)
+        return len(segments)
+
+    @staticmethod
+    def translate_rule(path: str) -> str:
+        """
+        Translates a robots.txt rule into a regular expression matching the paths it applies to, from their start.
+        """
+        is_anchored = path.endswith('$')
+        if is_anchored:
+            path = path[:-1]
+        pattern = '.*'.join(re.escape(literal) for literal in path.split('*'))
+        return pattern + r'\Z' if is_anchored else pattern
+
+    def __is_allowed(self, url_path: str) -> bool:
+        if self.__regex is None:
+            return True
+        match = self.__regex.match(url_path)
+        if match is None:
+            return True
+        return self.__allowed_by_group[match.lastindex - 1]
+
+    def is_allowed(self, url_path: str) -> bool:
+        """
+        Evaluates whether the most specific rule matching url_path allows it. Unmatched paths are allowed.
+        """
+        return self.__cached_is_allowed(url_path)
+
+    @property
+    def cache_info(self) -> functools._CacheInfo:
+        """
+        Hits and misses of the verdicts cache.
+        """
+        return self.__cached_is_allowed.cache_info()
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def from_rules(cls, allowed_paths: tuple[str, ...], disallowed_paths: tuple[str, ...]) -> 'RobotsMatcher':
+        """
+        Returns a matcher for the given rules, compiling it only the first time they are seen.
+        """
+        return cls(allowed_paths, disallowed_paths)
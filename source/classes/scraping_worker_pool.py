@@ -0,0 +1,231 @@
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from functools import partial
+from typing import Optional
+
+
+class ScrapingWorkerException(Exception):
+    pass
+
+
+def run_scraping_worker(worker_index: int, scraper_class: type, scraper_kwargs: dict, host: str,
+                        website_handler_kwargs: dict, urls_queue: multiprocessing.Queue,
+                        results_queue: multiprocessing.Queue):
+    """
+    Entry point of a worker process: builds a scraper pointed at host, initializes its WebsiteHandler and scrapes
+    the URLs it is sent until it is told to stop. Failures are reported to the pool before exiting.
+    Messages received: ('stream', check_environment_hook_name, do_throttle), then ('url', url) per URL and ('end',)
+    once the stream is over; ('stop',) between streams.
+    Messages sent: ('ready', worker_index) once initialized, ('article', worker_index, article) per scraped URL,
+    ('end', worker_index, blocking_stats) once a stream is over, and ('error', worker_index, description).
+    """
+    async def serve():
+        loop = asyncio.get_running_loop()
+
+        async def receive_message() -> tuple:
+            return await loop.run_in_executor(None, urls_queue.get)
+
+        async def receive_urls() -> AsyncIterator[str]:
+            while (message := await receive_message())[0] == 'url':
+                yield message[1]
+
+        scraper = scraper_class(**scraper_kwargs)
+        scraper._host = host
+        try:
+            await scraper.initialize_website_handler(**website_handler_kwargs)
+            results_queue.put(('ready', worker_index))
+            while (message := await receive_message())[0] == 'stream':
+                _, check_environment_hook_name, do_throttle = message
+                check_environment_hook = None
+                if check_environment_hook_name is not None:
+                    check_environment_hook = getattr(scraper, check_environment_hook_name)
+                async for article in scraper._stream_articles(articles_urls=receive_urls(),
+                                                              check_environment_hook=check_environment_hook,
+                                                              do_throttle=do_throttle):
+                    results_queue.put(('article', worker_index, article))
+                results_queue.put(('end', worker_index, scraper.resource_blocking_stats))
+        finally:
+            await scraper.destroy()
+
+    try:
+        asyncio.run(serve())
+    except Exception as error:
+        results_queue.put(('error', worker_index, f'{type(error).__name__}: {error}'))
+
+
+def merge_blocking_stats(*blocking_stats: dict) -> dict:
+    """
+    Sums up the statistics of several resource blocking profiles. See WebsiteHandler.blocking_stats.
+    """
+    total_stats = {'allowed_requests': 0, 'blocked_requests': 0, 'blocked_requests_by_type': {}, 'received_bytes': 0}
+    for stats in blocking_stats:
+        for stat_name in ('allowed_requests', 'blocked_requests', 'received_bytes'):
+            total_stats[stat_name] += stats[stat_name]
+        for resource_type, count in stats['blocked_requests_by_type'].items():
+            total_stats['blocked_requests_by_type'][resource_type] = \
+                total_stats['blocked_requests_by_type'].get(resource_type, 0) + count
+    return total_stats
+
+
+class ScrapingWorkerPool:
+    """
+    Scrapes articles in several worker processes, so that scraping is not bound to the single CPU core an event loop
+    runs on. Every worker builds its own scraper from scraper_class and scraper_kwargs, pointed at host, and drives
+    its own WebsiteHandler (and browser) initialized with website_handler_kwargs. scraper_class must be importable
+    by the workers (e.g. not defined within a function), since they are spawned rather than forked.
+    URLs are partitioned across workers as they arrive: each one goes to the worker with the fewest URLs in flight,
+    so that a worker held back by slow pages gets fewer of them. Scraped articles are sent back to this process,
+    e.g. to be stored by a single writer.
+    """
+    # Seconds between checks that no worker exited while waiting for its messages
+    liveness_check_interval_sec = 1.0
+    # Seconds a worker is given to close its browser when the pool is destroyed, before being terminated
+    shutdown_timeout_sec = 30.0
+
+    def __init__(self, workers_count: int, scraper_class: type, scraper_kwargs: dict, host: str,
+                 website_handler_kwargs: dict):
+        self.__workers_count = workers_count
+        self.__worker_args = (scraper_class, scraper_kwargs, host, website_handler_kwargs)
+        self.__context = multiprocessing.get_context('spawn')
+        self.__processes = []
+        self.__urls_queues = []
+        self.__results_queue = None
+        self.__results = None
+        self.__forwarder_thread = None
+        self.__blocking_stats_by_worker = {}
+
+    @property
+    def workers_count(self) -> int:
+        """
+        The number of worker processes.
+        """
+        return self.__workers_count
+
+    async def start(self):
+        """
+        Spawns the workers and waits until every one of them is ready to scrape.
+        """
+        loop = asyncio.get_running_loop()
+        self.__results = asyncio.Queue()
+        self.__results_queue = self.__context.Queue()
+
+        def forward_results():
+            """
+            Hands the workers' messages over to the event loop, until the pool is destroyed.
+            """
+            while (message := self.__results_queue.get())[0] != 'closed':
+                loop.call_soon_threadsafe(self.__results.put_nowait, message)
+
+        self.__forwarder_thread = threading.Thread(target=forward_results, daemon=True)
+        self.__forwarder_thread.start()
+        for worker_index in range(self.__workers_count):
+            urls_queue = self.__context.Queue()
+            process = self.__context.Process(target=run_scraping_worker,
+                                             args=(worker_index, *self.__worker_args, urls_queue,
+                                                   self.__results_queue),
+                                             daemon=True)
+            process.start()
+            self.__urls_queues.append(urls_queue)
+            self.__processes.append(process)
+        ready_workers = set()
+        while len(ready_workers) < self.__workers_count:
+            message = await self.__receive()
+            if message[0] == 'ready':
+                ready_workers.add(message[1])
+
+    async def __receive(self) -> tuple:
+        """
+        Waits for the next message of any worker, and raises the failure a worker reported, if any.
+        """
+        while True:
+            try:
+                message = await asyncio.wait_for(self.__results.get(), timeout=self.liveness_check_interval_sec)
+            except TimeoutError:
+                for worker_index, process in enumerate(self.__processes):
+                    if not process.is_alive():
+                        raise ScrapingWorkerException(f'Scraping worker {worker_index} exited unexpectedly.')
+                continue
+            if message[0] == 'error':
+                raise ScrapingWorkerException(f'Scraping worker {message[1]} failed: {message[2]}')
+            return message
+
+    async def stream_articles(self, articles_urls: Iterable[str] | AsyncIterable[str],
+                              check_environment_hook_name: Optional[str] = None,
+                              do_throttle: bool = True) -> AsyncIterator[dict[str, str] | None]:
+        """
+        Scrapes articles_urls in the workers, with their scrapers' _stream_articles(), and yields the articles in
+        completion order. Asynchronous sources are drained as URLs are scraped. Workers pass their scraper's method
+        named check_environment_hook_name (if given) as check_environment_hook.
+        If the stream is closed early (e.g. by means of contextlib.aclosing), the articles still in flight are scraped
+        and discarded, so that the workers are ready for the next stream.
+        """
+        in_flight_counts = [0] * self.__workers_count
+
+        def assign_url(url: str):
+            worker_index = min(range(self.__workers_count), key=in_flight_counts.__getitem__)
+            in_flight_counts[worker_index] += 1
+            self.__urls_queues[worker_index].put(('url', url))
+
+        async def distribute_urls():
+            try:
+                if isinstance(articles_urls, AsyncIterable):
+                    async for url in articles_urls:
+                        assign_url(url)
+                else:
+                    for url in articles_urls:
+                        assign_url(url)
+            finally:
+                for urls_queue in self.__urls_queues:
+                    urls_queue.put(('end',))
+
+        for urls_queue in self.__urls_queues:
+            urls_queue.put(('stream', check_environment_hook_name, do_throttle))
+        distributor = asyncio.create_task(distribute_urls())
+        finished_workers = set()
+        try:
+            while len(finished_workers) < self.__workers_count:
+                message = await self.__receive()
+                if message[0] == 'article':
+                    in_flight_counts[message[1]] -= 1
+                    yield message[2]
+                elif message[0] == 'end':
+                    finished_workers.add(message[1])
+                    self.__blocking_stats_by_worker[message[1]] = message[2]
+            await distributor  # Surfaces discovery errors
+        finally:
+            if not distributor.done():
+                distributor.cancel()
+                await asyncio.gather(distributor, return_exceptions=True)
+            while len(finished_workers) < self.__workers_count:
+                message = await self.__receive()
+                if message[0] == 'end':
+                    finished_workers.add(message[1])
+                    self.__blocking_stats_by_worker[message[1]] = message[2]
+
+    @property
+    def blocking_stats(self) -> dict:
+        """
+        Requests allowed and blocked by the workers' resource blocking profiles, summed up as of their latest stream.
+        See WebsiteHandler.blocking_stats.
+        """
+        return merge_blocking_stats(*self.__blocking_stats_by_worker.values())
+
+    async def destroy(self):
+        """
+        Stops the workers, letting them close their browsers, and releases allocated resources.
+        """
+        loop = asyncio.get_running_loop()
+        for urls_queue in self.__urls_queues:
+            urls_queue.put(('stop',))
+        for process in self.__processes:
+            await loop.run_in_executor(None, partial(process.join, timeout=self.shutdown_timeout_sec))
+            if process.is_alive():
+                process.terminate()
+        if self.__forwarder_thread is not None:
+            self.__results_queue.put(('closed',))
+            await loop.run_in_executor(None, self.__forwarder_thread.join)
+            self.__forwarder_thread = None
+        self.__processes = []
+        self.__urls_queues = []
@@ -0,0 +1,133 @@
+import abc
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from typing import Optional
+
+import pandas
+from pandas import DataFrame
+from sqlalchemy import ColumnElement, Executable, Row, Select, select
+from sqlalchemy.orm import declarative_base, InstrumentedAttribute
+
+from source.classes.base_storage_manager import BaseStorageManager
+
+
+class SQLStorageManager(BaseStorageManager):
+    """
+    Implements the database interactions that rely on no dialect-specific syntax, for SQLAlchemy engines set up by
+    subclasses, and specifies the dialect-specific methods they must implement.
+    """
+    Base = declarative_base()
+
+    def __init__(self, record_autofill_field_names: Sequence[str] = ('ID', 'CreatedOn', 'UpdatedOn')):
+        self._engine = None
+        self._session = None
+        self.__record_autofill_field_names = record_autofill_field_names
+        self.__stored_column_names = {}
+        self.__thread_state = threading.local()
+
+    def get_stored_column_names(self, table: type[Base]) -> tuple[str, ...]:
+        """
+        Returns the names of the columns store() writes for table, i.e. all of them except autofill fields.
+        They are computed once per table.
+        """
+        if table not in self.__stored_column_names:
+            self.__stored_column_names[table] = tuple(
+                db_column.name for db_column in table.__table__.columns
+                if db_column.name not in self.__record_autofill_field_names)
+        return self.__stored_column_names[table]
+
+    @abc.abstractmethod
+    def store(self, records: Iterable[Base], replace_duplicates: bool = False):
+        pass
+
+    @abc.abstractmethod
+    def upsert(self, records: Iterable[Base], conflict_columns: Sequence[str], hash_column: str) -> int:
+        pass
+
+    @abc.abstractmethod
+    def retrieve_existing_values(self, column: InstrumentedAttribute, values: Iterable,
+                                 filters: Sequence[ColumnElement[bool]] = (),
+                                 timestamp_column: Optional[InstrumentedAttribute] = None,
+                                 max_age: Optional[timedelta] = None) -> set:
+        pass
+
+    def _begin(self):
+        """
+        Returns a context yielding the connection of the current thread's transaction (see transaction()), or
+        a new connection within its own transaction if there is none.
+        """
+        transaction_connection = getattr(self.__thread_state, 'transaction_connection', None)
+        return nullcontext(transaction_connection) if transaction_connection is not None else self._engine.begin()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups the writes (store and upsert calls) the current thread makes within the context into a single
+        transaction, committed when the context exits or rolled back if it raises.
+        """
+        with self._engine.begin() as connection:
+            self.__thread_state.transaction_connection = connection
+            try:
+                yield
+            finally:
+                self.__thread_state.transaction_connection = None
+
+    def execute(self, statement: Executable, parameters: Optional[Sequence[dict]] = None) -> list[Row]:
+        """
+        Runs a statement that store() and retrieve() do not cover, e.g. an UPDATE ... RETURNING, within the current
+        thread's transaction (see transaction()) or its own, and returns the rows it produced, if any. If a sequence
+        of parameters is given, the statement runs once per entry, in a single executemany() call.
+        """
+        with self._begin() as connection:
+            result = connection.execute(statement, parameters)
+            return result.all() if result.returns_rows else []
+
+    def retrieve(self, columns: Optional[Sequence[InstrumentedAttribute]] = None,
+                 table: Optional[Base] = None, filters: Sequence[ColumnElement[bool]] = (),
+                 order_by: Sequence[ColumnElement] = (), limit: Optional[int] = None) -> DataFrame:
+        """
+        Retrieves the specified columns or the whole table. Columns take priority if both parameters
+        are provided, as they are mutually exclusive.
+        Filters, ordering and limit are applied by the database, where indexes can serve them, instead of after
+        loading every row. Columns from several tables are joined through filters, e.g.
+        retrieve(columns=[MatchingArticles.Keyword, Articles.Title],
+                 filters=[MatchingArticles.URL == Articles.URL, Articles.Date >= last_week])
+        """
+        query = self.build_query(columns, table, filters, order_by, limit)
+        return pandas.read_sql(sql=query, con=self._engine)
+
+    def retrieve_stream(self, columns: Optional[Sequence[InstrumentedAttribute]] = None,
+                        table: Optional[Base] = None, filters: Sequence[ColumnElement[bool]] = (),
+                        order_by: Sequence[ColumnElement] = (), limit: Optional[int] = None,
+                        chunk_size: int = 10000) -> Iterator[DataFrame]:
+        """
+        Streaming variant of retrieve(), yielding DataFrames of up to chunk_size rows. Rows are fetched from the
+        cursor (server-side where the database supports it) as chunks are consumed, so that memory is bounded by the
+        chunk size (and the projected columns) rather than by the table size. Nothing is yielded for empty results.
+        """
+        query = self.build_query(columns, table, filters, order_by, limit)
+        with self._engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            column_names = list(result.keys())
+            for rows in result.partitions():
+                yield DataFrame(rows, columns=column_names)
+
+    @staticmethod
+    def build_query(columns: Optional[Sequence[InstrumentedAttribute]], table: Optional[Base],
+                    filters: Sequence[ColumnElement[bool]], order_by: Sequence[ColumnElement],
+                    limit: Optional[int]) -> Select:
+        """
+        Builds the query retrieve() runs, which relies on no dialect-specific syntax.
+        """
+        query = select(*(columns or [table])).where(*filters).order_by(*order_by)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def destroy(self):
+        """
+        Releases allocated resources.
+        """
+        self._engine.dispose()
@@ -0,0 +1,157 @@
+import re
+from collections.abc import Iterator
+from html.parser import HTMLParser
+from typing import Optional
+
+
+class UnsupportedSelector(Exception):
+    pass
+
+
+class HTMLElement:
+    """
+    A lightweight element node: tag name, attributes and children, which are either elements or text strings.
+    """
+    __slots__ = ('tag', 'attributes', 'children', 'parent', 'classes')
+
+    def __init__(self, tag: str, attributes: dict[str, str], parent: Optional['HTMLElement'] = None):
+        self.tag = tag
+        self.attributes = attributes
+        self.children = []
+        self.parent = parent
+        self.classes = frozenset(attributes.get('class', '').split())
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.attributes.get(name)
+
+    def iter_descendants(self) -> Iterator['HTMLElement']:
+        """
+        Yields every descendant element in document order.
+        """
+        pending = list(reversed([child for child in self.children if isinstance(child, HTMLElement)]))
+        while len(pending) > 0:
+            element = pending.pop()
+            yield element
+            pending.extend(reversed([child for child in element.children if isinstance(child, HTMLElement)]))
+
+
+class StaticHTMLDocument(HTMLParser):
+    """
+    Parses server-rendered HTML into a tree of HTMLElement nodes, using only the standard library, and provides
+    a minimal subset of the DOM API: descendant CSS selectors and an approximation of innerText.
+    """
+    void_tags = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+                           'source', 'track', 'wbr'))
+    # Elements that are not rendered, hence excluded from innerText
+    hidden_tags = frozenset(('head', 'script', 'style', 'noscript', 'template', 'iframe', 'svg', 'title'))
+    block_tags = frozenset(('address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div', 'dl',
+                            'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4',
+                            'h5', 'h6', 'header', 'hgroup', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+                            'section', 'summary', 'table', 'tr', 'ul'))
+    __selector_compound_regex = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+)*)$')
+    __collapsible_whitespace_regex = re.compile(r'[ \t\n\r\f]+')  # Non-breaking spaces are preserved
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.root = HTMLElement('#document', {})
+        self.__current = self.root
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]):
+        element = HTMLElement(tag, {name: value or '' for name, value in attrs}, parent=self.__current)
+        self.__current.children.append(element)
+        if tag not in self.void_tags:
+            self.__current = element
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, Optional[str]]]):
+        element = HTMLElement(tag, {name: value or '' for name, value in attrs}, parent=self.__current)
+        self.__current.children.append(element)
+
+    def handle_endtag(self, tag: str):
+        # Closes the nearest open element with the same tag, implicitly closing those opened after it.
+        # Stray end tags are ignored
+        element = self.__current
+        while element is not self.root and element.tag != tag:
+            element = element.parent
+        if element is not self.root:
+            self.__current = element.parent
+
+    def handle_data(self, data: str):
+        self.__current.children.append(data)
+
+    def __parse_selector(self, selector: str) -> list[tuple[Optional[str], frozenset[str], Optional[str]]]:
+        """
+        Splits a selector made of compound selectors (tag, classes and id) joined by descendant combinators.
+        """
+        compounds = []
+        for compound_text in selector.split():
+            compound_match = self.__selector_compound_regex.match(compound_text)
+            if compound_match is None:
+                raise UnsupportedSelector(f'Unsupported selector: "{selector}".')
+            tokens = re.findall(r'[.#][\w-]+', compound_match.group('rest'))
+            classes = frozenset(token[1:] for token in tokens if token[0] == '.')
+            ids = [token[1:] for token in tokens if token[0] == '#']
+            compounds.append((compound_match.group('tag'), classes, ids[0] if len(ids) > 0 else None))
+        return compounds
+
+    @staticmethod
+    def __matches_compound(element: HTMLElement,
+                           compound: tuple[Optional[str], frozenset[str], Optional[str]]) -> bool:
+        tag, classes, element_id = compound
+        return ((tag is None or element.tag == tag)
+                and classes.issubset(element.classes)
+                and (element_id is None or element.attributes.get('id') == element_id))
+
+    def select(self, selector: str, scope: Optional[HTMLElement] = None) -> Iterator[HTMLElement]:
+        """
+        Yields, in document order, the elements within scope that match the selector.
+        """
+        compounds = self.__parse_selector(selector)
+        scope = scope or self.root
+        for element in scope.iter_descendants():
+            if not self.__matches_compound(element, compounds[-1]):
+                continue
+            pending_compounds = compounds[:-1]
+            ancestor = element.parent
+            while len(pending_compounds) > 0 and ancestor is not None:
+                if self.__matches_compound(ancestor, pending_compounds[-1]):
+                    pending_compounds = pending_compounds[:-1]
+                ancestor = ancestor.parent
+            if len(pending_compounds) == 0:
+                yield element
+
+    def select_first(self, selector: str, scope: Optional[HTMLElement] = None) -> Optional[HTMLElement]:
+        """
+        Returns the first element matching the selector, or None, like document.querySelector().
+        """
+        return next(self.select(selector, scope), None)
+
+    def inner_text(self, element: HTMLElement) -> str:
+        """
+        Approximates the innerText of a rendered element: hidden elements are skipped, whitespace is collapsed
+        and block-level elements and line breaks start new lines. Styles are not applied.
+        """
+        lines = ['']
+
+        def break_line():
+            if lines[-1] != '':
+                lines.append('')
+
+        def collect(node: HTMLElement):
+            for child in node.children:
+                if isinstance(child, str):
+                    lines[-1] += child
+                elif child.tag == 'br':
+                    lines.append('')
+                elif child.tag not in self.hidden_tags:
+                    is_block = child.tag in self.block_tags
+                    if is_block:
+                        break_line()
+                    collect(child)
+                    if is_block:
+                        break_line()
+
+        collect(element)
+        collapsed_lines = [self.__collapsible_whitespace_regex.sub(' ', line).strip(' ') for line in lines]
+        return '\n'.join(collapsed_lines).strip('\n')
@@ -0,0 +1,111 @@
+import asyncio
+import random
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pandas import DataFrame
+
+from source.classes.async_db_manager import AsyncDBManager
+from source.classes.sql_storage_manager import SQLStorageManager
+from source.classes.website_handler import WebsiteHandler
+from source.interfaces.db_tables import CachedUserAgents
+
+
+class UserAgentProvider:
+    """
+    Serves commonly used user-agents from the CachedUserAgents table, so that browsers can be launched with one
+    right away instead of scraping a fresh list on every execution.
+    The cache is stale once its latest refresh is older than ttl. Stale user-agents are still served, while
+    a background refresh fetches a new list for the following executions.
+    The cache is read and written off the event loop: in the writer thread of an AsyncDBManager, or in a worker
+    thread for a synchronous storage manager.
+    """
+    def __init__(self, storage: SQLStorageManager | AsyncDBManager, ttl: timedelta = timedelta(days=7)):
+        self.__storage = storage
+        self.__ttl = ttl
+        self.__refresh_task = None
+
+    async def __retrieve(self, columns: list) -> DataFrame:
+        """
+        Retrieves columns of the cache off the event loop.
+        """
+        if isinstance(self.__storage, AsyncDBManager):
+            return await self.__storage.retrieve(columns=columns)
+        return await asyncio.to_thread(self.__storage.retrieve, columns=columns)
+
+    async def get_cached_useragents(self) -> list[str]:
+        """
+        Returns the user-agents stored by the latest refresh, or every cached one if that refresh is stale.
+        """
+        cached_useragents = await self.__retrieve([CachedUserAgents.UserAgent, CachedUserAgents.CreatedOn])
+        if len(cached_useragents) == 0:
+            return []
+        fresh_useragents = cached_useragents[cached_useragents['CreatedOn'] >= datetime.now() - self.__ttl]
+        if len(fresh_useragents) > 0:
+            cached_useragents = fresh_useragents
+        return list(cached_useragents['UserAgent'])
+
+    async def is_stale(self) -> bool:
+        """
+        Returns whether the cache is empty or its latest refresh is older than ttl.
+        """
+        cached_on = (await self.__retrieve([CachedUserAgents.CreatedOn]))['CreatedOn']
+        return len(cached_on) == 0 or cached_on.max() < datetime.now() - self.__ttl
+
+    async def get_useragent(self) -> Optional[str]:
+        """
+        Returns a random cached user-agent, or None if the cache is empty.
+        """
+        cached_useragents = await self.get_cached_useragents()
+        if len(cached_useragents) == 0:
+            return None
+        return random.choice(cached_useragents)
+
+    async def store_useragents(self, useragents: Sequence[str]):
+        """
+        Caches the given user-agents, refreshing the timestamp of those already cached. With an AsyncDBManager, they
+        are queued to its writer.
+        """
+        records = [CachedUserAgents(UserAgent=useragent) for useragent in dict.fromkeys(useragents)]
+        if isinstance(self.__storage, AsyncDBManager):
+            await self.__storage.store(records, replace_duplicates=True)
+        else:
+            await asyncio.to_thread(self.__storage.store, records, replace_duplicates=True)
+
+    async def refresh(self, wshandler: WebsiteHandler):
+        """
+        Scrapes a fresh list of common user-agents in a separate tab of wshandler's browser and caches it.
+        """
+        page = await wshandler.get_new_page()
+        try:
+            await self.store_useragents(await wshandler.get_common_useragents(page=page))
+        finally:
+            await page.close()
+
+    async def start_background_refresh(self, wshandler: WebsiteHandler) -> Optional[asyncio.Task]:
+        """
+        Starts refreshing the cache in the background if it is stale. Returns the refresh task, if any.
+        """
+        async def refresh_quietly():
+            """
+            Refreshes the cache, reporting failures instead of raising them, since the current user-agent
+            remains usable.
+            """
+            try:
+                await self.refresh(wshandler)
+                print('User-agents cache has been refreshed')
+            except Exception as error:
+                print(f'User-agents cache refresh failed: {error}')
+
+        if self.__refresh_task is None and await self.is_stale():
+            self.__refresh_task = asyncio.create_task(refresh_quietly())
+        return self.__refresh_task
+
+    async def wait_background_refresh(self):
+        """
+        Waits for a pending background refresh, if any, so that it is not interrupted by the browser shutdown.
+        """
+        if self.__refresh_task is not None:
+            await self.__refresh_task
+            self.__refresh_task = None
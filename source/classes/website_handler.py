@@ -1,12 +1,16 @@
-import fnmatch
+import asyncio
 import json
 import random
 import re
-from pathlib import Path
+import time
+from collections.abc import Sequence
 from typing import Optional
 from urllib.parse import urlparse, urlunparse
 
-from playwright.async_api import async_playwright, APIResponse, Page
+from playwright.async_api import (async_playwright, APIResponse, BrowserContext, Page, Error as PWError, Request,
+                                  Route)
+
+from source.classes.robots_matcher import RobotsMatcher
 
 
 class NonCompliantURL(Exception):
@@ -17,14 +21,28 @@ class UninitializedPlaywright(Exception):
     pass
 
 
+class RobotsUnavailable(Exception):
+    pass
+
+
 class WebsiteHandler:
     """
     Handles fundamental website interactions, including robots.txt compliance,
-    user-agent handling and browser tab management.
+    user-agent handling, browser tab management and resource blocking.
     """
+    # A blocking profile suitable for DOM-only extraction. Stylesheets are left out on purpose:
+    # rendered text (e.g. inner_text()) depends on them.
+    default_blocked_resource_types = ('image', 'media', 'font')
+    default_blocked_url_patterns = (r'googletagmanager\.com', r'google-analytics\.com', r'doubleclick\.net',
+                                    r'googlesyndication\.com', r'adservice\.google\.', r'scorecardresearch\.com',
+                                    r'connect\.facebook\.net', r'chartbeat\.(com|net)', r'taboola\.com',
+                                    r'outbrain\.com')
+
     def __init__(self, headless: bool = True, robots_useragent_key: str = 'user-agent',
                  robots_allow_key: str = 'allow', robots_disallow_key: str = 'disallow',
-                 default_timeout_sec: int = 5, default_navigation_timeout_sec: int = 25):
+                 default_timeout_sec: int = 5, default_navigation_timeout_sec: int = 25,
+                 page_pool_max_size: int = 5, blocked_resource_types: Sequence[str] = (),
+                 blocked_url_patterns: Sequence[str] = ()):
         self.__headless = headless
         self.__robots_useragent_key = robots_useragent_key
         self.__robots_allow_key = robots_allow_key
@@ -32,23 +50,68 @@ class WebsiteHandler:
         self.__default_timeout_sec = default_timeout_sec
         self.__default_navigation_timeout_sec = default_navigation_timeout_sec
         self.__common_useragents_url = 'https://www.useragents.me/'
+        self.__page_pool_max_size = page_pool_max_size
+        self.__blocked_resource_types = frozenset(blocked_resource_types)
+        self.__blocked_url_regex = None
+        if len(blocked_url_patterns) > 0:
+            self.__blocked_url_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in blocked_url_patterns))
+        self.__blocking_stats = {'allowed_requests': 0, 'blocked_requests': 0, 'blocked_requests_by_type': {},
+                                 'received_bytes': 0}
+        self.__playwright = None
+        self.__browser = None
         self.__page = None
         self.__browser_context = None
+        self.__retired_browser_contexts = []
         self.__parsed_robots = None
+        self.__robots_matcher = None
+        self.__robots_sample_url = None
+        self.__robots_loaded_on = None
+        self.__idle_pages = []
 
     async def initialize_playwright(self, user_agent: Optional[str] = None):
         """
         Initializes Playwright and sets up browser context.
         Must be called externally as __init__() cannot invoke asynchronous methods.
-        Destroys any existing context when invoked.
-        """
-        await self.destroy()
-        playwright = await async_playwright().start()
-        browser = playwright.chromium
-        self.__browser_context = await browser.launch_persistent_context('', headless=self.__headless,
-                                                                         user_agent=user_agent)
-        self.__page = self.__browser_context.pages[0]
+        The browser is launched only once: later calls replace the browser context with a new one, which is much
+        cheaper than a relaunch. Pages still in use by a replaced context keep working until they are released.
+        """
+        if self.__browser is None:
+            self.__playwright = await async_playwright().start()
+            self.__browser = await self.__playwright.chromium.launch(headless=self.__headless)
+        previous_context = self.__browser_context
+        previous_page = self.__page
+        self.__browser_context = await self.__browser.new_context(user_agent=user_agent)
+        if len(self.__blocked_resource_types) > 0 or self.__blocked_url_regex is not None:
+            await self.__browser_context.route('**/*', self.__route_request)
+        else:
+            # Routing disables the browser cache, so requests are only counted when there is nothing to block
+            self.__browser_context.on('request', self.__count_request)
+        self.__browser_context.on('requestfinished', self.__count_received_bytes)
+        self.__page = await self.__browser_context.new_page()
         self.__setup_page(self.__page)
+        if previous_context is not None:
+            await self.__retire_browser_context(previous_context, previous_page)
+
+    async def __retire_browser_context(self, browser_context: BrowserContext, main_page: Page):
+        """
+        Closes the main and idle pages of a replaced browser context, along with the context itself once none
+        of its pages are in use.
+        """
+        retired_pages = [main_page] + [page for page in self.__idle_pages if page.context is browser_context]
+        self.__idle_pages = [page for page in self.__idle_pages if page.context is not browser_context]
+        for page in retired_pages:
+            await page.close()
+        self.__retired_browser_contexts.append(browser_context)
+        await self.__close_unused_browser_contexts()
+
+    async def __close_unused_browser_contexts(self):
+        """
+        Closes the replaced browser contexts whose pages were all closed or released.
+        """
+        for browser_context in list(self.__retired_browser_contexts):
+            if all(page.is_closed() for page in browser_context.pages):
+                self.__retired_browser_contexts.remove(browser_context)
+                await browser_context.close()
 
     def __check_playwright_instance(self):
         """
@@ -65,6 +128,71 @@ class WebsiteHandler:
         page.set_default_timeout(self.__default_timeout_sec * 1000)
         page.set_default_navigation_timeout(self.__default_navigation_timeout_sec * 1000)
 
+    def __is_blocked_request(self, route: Route) -> bool:
+        """
+        Evaluates whether a request matches the blocked resource types or URL patterns.
+        The 'iframe' pseudo resource type matches documents loaded by frames other than the main one.
+        """
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type == 'document' and 'iframe' in self.__blocked_resource_types:
+            if request.frame.parent_frame is not None:
+                return True
+        if resource_type in self.__blocked_resource_types:
+            return True
+        if self.__blocked_url_regex is not None and self.__blocked_url_regex.search(request.url) is not None:
+            return True
+        return False
+
+    async def __route_request(self, route: Route):
+        """
+        Aborts requests for resources that are not needed for extraction and lets the rest through.
+        """
+        if self.__is_blocked_request(route):
+            resource_type = route.request.resource_type
+            blocked_by_type = self.__blocking_stats['blocked_requests_by_type']
+            blocked_by_type[resource_type] = blocked_by_type.get(resource_type, 0) + 1
+            self.__blocking_stats['blocked_requests'] += 1
+            await route.abort('blockedbyclient')
+        else:
+            self.__blocking_stats['allowed_requests'] += 1
+            await route.continue_()
+
+    def __count_request(self, request: Request):
+        """
+        Counts a request as allowed, for the baseline of runs without a resource blocking profile.
+        """
+        self.__blocking_stats['allowed_requests'] += 1
+
+    async def __count_received_bytes(self, request: Request):
+        """
+        Adds the bytes transferred for a finished request (response headers and body as sent, i.e. compressed) to
+        the received bytes counter. Chunked responses, which advertise no Content-Length, are counted as well.
+        """
+        try:
+            sizes = await request.sizes()
+        except PWError:
+            return  # Its page or browser context was closed meanwhile
+        received_bytes = max(sizes['responseHeadersSize'], 0) + max(sizes['responseBodySize'], 0)
+        self.__blocking_stats['received_bytes'] += received_bytes
+
+    @property
+    def blocking_stats(self) -> dict:
+        """
+        Requests allowed and blocked by the resource blocking profile (every request is allowed without one), and
+        the bytes transferred for the allowed ones (headers included), accumulated over this instance's lifetime.
+        The bytes blocked requests would have transferred are unknown, as they are never fetched.
+        """
+        return {**self.__blocking_stats,
+                'blocked_requests_by_type': dict(self.__blocking_stats['blocked_requests_by_type'])}
+
+    @property
+    def default_timeout_sec(self) -> int:
+        """
+        The default timeout set on every page, in seconds.
+        """
+        return self.__default_timeout_sec
+
     @property
     def page(self):
         """
@@ -133,21 +261,17 @@ class WebsiteHandler:
         Evaluates whether the given URL follows loaded robots.txt rules.
         If no robots.txt is loaded, all URLs are allowed.
         """
+        return self.get_robots_matcher(parsed_robots).is_allowed(urlparse(url).path)
+
+    def get_robots_matcher(self, parsed_robots: Optional[dict[str, list[str]]] = None) -> RobotsMatcher:
+        """
+        Returns the compiled matcher of the given robots.txt rules. Matchers are compiled once per rule set.
+        """
         parsed_robots = parsed_robots or {}
-        allowed_paths = parsed_robots.get(self.__robots_allow_key, [])
-        disallowed_paths = parsed_robots.get(self.__robots_disallow_key, [])
-        url_path = urlparse(url).path
-        all_paths = allowed_paths + disallowed_paths
-        all_paths_sorted = sorted(all_paths,
-                                  key=lambda path: len(Path(path).resolve().parents))  # Sorted by specificity
-        is_compliant = True
-        for path in all_paths_sorted:
-            path_pattern = path
-            if path[-1] != '*':
-                path_pattern += '*'
-            if fnmatch.fnmatch(url_path, path_pattern):
-                is_compliant = path in allowed_paths
-        return is_compliant
+        if parsed_robots is self.__parsed_robots and self.__robots_matcher is not None:
+            return self.__robots_matcher
+        return RobotsMatcher.from_rules(tuple(parsed_robots.get(self.__robots_allow_key, [])),
+                                        tuple(parsed_robots.get(self.__robots_disallow_key, [])))
 
     async def safe_goto(self, url: str, parsed_robots: Optional[dict[str, list[str]]] = None,
                         page: Optional[Page] = None):
@@ -155,27 +279,49 @@ class WebsiteHandler:
         Navigates to the given URL only if it complies with host's robots.txt rules,
         assuming there's a robots file loaded.
         """
-        parsed_robots = parsed_robots or self.__parsed_robots
         self.__check_playwright_instance()
-        if not self.is_compliant_url(url, parsed_robots):
-            raise NonCompliantURL(f'The URL "{url}" is disallowed by robots.txt rules.')
+        self.__ensure_compliant_url(url, parsed_robots)
         page = page or self.__page
         await page.goto(url)
 
-    async def get_common_useragent(self) -> str:
+    async def safe_get_request(self, url: str, parsed_robots: Optional[dict[str, list[str]]] = None) -> APIResponse:
+        """
+        Performs an HTTP GET request only if the URL complies with host's robots.txt rules,
+        assuming there's a robots file loaded. No browser tab is involved: requests go through the browser
+        context's HTTP client, which keeps connections alive across requests.
+        """
+        self.__check_playwright_instance()
+        self.__ensure_compliant_url(url, parsed_robots)
+        return await self.get_request(url)
+
+    def __ensure_compliant_url(self, url: str, parsed_robots: Optional[dict[str, list[str]]] = None):
+        """
+        Raises NonCompliantURL if the URL is disallowed by the given or loaded robots.txt rules.
+        """
+        parsed_robots = parsed_robots or self.__parsed_robots
+        if not self.is_compliant_url(url, parsed_robots):
+            raise NonCompliantURL(f'The URL "{url}" is disallowed by robots.txt rules.')
+
+    async def get_common_useragents(self, page: Optional[Page] = None) -> list[str]:
         """
-        Navigates to __common_useragents_url, scrapes commonly found user-agents published there,
-        and returns one chosen randomly.
+        Navigates to __common_useragents_url and scrapes the commonly found user-agents published there.
+        Uses the main page unless another one is provided.
         """
         self.__check_playwright_instance()
-        await self.__page.goto(self.__common_useragents_url)
-        json_parent_div = self.__page.locator('#most-common-desktop-useragents-json-csv')
+        page = page or self.__page
+        await page.goto(self.__common_useragents_url)
+        json_parent_div = page.locator('#most-common-desktop-useragents-json-csv')
         json_div = json_parent_div.locator('div', has_text='JSON')
         json_textarea = json_div.locator('textarea')
         json_text = await json_textarea.input_value()
         parsed_json = json.loads(json_text)
-        random_useragent = random.choice(parsed_json)['ua']
-        return random_useragent
+        return [item['ua'] for item in parsed_json]
+
+    async def get_common_useragent(self) -> str:
+        """
+        Returns a commonly found user-agent, chosen randomly.
+        """
+        return random.choice(await self.get_common_useragents())
 
     async def get_current_useragent(self):
         """
@@ -187,7 +333,7 @@ class WebsiteHandler:
 
     async def change_useragent(self):
         """
-        Re-initializes the browser context with a different, random user-agent.
+        Replaces the browser context with one using a different, random user-agent. The browser is not relaunched.
         """
         new_useragent = await self.get_common_useragent()
         print(f'New user-agent: {new_useragent}')
@@ -195,22 +341,54 @@ class WebsiteHandler:
 
     async def initialize_random_useragent_context(self):
         """
-        Launches the original Playwright browser context to scrape a commonly used user-agent,
-        then re-initializes the browser context with the retrieved user-agent.
+        Launches the browser with a default context to scrape a commonly used user-agent,
+        then replaces that context with one using the retrieved user-agent.
         """
         await self.initialize_playwright()
         await self.change_useragent()
 
-    async def setup_robots_compliance(self, sample_url: str):
+    async def setup_robots_compliance(self, sample_url: str, keep_rules_on_server_error: bool = False):
         """
         Downloads and parses the robots.txt file from the host of the given sample_url.
+        If keep_rules_on_server_error, a server error response raises RobotsUnavailable and leaves the loaded rules in
+        place, instead of replacing them with its (empty) rules.
         """
         url_scheme, url_hostname, _, _, _, _ = list(urlparse(sample_url))
         robots_url = str(urlunparse([url_scheme, url_hostname, '/robots.txt', '', '', '']))
         robots_response = await self.get_request(robots_url)
+        if keep_rules_on_server_error and robots_response.status >= 500:
+            raise RobotsUnavailable(f'robots.txt request failed with status {robots_response.status}.')
         robots_contents = await robots_response.text()
         parsed_robots = self.parse_robots_file(robots_contents)
         self.__parsed_robots = parsed_robots
+        self.__robots_matcher = RobotsMatcher(parsed_robots[self.__robots_allow_key],
+                                              parsed_robots[self.__robots_disallow_key])
+        self.__robots_sample_url = sample_url
+        self.__robots_loaded_on = time.monotonic()
+
+    @property
+    def robots_age_sec(self) -> Optional[float]:
+        """
+        Seconds since robots.txt was loaded, or None if it was not.
+        """
+        if self.__robots_loaded_on is None:
+            return None
+        return time.monotonic() - self.__robots_loaded_on
+
+    async def refresh_robots_compliance(self, ttl_sec: float) -> bool:
+        """
+        Downloads and parses robots.txt again, from the host it was loaded from, once the loaded rules are older than
+        ttl_sec, so that long-running processes follow rule changes. If the download fails, or the server fails to
+        answer, the loaded rules are kept until the next refresh. Returns whether the rules were reloaded.
+        """
+        if self.__robots_sample_url is None or self.robots_age_sec < ttl_sec:
+            return False
+        try:
+            await self.setup_robots_compliance(self.__robots_sample_url, keep_rules_on_server_error=True)
+        except (PWError, RobotsUnavailable) as error:
+            print(f'robots.txt refresh failed, the loaded rules are kept: {error}')
+            return False
+        return True
 
     async def get_new_page(self, url: Optional[str] = None, parsed_robots: Optional[dict[str, list[str]]] = None):
         """
@@ -223,6 +401,58 @@ class WebsiteHandler:
             await self.safe_goto(url=url, parsed_robots=parsed_robots, page=new_page)
         return new_page
 
+    async def __is_healthy_page(self, page: Page) -> bool:
+        """
+        Checks that an idle page is still open and responsive before handing it out again.
+        """
+        if page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate('() => document.readyState'), timeout=self.__default_timeout_sec)
+        except (PWError, asyncio.TimeoutError):
+            return False
+        return True
+
+    async def acquire_page(self, url: Optional[str] = None,
+                           parsed_robots: Optional[dict[str, list[str]]] = None) -> Page:
+        """
+        Returns a warm page from the pool, or a new one if no healthy idle page is available.
+        Unhealthy idle pages are closed and discarded. If URL is provided, navigates to it; the page is handed back
+        to the pool if navigation fails. Pages must be handed back with release_page() once they are no longer needed.
+        """
+        self.__check_playwright_instance()
+        page = None
+        while page is None and len(self.__idle_pages) > 0:
+            idle_page = self.__idle_pages.pop()
+            if await self.__is_healthy_page(idle_page):
+                page = idle_page
+            elif not idle_page.is_closed():
+                await idle_page.close()
+        if page is None:
+            page = await self.get_new_page()
+        if url is not None:
+            try:
+                await self.safe_goto(url=url, parsed_robots=parsed_robots, page=page)
+            except BaseException:
+                await self.release_page(page)
+                raise
+        return page
+
+    async def release_page(self, page: Page):
+        """
+        Hands a page acquired with acquire_page() back to the pool.
+        The page is closed instead if the pool is already holding page_pool_max_size idle pages, or if it belongs
+        to a replaced browser context.
+        """
+        if page.is_closed():
+            return
+        if (self.__browser_context is not None and page.context is self.__browser_context
+                and len(self.__idle_pages) < self.__page_pool_max_size):
+            self.__idle_pages.append(page)
+        else:
+            await page.close()
+            await self.__close_unused_browser_contexts()
+
     async def destroy(self):
         """
         Releases allocated resources.
@@ -231,3 +461,13 @@ class WebsiteHandler:
             await self.__browser_context.close()
             self.__page = None
             self.__browser_context = None
+            self.__idle_pages = []
+        for browser_context in self.__retired_browser_contexts:
+            await browser_context.close()
+        self.__retired_browser_contexts = []
+        if self.__browser is not None:
+            await self.__browser.close()
+            self.__browser = None
+        if self.__playwright is not None:
+            await self.__playwright.stop()
+            self.__playwright = None
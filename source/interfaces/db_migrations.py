@@ -0,0 +1,62 @@
+from sqlalchemy import Connection, inspect
+
+
+def normalize_matching_articles(connection: Connection):
+    """
+    Moves article contents out of MatchingArticles, which stored them once per matching keyword, into Articles.
+    The latest stored version of each article is kept, and MatchingArticles is left with a single row per keyword
+    and URL.
+    """
+    column_names = {column['name'] for column in inspect(connection).get_columns('MatchingArticles')}
+    if 'Body' not in column_names:  # Created with the normalized schema
+        return
+    for trigger_suffix in ('AI', 'AD', 'AU'):
+        connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS MatchingArticlesFullText_{trigger_suffix}')
+    connection.exec_driver_sql('DROP TABLE IF EXISTS MatchingArticlesFullText')
+    connection.exec_driver_sql("""
+        INSERT OR IGNORE INTO Articles (URL, Title, Date, Author, ImageURL, Body, CreatedOn, UpdatedOn)
+        SELECT URL, Title, Date, Author, ImageURL, Body, CreatedOn, UpdatedOn
+        FROM MatchingArticles
+        ORDER BY UpdatedOn DESC, ID DESC""")
+    connection.exec_driver_sql('ALTER TABLE MatchingArticles RENAME TO MatchingArticlesLegacy')
+    connection.exec_driver_sql('DROP INDEX IF EXISTS IX_MatchingArticles_Keyword_URL')
+    connection.exec_driver_sql("""
+        CREATE TABLE "MatchingArticles" (
+            "ID" INTEGER NOT NULL,
+            "Keyword" TEXT NOT NULL,
+            "URL" TEXT NOT NULL,
+            "CreatedOn" DATETIME,
+            "UpdatedOn" DATETIME,
+            PRIMARY KEY ("ID"),
+            FOREIGN KEY("URL") REFERENCES "Articles" ("URL")
+        )""")
+    connection.exec_driver_sql("""
+        INSERT INTO MatchingArticles (Keyword, URL, CreatedOn, UpdatedOn)
+        SELECT Keyword, URL, MIN(CreatedOn), MAX(UpdatedOn)
+        FROM MatchingArticlesLegacy
+        GROUP BY Keyword, URL
+        ORDER BY MIN(ID)""")
+    connection.exec_driver_sql('DROP TABLE MatchingArticlesLegacy')
+
+
+def deduplicate_matching_articles(connection: Connection):
+    """
+    Removes the duplicated MatchingArticles rows that repeated runs stored for the same keyword and URL, keeping the
+    earliest one, so that a unique index can cover them. Also adds the ContentHash column to Articles, which stays
+    empty until each article is scraped again.
+    """
+    connection.exec_driver_sql("""
+        DELETE FROM MatchingArticles
+        WHERE ID NOT IN (SELECT MIN(ID) FROM MatchingArticles GROUP BY Keyword, URL)""")
+    connection.exec_driver_sql('DROP INDEX IF EXISTS IX_MatchingArticles_Keyword_URL')
+    column_names = {column['name'] for column in inspect(connection).get_columns('Articles')}
+    if 'ContentHash' not in column_names:
+        connection.exec_driver_sql('ALTER TABLE Articles ADD COLUMN ContentHash TEXT')
+
+
+# Applied in order to databases created with an older schema. Never reorder or remove migrations: databases record
+# how many of them they went through.
+MIGRATIONS = (
+    normalize_matching_articles,
+    deduplicate_matching_articles,
+)
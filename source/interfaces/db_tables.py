@@ -1,28 +1,67 @@
 from datetime import datetime
 
-from sqlalchemy.dialects.sqlite import DATETIME, INTEGER, TEXT
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Text, UniqueConstraint
 from sqlalchemy.orm import mapped_column
 
 from source.classes.db_manager import DBManager
 
 
+class Articles(DBManager.Base):
+    __tablename__ = 'Articles'
+    __table_args__ = (Index('UX_Articles_URL', 'URL', unique=True),
+                      Index('IX_Articles_Date', 'Date'),
+                      {'info': {'full_text_columns': ('Title', 'Body')}})
+    ID = mapped_column(Integer, primary_key=True)
+    URL = mapped_column(Text, nullable=False)
+    Title = mapped_column(Text)
+    Date = mapped_column(DateTime)
+    Author = mapped_column(Text)
+    ImageURL = mapped_column(Text)
+    Body = mapped_column(Text)
+    ContentHash = mapped_column(Text)
+    CreatedOn = mapped_column(DateTime, default=datetime.now)
+    UpdatedOn = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
 class MatchingArticles(DBManager.Base):
     __tablename__ = 'MatchingArticles'
-    ID = mapped_column(INTEGER, primary_key=True)
-    Keyword = mapped_column(TEXT, nullable=False)
-    URL = mapped_column(TEXT, nullable=False)
-    Title = mapped_column(TEXT)
-    Date = mapped_column(DATETIME)
-    Author = mapped_column(TEXT)
-    ImageURL = mapped_column(TEXT)
-    Body = mapped_column(TEXT)
-    CreatedOn = mapped_column(DATETIME, default=datetime.now)
-    UpdatedOn = mapped_column(DATETIME, default=datetime.now, onupdate=datetime.now)
+    __table_args__ = (Index('UX_MatchingArticles_Keyword_URL', 'Keyword', 'URL', unique=True),
+                      Index('IX_MatchingArticles_URL', 'URL'))
+    ID = mapped_column(Integer, primary_key=True)
+    Keyword = mapped_column(Text, nullable=False)
+    URL = mapped_column(Text, ForeignKey('Articles.URL'), nullable=False)
+    CreatedOn = mapped_column(DateTime, default=datetime.now)
+    UpdatedOn = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
 class CachedUserAgents(DBManager.Base):
     __tablename__ = 'CachedUserAgents'
-    ID = mapped_column(INTEGER, primary_key=True)
-    UserAgent = mapped_column(TEXT, nullable=False)
-    CreatedOn = mapped_column(DATETIME, default=datetime.now)
-    UpdatedOn = mapped_column(DATETIME, default=datetime.now, onupdate=datetime.now)
+    __table_args__ = (Index('UX_CachedUserAgents_UserAgent', 'UserAgent', unique=True),)
+    ID = mapped_column(Integer, primary_key=True)
+    UserAgent = mapped_column(Text, nullable=False)
+    CreatedOn = mapped_column(DateTime, default=datetime.now)
+    UpdatedOn = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class CrawledURLs(DBManager.Base):
+    __tablename__ = 'CrawledURLs'
+    __table_args__ = (UniqueConstraint('Keyword', 'URL'),)
+    ID = mapped_column(Integer, primary_key=True)
+    Keyword = mapped_column(Text, nullable=False)
+    URL = mapped_column(Text, nullable=False)
+    CrawledOn = mapped_column(DateTime, default=datetime.now)
+
+
+class CrawlJobs(DBManager.Base):
+    __tablename__ = 'CrawlJobs'
+    __table_args__ = (Index('UX_CrawlJobs_URL', 'URL', unique=True),
+                      Index('IX_CrawlJobs_CompletedOn_LeaseExpiresOn', 'CompletedOn', 'LeaseExpiresOn'))
+    ID = mapped_column(Integer, primary_key=True)
+    URL = mapped_column(Text, nullable=False)
+    Keywords = mapped_column(Text, nullable=False)
+    LeaseOwner = mapped_column(Text)
+    LeaseExpiresOn = mapped_column(DateTime)
+    Attempts = mapped_column(Integer, nullable=False, default=0)
+    CompletedOn = mapped_column(DateTime)
+    CreatedOn = mapped_column(DateTime, default=datetime.now)
+    UpdatedOn = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
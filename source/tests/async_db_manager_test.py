@@ -0,0 +1,127 @@
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from source.classes.async_db_manager import AsyncDBManager, UninitializedConnection
+from source.classes.base_storage_manager import BaseStorageManager
+from source.classes.db_manager import RecordsMismatchException
+from source.interfaces.db_tables import Articles, MatchingArticles
+
+
+@pytest.fixture
+async def new_instance() -> AsyncDBManager:
+    """
+    Yields a new, initialized instance of AsyncDBManager and ensures its resources are released.
+    """
+    db_filepath = Path('testing_async.db')
+    storage = AsyncDBManager(filepath=db_filepath, max_pending_writes=2)
+    await storage.initialize_connection()
+    yield storage
+    try:
+        await storage.destroy()
+    except RecordsMismatchException:  # Raised on purpose by a test
+        pass
+    for filepath in (db_filepath, Path(f'{db_filepath}-wal'), Path(f'{db_filepath}-shm')):
+        if filepath.exists():
+            os.remove(filepath)
+
+
+def test_interface_success():
+    assert isinstance(AsyncDBManager(filepath=Path('testing_async.db')), BaseStorageManager)
+
+
+async def test_uninitialized_failure():
+    storage = AsyncDBManager(filepath=Path('testing_async.db'))
+    with pytest.raises(UninitializedConnection):
+        await storage.store([Articles(URL='https://example.com/1')])
+    await storage.destroy()
+    assert not Path('testing_async.db').exists()
+
+
+async def test_store_success(new_instance: AsyncDBManager):
+    await new_instance.upsert([Articles(URL='https://example.com/1', Title='Gatos')], conflict_columns=('URL',),
+                              hash_column='ContentHash')
+    await new_instance.store([MatchingArticles(Keyword='gatos', URL='https://example.com/1')])
+    await new_instance.flush()
+    assert list((await new_instance.retrieve(table=MatchingArticles))['URL']) == ['https://example.com/1']
+    assert list((await new_instance.run(lambda dbmanager: dbmanager.retrieve(columns=[Articles.Title])))['Title']) \
+        == ['Gatos']
+
+
+async def test_retrieve_queued_writes_success(new_instance: AsyncDBManager):
+    await new_instance.store([MatchingArticles(Keyword='gatos', URL=f'https://example.com/{index}')
+                              for index in range(3)])
+    # Reads wait for the writes queued before them, without a flush
+    assert await new_instance.retrieve_existing_values(MatchingArticles.URL, ['https://example.com/1',
+                                                                              'https://example.com/9']) \
+        == {'https://example.com/1'}
+    assert len(await new_instance.retrieve(table=MatchingArticles)) == 3
+
+
+async def test_store_grouping_success(new_instance: AsyncDBManager):
+    transactions_count = 0
+    dbmanager = await new_instance.run(lambda underlying_dbmanager: underlying_dbmanager)
+    original_transaction = dbmanager.transaction
+
+    def counting_transaction():
+        nonlocal transactions_count
+        transactions_count += 1
+        return original_transaction()
+
+    dbmanager.transaction = counting_transaction
+    for index in range(2):
+        await new_instance.store([Articles(URL=f'https://example.com/{index}')])
+    await new_instance.flush()
+    # Both writes were queued before the writer ran, so they were committed together
+    assert transactions_count == 1
+    assert len(await new_instance.retrieve(table=Articles)) == 2
+
+
+async def test_store_backpressure_success(new_instance: AsyncDBManager):
+    writer_may_continue = threading.Event()
+
+    def slow_records():
+        writer_may_continue.wait()
+        yield Articles(URL='https://example.com/slow')
+
+    await new_instance.store(slow_records())
+    await asyncio.sleep(0.1)  # The writer takes the slow write and blocks on it
+    await new_instance.store([Articles(URL='https://example.com/1')])
+    await new_instance.store([Articles(URL='https://example.com/2')])
+    # The queue is full: further writes wait for the writer, while the event loop keeps running
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(new_instance.store([Articles(URL='https://example.com/3')]), timeout=0.2)
+    assert time.perf_counter() - start < 1
+    writer_may_continue.set()
+    await new_instance.store([Articles(URL='https://example.com/3')])
+    await new_instance.flush()
+    assert len(await new_instance.retrieve(table=Articles)) == 4
+
+
+async def test_store_failure(new_instance: AsyncDBManager):
+    await new_instance.store([Articles(URL='https://example.com/1'), MatchingArticles(Keyword='gatos', URL='')])
+    with pytest.raises(RecordsMismatchException) as error_info:
+        await new_instance.flush()
+    assert error_info.value.__notes__ == ['1 queued write(s) were rolled back, including those grouped with the '
+                                          'failed one.']
+    assert len(await new_instance.retrieve(table=Articles)) == 0
+    # The failure was raised once: later writes proceed
+    await new_instance.store([Articles(URL='https://example.com/2')])
+    await new_instance.flush()
+    assert len(await new_instance.retrieve(table=Articles)) == 1
+
+
+async def test_store_grouped_failure(new_instance: AsyncDBManager):
+    await new_instance.store([Articles(URL='https://example.com/1')])
+    await new_instance.store([Articles(URL='https://example.com/2'), MatchingArticles(Keyword='gatos', URL='')])
+    # Both writes were grouped into the failed transaction, which is reported instead of silently dropped
+    with pytest.raises(RecordsMismatchException) as error_info:
+        await new_instance.flush()
+    assert error_info.value.__notes__ == ['2 queued write(s) were rolled back, including those grouped with the '
+                                          'failed one.']
+    assert len(await new_instance.retrieve(table=Articles)) == 0
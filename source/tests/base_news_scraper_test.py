@@ -1,8 +1,11 @@
+import asyncio
+import gc
+import time
 from typing import Callable
 
 import pytest
 
-from source.classes.base_news_scraper import BaseNewsScraper
+from source.classes.base_news_scraper import BaseNewsScraper, InvalidThrottlingMode, UnknownArticleField
 
 
 class FullSample(BaseNewsScraper):
@@ -26,3 +29,178 @@ class EmptySample(BaseNewsScraper):
 def test_instance_failure():
     with pytest.raises(TypeError):
         EmptySample()
+
+
+class FakePage:
+    """
+    Mimics the subset of Playwright's Page used by _gather_articles.
+    """
+    def __init__(self):
+        self.url = 'about:blank'
+        self.released = False
+
+
+class FakeWebsiteHandler:
+    """
+    Mimics WebsiteHandler's page pool, simulating a per-URL navigation latency and tracking concurrently open tabs.
+    """
+    def __init__(self, latencies_sec: dict[str, float]):
+        self.latencies_sec = latencies_sec
+        self.pages = []
+        self.idle_pages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.visited_urls = []
+
+    async def acquire_page(self, url=None):
+        if len(self.idle_pages) > 0:
+            page = self.idle_pages.pop()
+        else:
+            page = FakePage()
+            self.pages.append(page)
+        page.released = False
+        return page
+
+    async def release_page(self, page):
+        page.released = True
+        self.idle_pages.append(page)
+
+    async def safe_goto(self, url, page=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.visited_urls.append(url)
+        await asyncio.sleep(self.latencies_sec[url])
+        page.url = url
+        self.in_flight -= 1
+
+
+class GatheringSample(BaseNewsScraper):
+    #  Methods
+    async def get_title(self, url=None, page=None):
+        return page.url
+
+    get_date: Callable = lambda self, page: asyncio.sleep(0, '')
+    get_author: Callable = lambda self, page: asyncio.sleep(0, '')
+    get_image_url: Callable = lambda self, page: asyncio.sleep(0, '')
+    get_body: Callable = lambda self, page: asyncio.sleep(0, '')
+    search: Callable = lambda: ()
+
+
+@pytest.mark.parametrize('throttling_mode', BaseNewsScraper.throttling_modes)
+async def test_gather_articles_success(throttling_mode: str):
+    latencies_sec = {f'https://example.com/{index}': 0.05 if index % 4 == 0 else 0.01 for index in range(12)}
+    scraper = GatheringSample(throttling_chunk_size=3, throttling_mode=throttling_mode)
+    scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+    scraped_articles = await scraper._gather_articles(list(latencies_sec))
+    assert [article['title'] for article in scraped_articles] == list(latencies_sec)
+    assert scraper._wshandler.max_in_flight == 3
+    assert len(scraper._wshandler.pages) == 3  # Tabs are reused
+    assert all(page.released for page in scraper._wshandler.pages)
+
+
+async def test_gather_articles_pool_faster_than_chunked():
+    latencies_sec = {f'https://example.com/{index}': 0.2 if index % 3 == 0 else 0.01 for index in range(9)}
+    elapsed_sec = {}
+    for throttling_mode in BaseNewsScraper.throttling_modes:
+        scraper = GatheringSample(throttling_chunk_size=3, throttling_mode=throttling_mode)
+        scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+        start = time.perf_counter()
+        await scraper._gather_articles(list(latencies_sec))
+        elapsed_sec[throttling_mode] = time.perf_counter() - start
+    assert elapsed_sec['pool'] < elapsed_sec['chunked']
+
+
+async def test_gather_articles_streaming_success():
+    latencies_sec = {f'https://example.com/{index}': 0.05 for index in range(6)}
+    scraper = GatheringSample(throttling_chunk_size=3)
+    scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+    started_before_discovery_end = []
+
+    async def discover_urls():
+        for url in latencies_sec:
+            await asyncio.sleep(0.05)  # Simulates fetching a search results page
+            started_before_discovery_end.append(len(scraper._wshandler.pages) > 0)
+            yield url
+
+    start = time.perf_counter()
+    scraped_articles = await scraper._gather_articles(discover_urls())
+    elapsed_sec = time.perf_counter() - start
+    assert [article['title'] for article in scraped_articles] == list(latencies_sec)
+    assert any(started_before_discovery_end)  # Discovery and scraping overlap
+    assert elapsed_sec < 0.05 * len(latencies_sec) * 2
+
+
+async def test_gather_articles_streaming_failure():
+    scraper = GatheringSample()
+    scraper._wshandler = FakeWebsiteHandler({'https://example.com/0': 0.01})
+
+    async def discover_urls():
+        yield 'https://example.com/0'
+        raise ConnectionError('Search results page unavailable.')
+
+    with pytest.raises(ConnectionError):
+        await scraper._gather_articles(discover_urls())
+
+
+@pytest.mark.parametrize('throttling_mode', BaseNewsScraper.throttling_modes)
+async def test_gather_articles_return_exceptions_success(throttling_mode: str):
+    latencies_sec = {f'https://example.com/{index}': 0.01 for index in range(6)}
+    articles_urls = list(latencies_sec)
+    articles_urls.insert(2, 'https://example.com/unreachable')  # Has no latency, so navigating to it raises
+    scraper = GatheringSample(throttling_chunk_size=3, throttling_mode=throttling_mode)
+    scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+    with pytest.raises(KeyError):
+        await scraper._gather_articles(articles_urls)
+    scraped_articles = await scraper._gather_articles(articles_urls, return_exceptions=True)
+    assert isinstance(scraped_articles[2], KeyError)
+    assert [article['title'] for article in scraped_articles if isinstance(article, dict)] == list(latencies_sec)
+
+
+async def test_stream_articles_success():
+    latencies_sec = {f'https://example.com/{index}': 0.05 if index == 0 else 0.01 for index in range(6)}
+    scraper = GatheringSample(throttling_chunk_size=3)
+    scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+    streamed_urls = [article['title'] async for article in scraper._stream_articles(list(latencies_sec))]
+    assert sorted(streamed_urls) == sorted(latencies_sec)
+    assert streamed_urls[0] != 'https://example.com/0'  # Yielded in completion order
+    assert scraper._wshandler.max_in_flight == 3
+
+
+async def test_stream_articles_backpressure_success():
+    latencies_sec = {f'https://example.com/{index}': 0.01 for index in range(10)}
+    scraper = GatheringSample(throttling_chunk_size=2)
+    scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+    articles_stream = scraper._stream_articles(list(latencies_sec))
+    await anext(articles_stream)
+    await asyncio.sleep(0.1)  # A slow consumer holds back scraping
+    assert len(scraper._wshandler.visited_urls) == 3  # The first consumed article and two pending ones
+    await articles_stream.aclose()
+
+
+async def test_stream_articles_bounded_memory_success():
+    latencies_sec = {f'https://example.com/{index}': 0.001 for index in range(60)}
+    scraper = GatheringSample(throttling_chunk_size=3)
+    scraper._wshandler = FakeWebsiteHandler(latencies_sec)
+    streamed_count = 0
+    async for _ in scraper._stream_articles(list(latencies_sec)):
+        streamed_count += 1
+        if streamed_count == 50:
+            # Consumed tasks, along with their articles, are no longer referenced by the stream
+            gc.collect()
+            assert sum(isinstance(item, asyncio.Task) for item in gc.get_objects()) < 10
+    assert streamed_count == 60
+
+
+def test_throttling_mode_failure():
+    with pytest.raises(InvalidThrottlingMode):
+        GatheringSample(throttling_mode='unknown')
+
+
+def test_optional_fields_success():
+    assert GatheringSample().optional_fields == {'author', 'image_url'}
+    assert GatheringSample(optional_fields=['body']).optional_fields == {'body'}
+
+
+def test_optional_fields_failure():
+    with pytest.raises(UnknownArticleField):
+        GatheringSample(optional_fields=['subtitle'])
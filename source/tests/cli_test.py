@@ -0,0 +1,34 @@
+from argparse import Namespace
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from cli import map_result, migrate
+
+ARTICLE = {'article_url': 'https://www.pagina12.com.ar/800250-genealogistas', 'title': 'De genealogistas y analizantes',
+           'date': '2025-01-08T00:01:00-03:00', 'author': 'Sergio Zabalza', 'image_url': '', 'body': 'Primer párrafo.',
+           'keywords': ['genealogistas', 'analizantes']}
+
+
+def test_map_result_success():
+    stored_article, matches = map_result(ARTICLE)
+    assert stored_article.URL == ARTICLE['article_url']
+    assert stored_article.Date == datetime.fromisoformat(ARTICLE['date'])
+    assert [(match.Keyword, match.URL) for match in matches] == [('genealogistas', ARTICLE['article_url']),
+                                                                 ('analizantes', ARTICLE['article_url'])]
+
+
+def test_map_result_missing_date_success():
+    # The date resolves to empty when it is an optional field missing from the page
+    stored_article, _ = map_result({**ARTICLE, 'date': ''})
+    assert stored_article.Date is None
+    assert stored_article.Title == ARTICLE['title']
+
+
+def test_migrate_empty_database_success(tmp_path: Path, capsys: pytest.CaptureFixture):
+    db_filepath = tmp_path / 'empty.db'
+    db_filepath.touch()
+    migrate(Namespace(output=str(db_filepath)))
+    assert capsys.readouterr().out.startswith('Database size: 0 -> ')
+    assert db_filepath.stat().st_size > 0
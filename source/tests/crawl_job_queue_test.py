@@ -0,0 +1,121 @@
+import datetime
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from source.classes.crawl_job_queue import CrawlJobQueue
+from source.classes.db_manager import DBManager
+from source.interfaces.db_tables import CrawledURLs, CrawlJobs
+
+
+@pytest.fixture
+def new_dbmanager() -> DBManager:
+    """
+    Yields a new instance of DBManager and ensures its resources are released.
+    """
+    db_filepath = Path('testing_crawl_jobs.db')
+    dbmanager = DBManager(filepath=db_filepath)
+    yield dbmanager
+    dbmanager.destroy()
+    for filepath in (db_filepath, Path(f'{db_filepath}-wal'), Path(f'{db_filepath}-shm')):
+        if filepath.exists():
+            os.remove(filepath)
+
+
+def test_claim_success(new_dbmanager: DBManager):
+    job_queue = CrawlJobQueue(new_dbmanager)
+    job_queue.enqueue([f'https://example.com/{index}' for index in range(5)], ['gatos', 'perros AND NOT lobos'])
+    job_queue.enqueue(['https://example.com/0'], ['gatos'])  # Already queued
+    first_batch = job_queue.claim('worker-1', batch_size=3)
+    assert first_batch == {f'https://example.com/{index}': ['gatos', 'perros AND NOT lobos'] for index in range(3)}
+    second_batch = job_queue.claim('worker-2', batch_size=3)
+    assert list(second_batch) == ['https://example.com/3', 'https://example.com/4']
+    assert job_queue.claim('worker-3', batch_size=3) == {}
+    assert job_queue.count_jobs() == {'pending': 0, 'leased': 5, 'completed': 0, 'abandoned': 0}
+
+
+def test_acknowledge_success(new_dbmanager: DBManager):
+    job_queue = CrawlJobQueue(new_dbmanager)
+    job_queue.enqueue(['https://example.com/1', 'https://example.com/2'], ['gatos'])
+    claimed_urls = list(job_queue.claim('worker-1', batch_size=2))
+    with new_dbmanager.transaction():
+        assert job_queue.acknowledge('worker-1', claimed_urls[:1]) == {'https://example.com/1'}
+        new_dbmanager.store([CrawledURLs(Keyword='gatos', URL='https://example.com/1')])
+    assert job_queue.acknowledge('worker-2', claimed_urls) == set()  # Leased by another worker
+    assert job_queue.acknowledge('worker-1', claimed_urls) == {'https://example.com/2'}
+    assert job_queue.acknowledge('worker-1', claimed_urls) == set()  # Already completed
+    assert job_queue.claim('worker-1', batch_size=2) == {}
+    assert job_queue.count_jobs() == {'pending': 0, 'leased': 0, 'completed': 2, 'abandoned': 0}
+
+
+def test_expired_lease_success(new_dbmanager: DBManager):
+    expired_queue = CrawlJobQueue(new_dbmanager, lease_duration=datetime.timedelta(0), max_attempts=2)
+    expired_queue.enqueue(['https://example.com/1'], ['gatos'])
+    assert list(expired_queue.claim('worker-1', batch_size=1)) == ['https://example.com/1']
+    # The lease expired before being renewed: the job is claimed by another worker, which alone can complete it
+    assert expired_queue.renew('worker-1', ['https://example.com/1']) == {'https://example.com/1'}
+    assert list(expired_queue.claim('worker-2', batch_size=1)) == ['https://example.com/1']
+    assert expired_queue.renew('worker-1', ['https://example.com/1']) == set()
+    assert expired_queue.acknowledge('worker-1', ['https://example.com/1']) == set()
+    # Claimed max_attempts times without being completed
+    assert expired_queue.claim('worker-3', batch_size=1) == {}
+    assert expired_queue.count_jobs() == {'pending': 0, 'leased': 0, 'completed': 0, 'abandoned': 1}
+
+
+def test_release_success(new_dbmanager: DBManager):
+    job_queue = CrawlJobQueue(new_dbmanager)
+    job_queue.enqueue(['https://example.com/1'], ['gatos'])
+    claimed_urls = list(job_queue.claim('worker-1', batch_size=1))
+    assert job_queue.release('worker-2', claimed_urls) == set()
+    assert job_queue.release('worker-1', claimed_urls) == {'https://example.com/1'}
+    assert list(job_queue.claim('worker-2', batch_size=1)) == ['https://example.com/1']
+
+
+def test_concurrent_claims_success(new_dbmanager: DBManager):
+    CrawlJobQueue(new_dbmanager).enqueue([f'https://example.com/{index}' for index in range(200)], ['gatos'])
+    claimed_urls_by_worker = {}
+
+    def claim_all(worker_id: str):
+        # Every worker uses its own connections, as separate processes would
+        dbmanager = DBManager(filepath=Path('testing_crawl_jobs.db'))
+        job_queue = CrawlJobQueue(dbmanager)
+        claimed_urls_by_worker[worker_id] = []
+        while len(claimed_jobs := job_queue.claim(worker_id, batch_size=7)) > 0:
+            claimed_urls_by_worker[worker_id].extend(claimed_jobs)
+            job_queue.acknowledge(worker_id, claimed_jobs)
+        dbmanager.destroy()
+
+    workers = [threading.Thread(target=claim_all, args=(f'worker-{index}',)) for index in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    claimed_urls = [url for urls in claimed_urls_by_worker.values() for url in urls]
+    assert sorted(claimed_urls) == sorted(f'https://example.com/{index}' for index in range(200))
+    assert set(new_dbmanager.retrieve(columns=[CrawlJobs.Attempts])['Attempts']) == {1}
+
+
+def test_enqueue_new_keywords_success(new_dbmanager: DBManager):
+    job_queue = CrawlJobQueue(new_dbmanager)
+    job_queue.enqueue(['https://example.com/1'], ['gatos'])
+    job_queue.acknowledge('worker-1', list(job_queue.claim('worker-1', batch_size=1)))
+    job_queue.enqueue(['https://example.com/1', 'https://example.com/2'], ['gatos'])  # Already completed for gatos
+    assert list(job_queue.claim('worker-1', batch_size=2)) == ['https://example.com/2']
+    job_queue.enqueue(['https://example.com/1', 'https://example.com/2'], ['perros'])
+    # Completed jobs are pending again, and leased ones can no longer be acknowledged by their former owner
+    assert job_queue.acknowledge('worker-1', ['https://example.com/2']) == set()
+    assert job_queue.claim('worker-2', batch_size=2) == {'https://example.com/1': ['gatos', 'perros'],
+                                                         'https://example.com/2': ['gatos', 'perros']}
+    assert set(new_dbmanager.retrieve(columns=[CrawlJobs.Attempts])['Attempts']) == {1}
+
+
+def test_enqueue_stale_success(new_dbmanager: DBManager):
+    job_queue = CrawlJobQueue(new_dbmanager)
+    job_queue.enqueue(['https://example.com/1'], ['gatos'])
+    job_queue.acknowledge('worker-1', list(job_queue.claim('worker-1', batch_size=1)))
+    job_queue.enqueue(['https://example.com/1'], ['gatos'], max_age=datetime.timedelta(days=1))
+    assert job_queue.claim('worker-1', batch_size=1) == {}
+    job_queue.enqueue(['https://example.com/1'], ['gatos'], max_age=datetime.timedelta(0))
+    assert job_queue.claim('worker-1', batch_size=1) == {'https://example.com/1': ['gatos']}
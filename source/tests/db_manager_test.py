@@ -1,13 +1,15 @@
 import datetime
 import os
+import sqlite3
 from pathlib import Path
 
 import pytest
+import pandas
 from pandas import DataFrame
 
 from source.classes.base_storage_manager import BaseStorageManager
-from source.classes.db_manager import DBManager, RecordsMismatchException
-from source.interfaces.db_tables import MatchingArticles, CachedUserAgents
+from source.classes.db_manager import DBManager, FullTextSearchException, RecordsMismatchException
+from source.interfaces.db_tables import Articles, MatchingArticles, CachedUserAgents, CrawledURLs
 
 
 def test_instance_success():
@@ -42,8 +44,7 @@ def test_basic_retrieve_success(new_instance: DBManager):
 
 @pytest.mark.parametrize('input_data', [
     pytest.param(
-        [MatchingArticles(
-            Keyword='genealogistas',
+        [Articles(
             URL='https://www.pagina12.com.ar/803462-un-manto-de-caracoles-y-un-colibri',
             Title='Un manto de caracoles y un colibrí',
             Date=datetime.datetime.fromisoformat('2025-02-13T01:14:20-03:00'),
@@ -52,8 +53,7 @@ def test_basic_retrieve_success(new_instance: DBManager):
             Body='“Promete un tiempo / en que la ferocidad no sea la única manera de tocarnos / los unos a los otros y dejarnos una huella. Y quién / no quiere esa promesa.”')]
     ),
     pytest.param(
-        [MatchingArticles(
-            Keyword='genealogistas',
+        [Articles(
             URL='https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina',
             Title='En busca de la genealogía felina',
             Date=datetime.datetime.fromisoformat('2018-02-16T02:40:46-03:00'),
@@ -70,14 +70,13 @@ El gato sobrevivirá porque “no es tan estúpido como el ser humano”. El lib
 ])
 def test_basic_store_success(new_instance: DBManager, input_data: list[DBManager.Base]):
     new_instance.store(input_data)
-    result = new_instance.retrieve(columns=[MatchingArticles.ID])
+    result = new_instance.retrieve(columns=[Articles.ID])
     assert len(result) > 0
 
 
 @pytest.mark.parametrize('input_data', [
     pytest.param(
-        [MatchingArticles(
-            Keyword='genealogistas',
+        [Articles(
             URL='https://www.pagina12.com.ar/803462-un-manto-de-caracoles-y-un-colibri',
             Title='Un manto de caracoles y un colibrí',
             Date=datetime.datetime.fromisoformat('2025-02-13T01:14:20-03:00'),
@@ -86,8 +85,7 @@ def test_basic_store_success(new_instance: DBManager, input_data: list[DBManager
             Body='“Promete un tiempo / en que la ferocidad no sea la única manera de tocarnos / los unos a los otros y dejarnos una huella. Y quién / no quiere esa promesa.”')]
     ),
     pytest.param(
-        [MatchingArticles(
-            Keyword='genealogistas',
+        [Articles(
             URL='https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina',
             Title='En busca de la genealogía felina',
             Date=datetime.datetime.fromisoformat('2018-02-16T02:40:46-03:00'),
@@ -97,16 +95,14 @@ def test_basic_store_success(new_instance: DBManager, input_data: list[DBManager
     ),
     pytest.param(
         [
-            MatchingArticles(
-                Keyword='genealogistas',
+            Articles(
                 URL='https://www.pagina12.com.ar/803462-un-manto-de-caracoles-y-un-colibri',
                 Title='Un manto de caracoles y un colibrí',
                 Date=datetime.datetime.fromisoformat('2025-02-13T01:14:20-03:00'),
                 Author='María Pia López',
                 ImageURL='https://images.pagina12.com.ar/styles/focal_3_2_470x313/public/2025-02/913013-colibri-afp2.jpg',
                 Body='“Promete un tiempo / en que la ferocidad no sea la única manera de tocarnos / los unos a los otros y dejarnos una huella. Y quién / no quiere esa promesa.”'),
-            MatchingArticles(
-                Keyword='genealogistas',
+            Articles(
                 URL='https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina',
                 Title='En busca de la genealogía felina',
                 Date=datetime.datetime.fromisoformat('2018-02-16T02:40:46-03:00'),
@@ -116,9 +112,9 @@ def test_basic_store_success(new_instance: DBManager, input_data: list[DBManager
         ]
     ),
 ])
-def test_matching_articles_io_success(new_instance: DBManager, input_data: list[DBManager.Base]):
+def test_articles_io_success(new_instance: DBManager, input_data: list[DBManager.Base]):
     new_instance.store(input_data)
-    result = new_instance.retrieve(table=MatchingArticles)
+    result = new_instance.retrieve(table=Articles)
     for index in range(len(input_data)):
         assert input_data[index].URL == result.URL.iloc[index]
         assert input_data[index].Title == result.Title.iloc[index]
@@ -150,8 +146,7 @@ def test_cached_useragents_io_success(new_instance: DBManager, input_data: list[
 @pytest.mark.parametrize('input_data', [
     pytest.param(
         [
-            MatchingArticles(
-                Keyword='genealogistas',
+            Articles(
                 URL='https://www.pagina12.com.ar/803462-un-manto-de-caracoles-y-un-colibri',
                 Title='Un manto de caracoles y un colibrí',
                 Date=datetime.datetime.fromisoformat('2025-02-13T01:14:20-03:00'),
@@ -175,8 +170,7 @@ def test_cached_useragents_io_success(new_instance: DBManager, input_data: list[
             CachedUserAgents(
                 UserAgent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1.1 Safari/605.1.1',
             ),
-            MatchingArticles(
-                Keyword='genealogistas',
+            Articles(
                 URL='https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina',
                 Title='En busca de la genealogía felina',
                 Date=datetime.datetime.fromisoformat('2018-02-16T02:40:46-03:00'),
@@ -191,8 +185,7 @@ def test_cached_useragents_io_success(new_instance: DBManager, input_data: list[
             CachedUserAgents(
                 UserAgent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1.1 Safari/605.1.1',
             ),
-            MatchingArticles(
-                Keyword='genealogistas',
+            Articles(
                 URL='https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina',
                 Title='En busca de la genealogía felina',
                 Date=datetime.datetime.fromisoformat('2018-02-16T02:40:46-03:00'),
@@ -209,3 +202,182 @@ def test_cached_useragents_io_success(new_instance: DBManager, input_data: list[
 def test_store_failure(new_instance: DBManager, input_data: list[DBManager.Base]):
     with pytest.raises(RecordsMismatchException):
         new_instance.store(input_data)
+
+
+def test_retrieve_existing_values_success(new_instance: DBManager):
+    now = datetime.datetime.now()
+    new_instance.store([
+        CrawledURLs(Keyword='gatos', URL=f'https://example.com/{index}',
+                    CrawledOn=now - datetime.timedelta(days=index))
+        for index in range(5)])
+    candidate_urls = [f'https://example.com/{index}' for index in range(2000)]  # Exceeds one lookup batch
+    assert new_instance.retrieve_existing_values(
+        CrawledURLs.URL, candidate_urls,
+        filters=[CrawledURLs.Keyword == 'gatos']) == {f'https://example.com/{index}' for index in range(5)}
+    assert new_instance.retrieve_existing_values(
+        CrawledURLs.URL, candidate_urls, filters=[CrawledURLs.Keyword == 'gatos'],
+        timestamp_column=CrawledURLs.CrawledOn,
+        max_age=datetime.timedelta(days=2, hours=1)) == {f'https://example.com/{index}' for index in range(3)}
+    assert new_instance.retrieve_existing_values(CrawledURLs.URL, candidate_urls,
+                                                 filters=[CrawledURLs.Keyword == 'perros']) == set()
+
+
+def test_store_replace_duplicates_success(new_instance: DBManager):
+    crawled_on = datetime.datetime(2025, 1, 1)
+    new_instance.store([CrawledURLs(Keyword='gatos', URL='https://example.com/1', CrawledOn=crawled_on)])
+    new_instance.store([CrawledURLs(Keyword='gatos', URL='https://example.com/1', CrawledOn=crawled_on)])
+    assert len(new_instance.retrieve(table=CrawledURLs)) == 1
+    new_instance.store([CrawledURLs(Keyword='gatos', URL='https://example.com/1',
+                                    CrawledOn=crawled_on.replace(year=2026))], replace_duplicates=True)
+    result = new_instance.retrieve(table=CrawledURLs)
+    assert len(result) == 1
+    assert result['CrawledOn'][0].year == 2026
+
+
+def test_full_text_search_success(new_instance: DBManager):
+    new_instance.store([
+        Articles(URL='https://example.com/1', Title='En busca de la genealogía felina',
+                 Body='El gato vive solo, no necesita de la sociedad.'),
+        Articles(URL='https://example.com/2', Title='Un manto de caracoles y un colibrí',
+                 Body='Una historia cultural del gato, el tigre en la casa, y del gato en la música.'),
+    ])
+    result = new_instance.full_text_search(Articles, 'genealogia')  # Accents are folded
+    assert list(result.URL) == ['https://example.com/1']
+    assert result.Snippet[0] == 'En busca de la [genealogía] felina'
+    result = new_instance.full_text_search(Articles, 'gato')
+    assert list(result.URL) == ['https://example.com/2', 'https://example.com/1']  # Best ranked first
+    assert result.Rank.is_monotonic_increasing
+    assert len(new_instance.full_text_search(Articles, 'gato', limit=1)) == 1
+    assert list(new_instance.full_text_search(Articles, 'felin* NOT colibri').URL) == ['https://example.com/1']
+    assert new_instance.full_text_search(Articles, 'perro').empty
+
+
+def test_full_text_index_sync_success(new_instance: DBManager):
+    new_instance.store([Articles(URL='https://example.com/1', Title='Gatos', Body='')])
+    with sqlite3.connect('testing.db') as connection:
+        connection.execute("UPDATE Articles SET Title = 'Perros'")
+    connection.close()
+    assert new_instance.full_text_search(Articles, 'gatos').empty
+    assert len(new_instance.full_text_search(Articles, 'perros')) == 1
+    with sqlite3.connect('testing.db') as connection:
+        connection.execute('DELETE FROM Articles')
+    connection.close()
+    assert new_instance.full_text_search(Articles, 'perros').empty
+
+
+@pytest.mark.parametrize('table,query', [
+    pytest.param(Articles, '"gato'),
+    pytest.param(Articles, 'gato AND'),
+    pytest.param(CrawledURLs, 'gato'),
+])
+def test_full_text_search_failure(new_instance: DBManager, table: DBManager.Base, query: str):
+    with pytest.raises(FullTextSearchException):
+        new_instance.full_text_search(table, query)
+
+
+def test_apply_migrations_success():
+    db_filepath = Path('testing_migrations.db')
+    applied_migrations = []
+    migrations = [lambda connection: applied_migrations.append(1)]
+    DBManager(filepath=db_filepath, migrations=migrations).destroy()
+    assert applied_migrations == []  # New databases already have the latest schema
+    migrations.append(lambda connection: applied_migrations.append(2))
+    DBManager(filepath=db_filepath, migrations=migrations).destroy()
+    DBManager(filepath=db_filepath).destroy()
+    DBManager(filepath=db_filepath, migrations=migrations).destroy()
+    assert applied_migrations == [2]
+    with sqlite3.connect(db_filepath) as connection:
+        assert connection.execute('PRAGMA user_version').fetchone()[0] == 2
+    connection.close()
+    os.remove(db_filepath)
+
+
+def test_store_stream_success(new_instance: DBManager):
+    new_instance.store(CrawledURLs(Keyword='gatos', URL=f'https://example.com/{index}') for index in range(20000))
+    assert len(new_instance.retrieve(columns=[CrawledURLs.ID])) == 20000  # Exceeds SQLite's bound parameters limit
+    assert new_instance.get_stored_column_names(CrawledURLs) == ('Keyword', 'URL', 'CrawledOn')
+
+
+def test_store_stream_failure(new_instance: DBManager):
+    new_instance.store_batch_size = 2
+    records = [CrawledURLs(Keyword='gatos', URL=f'https://example.com/{index}') for index in range(5)]
+    with pytest.raises(RecordsMismatchException):
+        new_instance.store(records + [CachedUserAgents(UserAgent='Mozilla/5.0')])
+    assert len(new_instance.retrieve(table=CrawledURLs)) == 0  # Earlier batches are rolled back
+
+
+def test_upsert_success(new_instance: DBManager):
+    def upsert(title: str) -> int:
+        return new_instance.upsert([Articles(URL='https://example.com/1', Title=title, Body='Gatos.'),
+                                    Articles(URL='https://example.com/2', Title='Perros', Body='Perros.')],
+                                   conflict_columns=('URL',), hash_column='ContentHash')
+
+    assert upsert('Gatos') == 2
+    stored_articles = new_instance.retrieve(table=Articles)
+    assert upsert('Gatos') == 0  # Unchanged contents are not written
+    assert new_instance.retrieve(table=Articles).equals(stored_articles)
+    assert upsert('Gatos y tigres') == 1
+    updated_articles = new_instance.retrieve(table=Articles)
+    assert list(updated_articles.ID) == list(stored_articles.ID)
+    assert updated_articles.Title[0] == 'Gatos y tigres'
+    assert updated_articles.ContentHash[0] != stored_articles.ContentHash[0]
+    assert updated_articles.CreatedOn[0] == stored_articles.CreatedOn[0]
+    assert updated_articles.UpdatedOn[0] > stored_articles.UpdatedOn[0]
+    assert updated_articles.UpdatedOn[1] == stored_articles.UpdatedOn[1]
+    assert list(new_instance.full_text_search(Articles, 'tigres').URL) == ['https://example.com/1']
+
+
+def test_store_duplicated_matches_success(new_instance: DBManager):
+    new_instance.store([MatchingArticles(Keyword='gatos', URL='https://example.com/1')])
+    new_instance.store([MatchingArticles(Keyword='gatos', URL='https://example.com/1'),
+                        MatchingArticles(Keyword='tigres', URL='https://example.com/1')])
+    assert len(new_instance.retrieve(table=MatchingArticles)) == 2
+
+
+def test_retrieve_stream_success(new_instance: DBManager):
+    new_instance.store(Articles(URL=f'https://example.com/{index}', Title=f'Gatos {index}', Body='Gatos.',
+                                Date=datetime.datetime(2025, 1, 1) + datetime.timedelta(days=index))
+                       for index in range(25))
+    chunks = list(new_instance.retrieve_stream(columns=[Articles.URL, Articles.Date], chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert all(list(chunk.columns) == ['URL', 'Date'] for chunk in chunks)
+    assert sorted(pandas.concat(chunks).URL) == sorted(new_instance.retrieve(columns=[Articles.URL]).URL)
+    assert chunks[0].Date[0] == datetime.datetime(2025, 1, 1)
+    first_chunk = next(new_instance.retrieve_stream(table=Articles, chunk_size=10))
+    assert list(first_chunk.columns) == list(new_instance.retrieve(table=Articles).columns)
+    assert list(new_instance.retrieve_stream(table=CrawledURLs)) == []
+
+
+def test_retrieve_pushdown_success(new_instance: DBManager):
+    new_instance.store(Articles(URL=f'https://example.com/{index}', Title=f'Gatos {index}',
+                                Author=f'Autor {index % 2}',
+                                Date=datetime.datetime(2025, 1, 1) + datetime.timedelta(days=index))
+                       for index in range(20))
+    new_instance.store(MatchingArticles(Keyword=keyword, URL=f'https://example.com/{index}')
+                       for index in range(20) for keyword in ('gatos', 'tigres')
+                       if index % 2 == 0 or keyword == 'gatos')
+    result = new_instance.retrieve(columns=[MatchingArticles.Keyword, Articles.URL, Articles.Date],
+                                   filters=[MatchingArticles.URL == Articles.URL, MatchingArticles.Keyword == 'tigres',
+                                            Articles.Date >= datetime.datetime(2025, 1, 14)],
+                                   order_by=[Articles.Date.desc()], limit=2)
+    assert list(result.URL) == ['https://example.com/18', 'https://example.com/16']
+    assert (result.Keyword == 'tigres').all()
+    result = new_instance.retrieve(table=Articles, filters=[Articles.Author == 'Autor 1'], order_by=[Articles.Date])
+    assert list(result.URL) == [f'https://example.com/{index}' for index in range(1, 20, 2)]
+    chunks = list(new_instance.retrieve_stream(columns=[Articles.URL], filters=[Articles.Author == 'Autor 1'],
+                                               order_by=[Articles.Date], limit=5, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_transaction_success(new_instance: DBManager):
+    with new_instance.transaction():
+        new_instance.store([Articles(URL='https://example.com/1')])
+        new_instance.store([MatchingArticles(Keyword='gatos', URL='https://example.com/1')])
+    assert len(new_instance.retrieve(table=MatchingArticles)) == 1
+    with pytest.raises(RecordsMismatchException):
+        with new_instance.transaction():
+            new_instance.store([Articles(URL='https://example.com/2')])
+            new_instance.store([MatchingArticles(Keyword='gatos', URL='https://example.com/2'), Articles(URL='')])
+    assert len(new_instance.retrieve(table=Articles)) == 1  # Rolled back as a whole
+    new_instance.store([Articles(URL='https://example.com/3')])  # Back to a transaction per call
+    assert len(new_instance.retrieve(table=Articles)) == 2
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from source.classes.db_manager import DBManager
+from source.interfaces.db_migrations import MIGRATIONS
+from source.interfaces.db_tables import Articles, MatchingArticles
+
+LEGACY_SCHEMA = """
+CREATE TABLE "MatchingArticles" (
+    "ID" INTEGER NOT NULL,
+    "Keyword" TEXT NOT NULL,
+    "URL" TEXT NOT NULL,
+    "Title" TEXT,
+    "Date" DATETIME,
+    "Author" TEXT,
+    "ImageURL" TEXT,
+    "Body" TEXT,
+    "CreatedOn" DATETIME,
+    "UpdatedOn" DATETIME,
+    PRIMARY KEY ("ID")
+);
+CREATE INDEX "IX_MatchingArticles_Keyword_URL" ON "MatchingArticles" ("Keyword", "URL");
+"""
+
+
+@pytest.fixture
+def legacy_db_filepath() -> Path:
+    """
+    Yields the path to a database with the schema that stored article contents once per matching keyword.
+    """
+    db_filepath = Path('testing_legacy.db')
+    body = 'El gato vive solo, no necesita de la sociedad, no obedece excepto cuando él quiere. ' * 50
+    rows = [(keyword, f'https://example.com/{index}', f'Gatos {index}', body, f'2025-01-{index + 1:02} 00:00:00')
+            for index in range(20) for keyword in ('gatos', 'felinos', 'tigres', 'leones', 'pumas')]
+    rows.append(('gatos', 'https://example.com/0', 'Gatos actualizado', body, '2025-02-01 00:00:00'))
+    with sqlite3.connect(db_filepath) as connection:
+        connection.executescript(LEGACY_SCHEMA)
+        connection.executemany('INSERT INTO MatchingArticles (Keyword, URL, Title, Body, CreatedOn, UpdatedOn) '
+                               'VALUES (?, ?, ?, ?, ?, ?)', [row + (row[-1],) for row in rows])
+    connection.close()
+    yield db_filepath
+    if db_filepath.exists():
+        os.remove(db_filepath)
+
+
+def test_normalize_matching_articles_success(legacy_db_filepath: Path):
+    legacy_size = legacy_db_filepath.stat().st_size
+    dbmanager = DBManager(filepath=legacy_db_filepath, migrations=MIGRATIONS)
+    articles = dbmanager.retrieve(table=Articles).set_index('URL')
+    matches = dbmanager.retrieve(table=MatchingArticles)
+    assert sorted(articles.index) == sorted(f'https://example.com/{index}' for index in range(20))
+    assert articles.Title['https://example.com/0'] == 'Gatos actualizado'  # Latest version
+    assert len(matches) == 100
+    assert set(matches.columns) == {'ID', 'Keyword', 'URL', 'CreatedOn', 'UpdatedOn'}
+    assert list(dbmanager.full_text_search(Articles, 'actualizado').URL) == ['https://example.com/0']
+    dbmanager.destroy()
+    assert legacy_db_filepath.stat().st_size < legacy_size / 2
+    with sqlite3.connect(legacy_db_filepath) as connection:
+        assert connection.execute('PRAGMA user_version').fetchone()[0] == len(MIGRATIONS)
+        index_names = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    connection.close()
+    assert 'UX_MatchingArticles_Keyword_URL' in index_names
+
+
+def test_deduplicate_matching_articles_success(legacy_db_filepath: Path):
+    DBManager(filepath=legacy_db_filepath, migrations=MIGRATIONS[:1]).destroy()
+    with sqlite3.connect(legacy_db_filepath) as connection:  # Reverts to the schema the first migration produced
+        connection.execute('DROP INDEX UX_MatchingArticles_Keyword_URL')
+        connection.execute('CREATE INDEX IX_MatchingArticles_Keyword_URL ON MatchingArticles (Keyword, URL)')
+        connection.execute('ALTER TABLE Articles DROP COLUMN ContentHash')
+        connection.execute('INSERT INTO MatchingArticles (Keyword, URL) SELECT Keyword, URL FROM MatchingArticles')
+    connection.close()
+    dbmanager = DBManager(filepath=legacy_db_filepath, migrations=MIGRATIONS)
+    matches = dbmanager.retrieve(table=MatchingArticles)
+    assert len(matches) == 100
+    assert not matches.duplicated(['Keyword', 'URL']).any()
+    assert matches.CreatedOn.notna().all()  # The earliest rows are kept
+    assert dbmanager.retrieve(table=Articles).ContentHash.isna().all()
+    dbmanager.store([MatchingArticles(Keyword='gatos', URL='https://example.com/0')])
+    assert len(dbmanager.retrieve(table=MatchingArticles)) == 100
+    dbmanager.destroy()
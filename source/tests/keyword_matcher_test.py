@@ -0,0 +1,61 @@
+import pytest
+
+from source.classes.keyword_matcher import KeywordMatcher, InvalidKeywordQuery
+
+SAMPLE_TEXT = """\
+Un manto de caracoles y un colibrí
+La EDUCACIÓN pública  resiste, dijo el Gobierno. El año próximo habrá paritarias."""
+
+
+@pytest.mark.parametrize('queries,options,expected_output', [
+    pytest.param(['colibrí'], {}, ['colibrí']),
+    pytest.param(['COLIBRÍ'], {'case_sensitive': True}, []),
+    pytest.param(['educacion'], {}, []),
+    pytest.param(['educacion'], {'accent_insensitive': True}, ['educacion']),
+    pytest.param(['ano'], {'accent_insensitive': True}, []),
+    pytest.param(['educación pública resiste'], {}, ['educación pública resiste']),
+    pytest.param(['colibrí la'], {}, []),  # Phrases do not span lines
+    pytest.param(['gobierno', 'caracol', 'paritaria'], {}, ['gobierno', 'caracol', 'paritaria']),
+    pytest.param(['gobierno', 'caracol', 'paritaria'], {'whole_word': True}, ['gobierno']),
+    pytest.param(['colibrí AND gobierno'], {}, ['colibrí AND gobierno']),
+    pytest.param(['colibrí AND NOT gobierno'], {}, []),
+    pytest.param(['tigre OR gobierno'], {}, ['tigre OR gobierno']),
+    pytest.param(['(tigre OR gato) AND gobierno'], {}, []),
+    pytest.param(['NOT tigre'], {}, ['NOT tigre']),
+    pytest.param(['gobierno NOT tigre'], {}, ['gobierno NOT tigre']),
+    pytest.param(['tigre OR manto AND NOT paritarias'], {}, []),
+    pytest.param(['"dijo el" "año próximo"'], {}, ['"dijo el" "año próximo"']),
+])
+def test_match_success(queries: list[str], options: dict, expected_output: list[str]):
+    matcher = KeywordMatcher(queries, **options)
+    assert matcher.match(SAMPLE_TEXT) == expected_output
+
+
+def test_match_many_keywords_success():
+    queries = [f'palabra{index}' for index in range(1000)] + ['colibrí']
+    matcher = KeywordMatcher(queries, whole_word=True)
+    assert matcher.match(SAMPLE_TEXT + ' palabra42 palabra7x') == ['palabra42', 'colibrí']
+
+
+@pytest.mark.parametrize('query,expected_output', [
+    pytest.param('educación pública', ['educación pública']),
+    pytest.param('gato AND NOT perro', ['gato']),
+    pytest.param('(gato OR "tigre AND león") NOT NOT perro', ['gato', 'tigre AND león', 'perro']),
+])
+def test_get_search_terms_success(query: str, expected_output: list[str]):
+    assert KeywordMatcher([query]).get_search_terms(query) == expected_output
+
+
+@pytest.mark.parametrize('query', [
+    pytest.param(''),
+    pytest.param('AND'),
+    pytest.param('gato AND'),
+    pytest.param('gato OR OR perro'),
+    pytest.param('(gato'),
+    pytest.param('gato)'),
+    pytest.param('"gato'),
+    pytest.param('""'),
+])
+def test_match_failure(query: str):
+    with pytest.raises(InvalidKeywordQuery):
+        KeywordMatcher([query])
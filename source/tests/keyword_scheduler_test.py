@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from source.classes.keyword_scheduler import InvalidSchedule, KeywordScheduler
+
+START = datetime(2024, 1, 1, 12, 0)
+
+
+def test_spread_first_runs_success():
+    scheduler = KeywordScheduler([('gatos', timedelta(hours=1)), ('perros', timedelta(hours=1)),
+                                  ('lobos', timedelta(hours=1)), ('loros', timedelta(hours=1))], start=START)
+    assert scheduler.keywords == ('gatos', 'perros', 'lobos', 'loros')
+    assert scheduler.get_due_keywords(now=START) == ['gatos']
+    assert scheduler.get_next_due_time() == START
+    scheduler.mark_run(['gatos'], now=START)
+    assert scheduler.get_next_due_time() == START + timedelta(minutes=15)
+    assert scheduler.get_due_keywords(now=START + timedelta(minutes=30)) == ['perros', 'lobos']
+    assert scheduler.get_due_keywords(now=START + timedelta(minutes=59)) == ['perros', 'lobos', 'loros']
+
+
+def test_due_keywords_order_success():
+    scheduler = KeywordScheduler([('gatos', timedelta(minutes=10)), ('perros', timedelta(hours=2))],
+                                 max_keywords_per_run=1, start=START)
+    scheduler.mark_run(['gatos'], now=START)
+    # perros has been due since 13:00, gatos since 12:10
+    assert scheduler.get_due_keywords(now=START + timedelta(hours=2)) == ['gatos']
+    scheduler.mark_run(['gatos'], now=START + timedelta(hours=2))
+    assert scheduler.get_due_keywords(now=START + timedelta(hours=2)) == ['perros']
+
+
+def test_mark_run_skips_missed_runs_success():
+    scheduler = KeywordScheduler([('gatos', timedelta(minutes=10))], start=START)
+    # The run took 35 minutes: the runs due at 12:10, 12:20 and 12:30 are skipped
+    scheduler.mark_run(['gatos'], now=START + timedelta(minutes=35))
+    assert scheduler.get_next_due_time() == START + timedelta(minutes=40)
+    scheduler.mark_run(['gatos'], now=START + timedelta(minutes=40))
+    assert scheduler.get_next_due_time() == START + timedelta(minutes=50)
+
+
+def test_parse_interval_success():
+    assert KeywordScheduler.parse_interval('90s') == timedelta(seconds=90)
+    assert KeywordScheduler.parse_interval('30m') == timedelta(minutes=30)
+    assert KeywordScheduler.parse_interval('1.5H') == timedelta(minutes=90)
+    assert KeywordScheduler.parse_interval('2d') == timedelta(days=2)
+
+
+@pytest.mark.parametrize('interval', ['', '30', 'm', '30 m', '-5m', '1w'])
+def test_parse_interval_failure(interval: str):
+    with pytest.raises(InvalidSchedule):
+        KeywordScheduler.parse_interval(interval)
+
+
+def test_non_positive_interval_failure():
+    with pytest.raises(InvalidSchedule):
+        KeywordScheduler([('gatos', timedelta(hours=1)), ('perros', timedelta(0))])
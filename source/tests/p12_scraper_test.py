@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from playwright.async_api import TimeoutError as PWTimeoutError
 
@@ -154,6 +156,13 @@ async def test_get_image_url_call_failure(new_instance: P12Scraper):
         await new_instance.get_image_url('https://www.pagina12.com.ar/800250-genealogistas')
 
 
+async def test_get_image_url_optional_success(new_initialized_instance: P12Scraper):
+    start = time.perf_counter()
+    image_url = await new_initialized_instance.get_image_url('https://www.pagina12.com.ar/811360-ausencias')
+    assert image_url == ''
+    assert time.perf_counter() - start < 5  # Missing optional fields do not wait for the default timeout
+
+
 @pytest.mark.parametrize('input_url,output_body', [
     pytest.param('https://www.pagina12.com.ar/800250-genealogistas', """\
 "Necesitamos la historia, pero de otra manera que el refinado paseante por el jardín de la ciencia, por más que este mire con altanero desdén nuestras necesidades y apremios rudos y simples. Necesitamos la historia para la vida y la acción, no para apartamos de la vida y la acción, y menos para encubrir la vida egoísta y la acción vil y cobarde" (Friedrich Nietzsche).
@@ -256,6 +265,35 @@ async def test_get_body_call_failure(new_instance: P12Scraper):
         await new_instance.get_body('https://www.pagina12.com.ar/800250-genealogistas')
 
 
+@pytest.mark.parametrize('input_url', [
+    pytest.param('https://www.pagina12.com.ar/811360-ausencias'),
+    pytest.param('https://www.pagina12.com.ar/508228-inevitables'),
+    pytest.param('https://www.pagina12.com.ar/800250-genealogistas'),
+    pytest.param('https://www.pagina12.com.ar/810583-cambio-el-mundo'),
+])
+async def test_get_article_success(new_initialized_instance: P12Scraper, input_url: str):
+    article = await new_initialized_instance.get_article(input_url)
+    assert article == [await new_initialized_instance.get_title(),
+                       await new_initialized_instance.get_date(),
+                       await new_initialized_instance.get_author(),
+                       await new_initialized_instance.get_image_url(),
+                       await new_initialized_instance.get_body()]
+
+
+@pytest.mark.parametrize('input_url', [
+    pytest.param('https://www.pagina12.com.ar/349353471/'),
+    pytest.param('https://www.pagina12.com.ar/andytow/test'),
+])
+async def test_get_article_failure(new_initialized_instance: P12Scraper, input_url: str):
+    with pytest.raises(NonCompliantURL):
+        await new_initialized_instance.get_article(input_url)
+
+
+async def test_get_article_call_failure(new_instance: P12Scraper):
+    with pytest.raises(UninitializedWebsiteHandler):
+        await new_instance.get_article('https://www.pagina12.com.ar/800250-genealogistas')
+
+
 @pytest.mark.parametrize('input_keyword,case_sensitive,expected_output', [
     pytest.param('asdfasdfasdf', False, []),
     pytest.param('genealogistas', False, [
@@ -455,6 +493,32 @@ async def test_search_success(new_initialized_instance: P12Scraper, input_keywor
     assert sort_by_title(results) == sort_by_title(expected_output)
 
 
+async def test_search_pagination_success(new_initialized_instance: P12Scraper):
+    first_page_results = await new_initialized_instance.search('gobierno', max_search_pages=1,
+                                                                case_sensitive=True)
+    paginated_results = await new_initialized_instance.search('gobierno', max_search_pages=3, max_candidates=25,
+                                                               case_sensitive=True)
+    assert len(paginated_results) >= len(first_page_results)
+    assert len({article['article_url'] for article in paginated_results}) == len(paginated_results)
+
+
+async def test_search_stream_success(new_initialized_instance: P12Scraper):
+    streamed_results = [article async for article in new_initialized_instance.search_stream('krysthopher')]
+    assert sorted(article['article_url'] for article in streamed_results) == [
+        'https://www.pagina12.com.ar/278679-el-debut-en-la-historieta-de-krysthopher-woods',
+        'https://www.pagina12.com.ar/284425-100-anos-lo-que-la-vida-te-ensena-otra-forma-de-historieta',
+        'https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina']
+
+
+async def test_search_multiple_keywords_success(new_initialized_instance: P12Scraper):
+    results = await new_initialized_instance.search(['genealogistas', 'krysthopher'])
+    keywords_by_url = {article['article_url']: article['keywords'] for article in results}
+    assert len(keywords_by_url) == len(results)  # Each article is scraped and reported once
+    assert keywords_by_url['https://www.pagina12.com.ar/95749-en-busca-de-la-genealogia-felina'] == [
+        'krysthopher']
+    assert keywords_by_url['https://www.pagina12.com.ar/800250-genealogistas'] == ['genealogistas']
+
+
 async def test_search_throttle_success(new_initialized_instance: P12Scraper):
     await new_initialized_instance.search('gobierno')
 
@@ -464,6 +528,129 @@ async def test_search_throttle_failure(new_initialized_instance: P12Scraper):
         await new_initialized_instance.search('gobierno', do_throttle=False)
 
 
+class FakeLocator:
+    """
+    Mimics the subset of Playwright's Locator used to read search results.
+    """
+    def __init__(self, hrefs: list[str]):
+        self.hrefs = hrefs
+
+    async def all(self):
+        return [FakeLocator([href]) for href in self.hrefs]
+
+    def locator(self, selector):
+        return self
+
+    async def get_attribute(self, name):
+        return self.hrefs[0]
+
+
+class FakeSearchPage:
+    """
+    Mimics a search results page of pagina12.com.ar, listing the article paths of each search URL.
+    """
+    def __init__(self, paths_by_url: dict[str, list[str]]):
+        self.paths_by_url = paths_by_url
+        self.url = 'about:blank'
+        self.visited_urls = []
+
+    def locator(self, selector):
+        return FakeLocator(self.paths_by_url.get(self.url, []))
+
+
+class FakeSearchHandler:
+    """
+    Mimics WebsiteHandler's navigation within a FakeSearchPage.
+    """
+    def __init__(self, paths_by_url: dict[str, list[str]]):
+        self.page = FakeSearchPage(paths_by_url)
+
+    async def safe_goto(self, url, page=None):
+        self.page.url = url
+        self.page.visited_urls.append(url)
+
+
+async def test_discover_stream_success():
+    search_url = 'https://www.pagina12.com.ar/buscar?q='
+    p12scraper = P12Scraper()
+    p12scraper._wshandler = FakeSearchHandler({
+        f'{search_url}gatos': ['/1-a', '/2-b'], f'{search_url}gatos&page=1': ['/1-a', '/2-b'],
+        f'{search_url}gatos&page=2': ['/3-c'], f'{search_url}perros': ['/1-a', '/2-b', '/4-d']})
+
+    def reject_gatos_b(urls: list[str], keyword: str) -> list[str]:
+        return [url for url in urls if keyword != 'gatos' or not url.endswith('b')]
+
+    urls = [url async for url in p12scraper.discover_stream(['gatos', 'perros'], max_search_pages=4,
+                                                            candidates_filter_hook=reject_gatos_b)]
+    # A page listing only already seen articles does not end pagination, unlike an empty page
+    assert p12scraper._wshandler.page.visited_urls == [f'{search_url}gatos', f'{search_url}gatos&page=1',
+                                                       f'{search_url}gatos&page=2', f'{search_url}gatos&page=3',
+                                                       f'{search_url}perros', f'{search_url}perros&page=1']
+    # A candidate rejected for a keyword is still offered for the following ones
+    assert urls == ['https://www.pagina12.com.ar/1-a', 'https://www.pagina12.com.ar/3-c',
+                    'https://www.pagina12.com.ar/2-b', 'https://www.pagina12.com.ar/4-d']
+
+
+async def test_search_stream_live_articles_success():
+    search_url = 'https://www.pagina12.com.ar/buscar?q='
+    p12scraper = P12Scraper()
+    p12scraper._wshandler = FakeSearchHandler({f'{search_url}gatos': ['/1-vivo', '/2-gatos', '/3-perros']})
+
+    async def stream_articles(articles_urls, do_throttle=True, check_environment_hook=None):
+        async for url in articles_urls:
+            # Live articles are skipped
+            yield None if url.endswith('vivo') else {'article_url': url, 'title': url.split('-')[-1], 'body': ''}
+
+    p12scraper._stream_articles = stream_articles
+    scraped_urls = []
+    results = [article async for article in p12scraper.search_stream('gatos',
+                                                                     scraped_candidate_hook=scraped_urls.append)]
+    assert [article['article_url'] for article in results] == ['https://www.pagina12.com.ar/2-gatos']
+    assert scraped_urls == ['https://www.pagina12.com.ar/2-gatos', 'https://www.pagina12.com.ar/3-perros',
+                            'https://www.pagina12.com.ar/1-vivo']
+
+
 async def test_search_call_failure(new_instance: P12Scraper):
     with pytest.raises(UninitializedWebsiteHandler):
         await new_instance.search('genealogistas')
+
+
+STATIC_ARTICLE_HTML = """\
+<html><body>
+<div class="article-header"><h1>De genealogistas y analizantes</h1>
+  <div class="author"><a href="/autores/1">Por   Sergio Zabalza</a></div></div>
+<div class="hide-on-mobile"><div class="article-info"><time datetime="2025-01-08T00:01:00-03:00">8 de enero</time></div></div>
+<div class="no-main-image"><img src="https://images.pagina12.com.ar/2025-01/1.jpg?itok=x"></div>
+<div class="article-main-content"><div class="article-text"><p>Primer párrafo.</p>
+<p>Segundo&nbsp;párrafo.</p></div></div>
+</body></html>
+"""
+
+
+def test_parse_article_html_success(new_instance: P12Scraper):
+    assert new_instance._parse_article_html(STATIC_ARTICLE_HTML) == [
+        'De genealogistas y analizantes',
+        '2025-01-08T00:01:00-03:00',
+        'Sergio Zabalza',
+        'https://images.pagina12.com.ar/2025-01/1.jpg',
+        'Primer párrafo.\nSegundo párrafo.',
+    ]
+
+
+@pytest.mark.parametrize('input_html', [
+    pytest.param(STATIC_ARTICLE_HTML.replace('<h1>De genealogistas y analizantes</h1>', '')),
+    pytest.param(STATIC_ARTICLE_HTML.replace('article-text', 'article-summary')),
+    pytest.param(STATIC_ARTICLE_HTML.replace('<body>', '<body><article class="live-blog-post"></article>')),
+])
+def test_parse_article_html_fallback_success(new_instance: P12Scraper, input_html: str):
+    assert new_instance._parse_article_html(input_html) is None
+
+
+@pytest.mark.parametrize('input_url', [
+    pytest.param('https://www.pagina12.com.ar/800250-genealogistas'),
+    pytest.param('https://www.pagina12.com.ar/810583-cambio-el-mundo'),
+])
+async def test_static_engine_success(new_initialized_instance: P12Scraper, input_url: str):
+    response = await new_initialized_instance._wshandler.safe_get_request(input_url)
+    static_article = new_initialized_instance._parse_article_html(await response.text())
+    assert static_article == await new_initialized_instance.get_article(input_url)
@@ -0,0 +1,47 @@
+import pytest
+
+from source.classes.robots_matcher import RobotsMatcher
+
+
+@pytest.mark.parametrize('input_path,expected_output', [
+    pytest.param('/', 0),
+    pytest.param('/test', 1),
+    pytest.param('/test/', 1),
+    pytest.param('/*/*/', 2),
+    pytest.param('/test/../ing/./', 1),
+    pytest.param('/logout-user?redirect=*', 1),
+])
+def test_get_rule_depth_success(input_path: str, expected_output: int):
+    assert RobotsMatcher.get_rule_depth(input_path) == expected_output
+
+
+@pytest.mark.parametrize('input_path,allowed_paths,disallowed_paths,expected_output', [
+    pytest.param('/anything', [], [], True),
+    pytest.param('/anything', [], [''], True),
+    pytest.param('/logout-user?redirect=home', [], ['/logout-user?redirect=*'], False),
+    pytest.param('/logout-userXredirect=home', [], ['/logout-user?redirect=*'], True),
+    pytest.param('/file.php', [], ['/*.php$'], False),
+    pytest.param('/file.php/extra', [], ['/*.php$'], True),
+    pytest.param('/secciones/el-pais', ['/secciones/el-pais'], ['/secciones/'], True),
+    pytest.param('/secciones/', ['/secciones/'], ['/secciones/'], False),
+    pytest.param('/page', ['/page'], ['/pa*'], True),
+    pytest.param('/page', ['/pag*'], ['/page'], False),
+])
+def test_is_allowed_success(input_path: str, allowed_paths: list[str], disallowed_paths: list[str],
+                            expected_output: bool):
+    matcher = RobotsMatcher(allowed_paths, disallowed_paths)
+    assert matcher.is_allowed(input_path) == expected_output
+
+
+def test_verdicts_cache_success():
+    matcher = RobotsMatcher(['/'], ['/*/'])
+    for _ in range(3):
+        matcher.is_allowed('/secciones/el-pais')
+    assert matcher.cache_info.hits == 2
+    assert matcher.cache_info.misses == 1
+
+
+def test_from_rules_success():
+    matcher = RobotsMatcher.from_rules(('/',), ('/*/',))
+    assert RobotsMatcher.from_rules(('/',), ('/*/',)) is matcher
+    assert RobotsMatcher.from_rules(('/',), ()) is not matcher
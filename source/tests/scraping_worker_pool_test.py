@@ -0,0 +1,120 @@
+import asyncio
+import os
+from contextlib import aclosing
+from typing import Callable
+
+import pytest
+
+from source.classes.base_news_scraper import BaseNewsScraper
+from source.classes.scraping_worker_pool import ScrapingWorkerException, ScrapingWorkerPool, merge_blocking_stats
+
+
+class FakePage:
+    """
+    Mimics the subset of Playwright's Page used by _stream_articles.
+    """
+    def __init__(self):
+        self.url = 'about:blank'
+
+
+class FakeWebsiteHandler:
+    """
+    Mimics WebsiteHandler's page pool with a fixed navigation latency, and counts every navigation as an allowed
+    request.
+    """
+    def __init__(self):
+        self.blocking_stats = {'allowed_requests': 0, 'blocked_requests': 0, 'blocked_requests_by_type': {},
+                               'received_bytes': 0}
+
+    async def acquire_page(self, url=None):
+        return FakePage()
+
+    async def release_page(self, page):
+        pass
+
+    async def safe_goto(self, url, page=None):
+        await asyncio.sleep(0.02)
+        self.blocking_stats['allowed_requests'] += 1
+        page.url = url
+
+    async def destroy(self):
+        pass
+
+
+class WorkerSample(BaseNewsScraper):
+    """
+    A scraper that worker processes can import, whose articles tell which process scraped them.
+    """
+    async def initialize_website_handler(self, **kwargs):
+        if kwargs['headless'] is None:
+            raise ConnectionError('Browser unavailable.')
+        self._wshandler = FakeWebsiteHandler()
+
+    async def skip_odd_articles(self, page, article_scraper: Callable):
+        if int(page.url.rsplit('/', 1)[1]) % 2 == 1:
+            return None
+        return await article_scraper(page)
+
+    #  Methods
+    get_title: Callable = lambda self, page: asyncio.sleep(0, page.url)
+    get_date: Callable = lambda self, page: asyncio.sleep(0, '')
+    get_author: Callable = lambda self, page: asyncio.sleep(0, str(os.getpid()))
+    get_image_url: Callable = lambda self, page: asyncio.sleep(0, '')
+    get_body: Callable = lambda self, page: asyncio.sleep(0, '')
+    search: Callable = lambda: ()
+
+
+@pytest.fixture
+async def new_instance() -> ScrapingWorkerPool:
+    """
+    Yields a started pool of two workers and ensures they are stopped.
+    """
+    pool = ScrapingWorkerPool(workers_count=2, scraper_class=WorkerSample, scraper_kwargs={'throttling_chunk_size': 2},
+                              host='https://example.com/', website_handler_kwargs={'headless': True})
+    await pool.start()
+    yield pool
+    await pool.destroy()
+
+
+async def test_stream_articles_success(new_instance: ScrapingWorkerPool):
+    urls = [f'https://example.com/{index}' for index in range(12)]
+    scraped_articles = [article async for article in new_instance.stream_articles(urls)]
+    assert sorted(article['title'] for article in scraped_articles) == sorted(urls)  # Each URL is scraped once
+    assert len({article['author'] for article in scraped_articles}) == 2
+    assert str(os.getpid()) not in {article['author'] for article in scraped_articles}
+    assert new_instance.blocking_stats['allowed_requests'] == len(urls)
+
+    async def discover_urls():
+        for url in urls[:4]:
+            await asyncio.sleep(0.01)
+            yield url
+
+    # Workers serve further streams, including asynchronous ones
+    scraped_articles = [article async for article in new_instance.stream_articles(
+        discover_urls(), check_environment_hook_name='skip_odd_articles')]
+    assert sorted(article['title'] for article in scraped_articles if article is not None) == [urls[0], urls[2]]
+    assert scraped_articles.count(None) == 2
+
+
+async def test_stream_articles_interrupted_success(new_instance: ScrapingWorkerPool):
+    urls = [f'https://example.com/{index}' for index in range(8)]
+    async with aclosing(new_instance.stream_articles(urls)) as scraped_articles:
+        async for _ in scraped_articles:
+            break
+    assert len([article async for article in new_instance.stream_articles(urls[:3])]) == 3
+
+
+async def test_start_failure():
+    pool = ScrapingWorkerPool(workers_count=2, scraper_class=WorkerSample, scraper_kwargs={},
+                              host='https://example.com/', website_handler_kwargs={'headless': None})
+    with pytest.raises(ScrapingWorkerException, match='Browser unavailable'):
+        await pool.start()
+    await pool.destroy()
+
+
+def test_merge_blocking_stats_success():
+    stats = {'allowed_requests': 3, 'blocked_requests': 2, 'blocked_requests_by_type': {'image': 2},
+             'received_bytes': 100}
+    assert merge_blocking_stats(stats, {**stats, 'blocked_requests_by_type': {'font': 1}}) == \
+        {'allowed_requests': 6, 'blocked_requests': 4, 'blocked_requests_by_type': {'image': 2, 'font': 1},
+         'received_bytes': 200}
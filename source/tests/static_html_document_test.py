@@ -0,0 +1,75 @@
+import pytest
+
+from source.classes.static_html_document import StaticHTMLDocument, UnsupportedSelector
+
+SAMPLE_HTML = """\
+<html>
+<head><title>Sample</title><script>var ignored = 1;</script></head>
+<body>
+<div class="article-header main">
+  <h1>  Un   título
+    partido </h1>
+  <div class="author"><a href="/autores/1">Por María Pia López</a></div>
+</div>
+<div id="content" class="article-main-content">
+  <div class="article-text">
+    <p>Primer&nbsp;párrafo con <b>negrita</b> y <a href="#">enlace</a>.</p>
+    <p>Segundo párrafo<br>con salto de línea.</p>
+    <style>.hidden { display: none; }</style>
+    <ul><li>Uno</li><li>Dos</li></ul>
+  </div>
+</div>
+<img src="/images/1.jpg?itok=abc">
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def new_instance() -> StaticHTMLDocument:
+    return StaticHTMLDocument(SAMPLE_HTML)
+
+
+@pytest.mark.parametrize('selector,expected_tag', [
+    pytest.param('h1', 'h1'),
+    pytest.param('div.article-header h1', 'h1'),
+    pytest.param('div.main.article-header div.author a', 'a'),
+    pytest.param('#content div.article-text', 'div'),
+    pytest.param('body img', 'img'),
+])
+def test_select_first_success(new_instance: StaticHTMLDocument, selector: str, expected_tag: str):
+    assert new_instance.select_first(selector).tag == expected_tag
+
+
+@pytest.mark.parametrize('selector', [
+    pytest.param('div.article-text h1'),
+    pytest.param('div.no-main-image img'),
+    pytest.param('article.live-blog-post'),
+])
+def test_select_first_missing_success(new_instance: StaticHTMLDocument, selector: str):
+    assert new_instance.select_first(selector) is None
+
+
+@pytest.mark.parametrize('selector', [
+    pytest.param('div > h1'),
+    pytest.param('a[href]'),
+])
+def test_select_failure(new_instance: StaticHTMLDocument, selector: str):
+    with pytest.raises(UnsupportedSelector):
+        new_instance.select_first(selector)
+
+
+@pytest.mark.parametrize('selector,expected_text', [
+    pytest.param('div.article-header h1', 'Un título partido'),
+    pytest.param('div.author a', 'Por María Pia López'),
+    pytest.param('div.article-text', 'Primer\u00a0párrafo con negrita y enlace.\nSegundo párrafo\n'
+                                     'con salto de línea.\nUno\nDos'),
+])
+def test_inner_text_success(new_instance: StaticHTMLDocument, selector: str, expected_text: str):
+    inner_text = new_instance.inner_text(new_instance.select_first(selector))
+    assert [line for line in inner_text.split('\n') if line != ''] == expected_text.split('\n')
+
+
+def test_get_attribute_success(new_instance: StaticHTMLDocument):
+    assert new_instance.select_first('img').get_attribute('src') == '/images/1.jpg?itok=abc'
+    assert new_instance.select_first('img').get_attribute('alt') is None
@@ -0,0 +1,124 @@
+import asyncio
+import datetime
+import os
+from pathlib import Path
+
+import pytest
+
+from source.classes.async_db_manager import AsyncDBManager
+from source.classes.db_manager import DBManager
+from source.classes.useragent_provider import UserAgentProvider
+from source.interfaces.db_tables import CachedUserAgents
+
+COMMON_USERAGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.3',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1.1 '
+    'Safari/605.1.1',
+]
+
+
+@pytest.fixture
+async def new_dbmanager() -> DBManager:
+    """
+    Yields a new instance of DBManager and ensures its resources are released.
+    """
+    db_filepath = Path('testing_useragents.db')
+    dbmanager = DBManager(filepath=db_filepath)
+    yield dbmanager
+    dbmanager.destroy()
+    if db_filepath.exists():
+        os.remove(db_filepath)
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeWebsiteHandler:
+    """
+    Mimics the subset of WebsiteHandler used to refresh user-agents.
+    """
+    def __init__(self):
+        self.pages = []
+
+    async def get_new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+    async def get_common_useragents(self, page=None):
+        assert page is self.pages[-1]  # Never navigates the main page away
+        await asyncio.sleep(0.01)
+        return COMMON_USERAGENTS
+
+
+async def test_empty_cache_success(new_dbmanager: DBManager):
+    provider = UserAgentProvider(new_dbmanager)
+    assert await provider.get_useragent() is None
+    assert await provider.is_stale()
+
+
+async def test_store_useragents_success(new_dbmanager: DBManager):
+    provider = UserAgentProvider(new_dbmanager)
+    await provider.store_useragents(COMMON_USERAGENTS + COMMON_USERAGENTS[:1])
+    await provider.store_useragents(COMMON_USERAGENTS)
+    assert sorted(await provider.get_cached_useragents()) == sorted(COMMON_USERAGENTS)
+    assert await provider.get_useragent() in COMMON_USERAGENTS
+    assert not await provider.is_stale()
+
+
+async def test_async_storage_success():
+    db_filepath = Path('testing_useragents_async.db')
+    storage = AsyncDBManager(filepath=db_filepath)
+    await storage.initialize_connection()
+    try:
+        provider = UserAgentProvider(storage)
+        await provider.store_useragents(COMMON_USERAGENTS)
+        # Queued to the writer, and read once committed
+        assert sorted(await provider.get_cached_useragents()) == sorted(COMMON_USERAGENTS)
+        assert not await provider.is_stale()
+    finally:
+        await storage.destroy()
+        for filepath in (db_filepath, Path(f'{db_filepath}-wal'), Path(f'{db_filepath}-shm')):
+            if filepath.exists():
+                os.remove(filepath)
+
+
+async def test_stale_cache_success(new_dbmanager: DBManager):
+    outdated_on = datetime.datetime.now() - datetime.timedelta(days=30)
+    backdating_dbmanager = DBManager(filepath=Path('testing_useragents.db'), record_autofill_field_names=('ID',))
+    backdating_dbmanager.store([CachedUserAgents(UserAgent=useragent, CreatedOn=outdated_on)
+                                for useragent in COMMON_USERAGENTS])
+    backdating_dbmanager.destroy()
+    provider = UserAgentProvider(new_dbmanager, ttl=datetime.timedelta(days=7))
+    assert await provider.is_stale()
+    assert await provider.get_useragent() in COMMON_USERAGENTS  # Stale user-agents remain usable
+    assert not await UserAgentProvider(new_dbmanager, ttl=datetime.timedelta(days=60)).is_stale()
+
+
+async def test_background_refresh_success(new_dbmanager: DBManager):
+    provider = UserAgentProvider(new_dbmanager)
+    wshandler = FakeWebsiteHandler()
+    refresh_task = await provider.start_background_refresh(wshandler)
+    assert refresh_task is not None
+    assert await provider.start_background_refresh(wshandler) is refresh_task
+    await provider.wait_background_refresh()
+    assert sorted(await provider.get_cached_useragents()) == sorted(COMMON_USERAGENTS)
+    assert all(page.closed for page in wshandler.pages)
+    assert await provider.start_background_refresh(wshandler) is None  # Fresh cache
+
+
+async def test_background_refresh_failure(new_dbmanager: DBManager):
+    class FailingWebsiteHandler(FakeWebsiteHandler):
+        async def get_common_useragents(self, page=None):
+            raise TimeoutError('useragents.me is unreachable.')
+
+    provider = UserAgentProvider(new_dbmanager)
+    wshandler = FailingWebsiteHandler()
+    await provider.start_background_refresh(wshandler)
+    await provider.wait_background_refresh()  # Failures are reported, not raised
+    assert await provider.get_useragent() is None
+    assert all(page.closed for page in wshandler.pages)
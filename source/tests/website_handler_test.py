@@ -331,3 +331,86 @@ async def test_get_new_page_success(new_initialized_instance: WebsiteHandler):
 async def test_get_new_page_call_failure(new_instance: WebsiteHandler):
     with pytest.raises(UninitializedPlaywright):
         await new_instance.get_new_page('https://www.pagina12.com.ar/800250-genealogistas')
+
+
+async def test_acquire_page_success(new_initialized_instance: WebsiteHandler):
+    url = 'https://www.pagina12.com.ar/800250-genealogistas'
+    page = await new_initialized_instance.acquire_page(url)
+    assert page.url == url
+    await new_initialized_instance.release_page(page)
+    reused_page = await new_initialized_instance.acquire_page()
+    assert reused_page is page
+
+
+async def test_acquire_page_failure(new_initialized_instance: WebsiteHandler):
+    sample_url = 'https://www.pagina12.com.ar/349353471/'
+    await new_initialized_instance.setup_robots_compliance(sample_url)
+    with pytest.raises(NonCompliantURL):
+        await new_initialized_instance.acquire_page(sample_url)
+    reused_page = await new_initialized_instance.acquire_page()  # The page was handed back to the pool
+    assert reused_page.url == 'about:blank'
+    assert len(new_initialized_instance.page.context.pages) == 2  # The main page and the reused one
+
+
+async def test_acquire_page_unhealthy_success(new_initialized_instance: WebsiteHandler):
+    page = await new_initialized_instance.acquire_page()
+    await new_initialized_instance.release_page(page)
+    await page.close()
+    new_page = await new_initialized_instance.acquire_page()
+    assert new_page is not page
+    assert not new_page.is_closed()
+
+
+async def test_release_page_max_size_success():
+    wshandler = WebsiteHandler(page_pool_max_size=1)
+    await wshandler.initialize_playwright()
+    try:
+        pages = [await wshandler.acquire_page(), await wshandler.acquire_page()]
+        for page in pages:
+            await wshandler.release_page(page)
+        assert not pages[0].is_closed()
+        assert pages[1].is_closed()
+    finally:
+        await wshandler.destroy()
+
+
+async def test_replace_browser_context_success():
+    wshandler = WebsiteHandler()
+    await wshandler.initialize_playwright(user_agent='NewsScraperTest/1.0')
+    try:
+        idle_page = await wshandler.acquire_page()
+        busy_page = await wshandler.acquire_page()
+        await wshandler.release_page(idle_page)
+        await wshandler.initialize_playwright(user_agent='NewsScraperTest/2.0')
+        assert idle_page.is_closed()
+        assert await busy_page.evaluate('() => navigator.userAgent') == 'NewsScraperTest/1.0'  # Still usable
+        await wshandler.release_page(busy_page)
+        assert busy_page.is_closed()
+        assert await wshandler.get_current_useragent() == 'NewsScraperTest/2.0'
+    finally:
+        await wshandler.destroy()
+
+
+async def test_acquire_page_call_failure(new_instance: WebsiteHandler):
+    with pytest.raises(UninitializedPlaywright):
+        await new_instance.acquire_page()
+
+
+async def test_resource_blocking_success():
+    wshandler = WebsiteHandler(blocked_resource_types=WebsiteHandler.default_blocked_resource_types,
+                               blocked_url_patterns=WebsiteHandler.default_blocked_url_patterns)
+    await wshandler.initialize_playwright()
+    try:
+        await wshandler.safe_goto('https://www.pagina12.com.ar/800250-genealogistas')
+        image_src = await wshandler.page.locator('div.article-main-image').locator('img').get_attribute('src')
+        assert image_src.startswith('https://images.pagina12.com.ar/')
+        assert wshandler.blocking_stats['blocked_requests_by_type'].get('image', 0) > 0
+    finally:
+        await wshandler.destroy()
+
+
+async def test_resource_blocking_disabled_success(new_initialized_instance: WebsiteHandler):
+    await new_initialized_instance.safe_goto('https://www.pagina12.com.ar/800250-genealogistas')
+    assert new_initialized_instance.blocking_stats['blocked_requests'] == 0
+    assert new_initialized_instance.blocking_stats['allowed_requests'] > 0  # The baseline is still counted
+    assert new_initialized_instance.blocking_stats['received_bytes'] > 0